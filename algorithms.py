@@ -1,11 +1,18 @@
 """
-Search algorithms module - BFS, DFS, UCS, A*, Minimax, Alpha-Beta Pruning
+Search algorithms module - BFS, DFS, UCS, A*, bidirectional BFS/A*, Jump Point Search,
+D* Lite, Minimax, Alpha-Beta Pruning
+Path searches return a SearchResult carrying the path and expansion counters
 Complete implementation with all required algorithms
 """
-from collections import deque
+from array import array
+from collections import OrderedDict, deque
+import functools
 import heapq
+import itertools
 import math
+import time
 from config import *
+from telemetry import Telemetry
 
 
 def manhattan_distance(pos1, pos2):
@@ -20,6 +27,12 @@ def euclidean_distance(pos1, pos2):
 
 def get_neighbors(pos, board):
     """Get valid neighboring positions"""
+    graph = board.get_graph()
+    node = graph.index.get(pos)
+    if node is not None:
+        return graph.neighbor_cells[node]
+    
+    # Off-graph position (e.g. inside the wrap-around tunnel)
     row, col = pos
     neighbors = []
     directions = [(0, 1), (0, -1), (1, 0), (-1, 0)]  # right, left, down, up
@@ -45,144 +58,950 @@ def reconstruct_path(came_from, start, goal):
     return path
 
 
+def search_roots(start, board):
+    """
+    Node ids a search starts from
+    Returns: (graph, root ids, whether roots belong on the path)
+    A start cell off the graph is replaced by its walkable neighbors, one step away
+    """
+    graph = board.get_graph()
+    node = graph.index.get(start)
+    if node is not None:
+        return graph, [node], False
+    return graph, [graph.index[n] for n in get_neighbors(start, board)], True
+
+
+def reconstruct_node_path(came_from, goal, cells, include_root):
+    """Reconstruct a (row, col) path from an array of parent ids (-1 marks a root)"""
+    path = []
+    node = goal
+    
+    while came_from[node] != -1:
+        path.append(cells[node])
+        node = came_from[node]
+    if include_root:
+        path.append(cells[node])
+    
+    path.reverse()
+    return path
+
+
+class SearchResult:
+    """
+    Path found by a search plus expansion counters
+    Unpacks as (path, visited_nodes) like the plain tuples searches used to return;
+    the visited set is only built when it is asked for
+    """
+    
+    __slots__ = ('path', 'start', 'expanded', 'generated', 'pushes', 'pops', 'max_frontier',
+                 'elapsed_ns', 'goal_reached', '_nodes', '_cells', '_visited')
+    
+    def __init__(self, path, start, nodes=(), cells=None, expanded=None, generated=0,
+                 pushes=0, pops=0, max_frontier=0, goal_reached=None):
+        self.path = path
+        self.start = start
+        # Nodes taken off the frontier and expanded (defaults to the visited nodes)
+        self.expanded = len(nodes) if expanded is None else expanded
+        self.generated = generated  # Successors looked at while expanding
+        self.pushes = pushes  # Frontier insertions
+        self.pops = pops  # Frontier removals, including stale entries
+        self.max_frontier = max_frontier
+        self.elapsed_ns = 0  # Set by timed_search
+        self.goal_reached = bool(path) if goal_reached is None else goal_reached
+        self._nodes = nodes  # Visited node ids, or positions when cells is None
+        self._cells = cells
+        self._visited = None
+    
+    @property
+    def visited(self):
+        """Set of visited positions, including the start cell"""
+        if self._visited is None:
+            if self._cells is None:
+                self._visited = set(self._nodes)
+            else:
+                cells = self._cells
+                self._visited = {cells[node] for node in self._nodes}
+            self._visited.add(self.start)
+        return self._visited
+    
+    def __iter__(self):
+        return iter((self.path, self.visited))
+    
+    def __getitem__(self, index):
+        return (self.path, self.visited)[index]
+    
+    def as_dict(self):
+        return {
+            'path_length': len(self.path),
+            'expanded': self.expanded,
+            'generated': self.generated,
+            'pushes': self.pushes,
+            'pops': self.pops,
+            'max_frontier': self.max_frontier,
+            'elapsed_ns': self.elapsed_ns,
+            'goal_reached': self.goal_reached,
+        }
+
+
+def timed_search(search):
+    """Record the wall time of a search on the SearchResult it returns"""
+    @functools.wraps(search)
+    def timed(*args, **kwargs):
+        began = time.perf_counter_ns()
+        result = search(*args, **kwargs)
+        result.elapsed_ns = time.perf_counter_ns() - began
+        return result
+    return timed
+
+
 class BFS:
     """Breadth-First Search Algorithm"""
     
     @staticmethod
+    @timed_search
     def search(start, goal, board):
         """
         Find shortest path using BFS
-        Returns: path (list of positions), visited_nodes (set)
+        Returns: SearchResult
         """
-        queue = deque([start])
-        came_from = {start: None}
-        visited = {start}
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal, -1)
+        offsets, targets = graph.offsets, graph.targets
+        
+        came_from = array('i', [-1]) * graph.size
+        seen = bytearray(graph.size)
+        queue = list(roots)  # Doubles as the visit order
+        for node in roots:
+            seen[node] = 1
         
-        while queue:
-            current = queue.popleft()
+        head = 0
+        generated = max_frontier = 0
+        while head < len(queue):
+            if len(queue) - head > max_frontier:
+                max_frontier = len(queue) - head
+            current = queue[head]
+            head += 1
             
-            if current == goal:
-                return reconstruct_path(came_from, start, goal), visited
+            if current == target:
+                path = reconstruct_node_path(came_from, target, graph.cells, include_root)
+                break
             
-            for neighbor in get_neighbors(current, board):
-                if neighbor not in visited:
-                    visited.add(neighbor)
+            generated += offsets[current + 1] - offsets[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not seen[neighbor]:
+                    seen[neighbor] = 1
                     came_from[neighbor] = current
                     queue.append(neighbor)
+        else:
+            path = []
         
-        return [], visited
+        # Every discovered node counts as visited, as in the plain queue scan
+        return SearchResult(path, start, queue, graph.cells, head, generated, len(queue), head,
+                            max_frontier)
 
 
 class DFS:
     """Depth-First Search Algorithm"""
     
     @staticmethod
+    @timed_search
     def search(start, goal, board, max_depth=100):
         """
         Find path using DFS with depth limit
-        Returns: path (list of positions), visited_nodes (set)
+        Returns: SearchResult
         """
-        stack = [(start, [start])]
-        visited = {start}
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal, -1)
+        offsets, targets = graph.offsets, graph.targets
+        
+        # Depth counts path length including the start cell
+        root_depth = 2 if include_root else 1
+        came_from = array('i', [-1]) * graph.size
+        depth = array('i', [0]) * graph.size
+        order = list(roots)
+        for node in roots:
+            depth[node] = root_depth
+        stack = list(roots)
+        pops = generated = max_frontier = 0
         
+        path = []
         while stack:
-            current, path = stack.pop()
+            if len(stack) > max_frontier:
+                max_frontier = len(stack)
+            current = stack.pop()
+            pops += 1
             
-            if current == goal:
-                return path[1:], visited
+            if current == target:
+                path = reconstruct_node_path(came_from, target, graph.cells, include_root)
+                break
             
-            if len(path) > max_depth:
+            if depth[current] > max_depth:
                 continue
             
-            for neighbor in get_neighbors(current, board):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    stack.append((neighbor, path + [neighbor]))
+            generated += offsets[current + 1] - offsets[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if not depth[neighbor]:
+                    depth[neighbor] = depth[current] + 1
+                    came_from[neighbor] = current
+                    order.append(neighbor)
+                    stack.append(neighbor)
         
-        return [], visited
+        return SearchResult(path, start, order, graph.cells, pops, generated, len(order), pops,
+                            max_frontier)
 
 
 class UCS:
     """Uniform Cost Search (Dijkstra's Algorithm)"""
     
     @staticmethod
+    @timed_search
     def search(start, goal, board):
         """
         Find lowest cost path using UCS
-        Returns: path (list of positions), visited_nodes (set)
+        Returns: SearchResult
         """
-        # Priority queue: (cost, position)
-        pq = [(0, start)]
-        came_from = {start: None}
-        cost_so_far = {start: 0}
-        visited = set()
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal, -1)
+        offsets, targets = graph.offsets, graph.targets
         
+        # Priority queue: (cost, node id); ids are row-major so ties break as for positions
+        root_cost = 1 if include_root else 0
+        pq = [(root_cost, node) for node in roots]
+        heapq.heapify(pq)
+        came_from = array('i', [-1]) * graph.size
+        cost_so_far = array('l', [-1]) * graph.size
+        for node in roots:
+            cost_so_far[node] = root_cost
+        closed = bytearray(graph.size)
+        visited = []
+        pushes = len(pq)
+        pops = generated = max_frontier = 0
+        
+        path = []
         while pq:
+            if len(pq) > max_frontier:
+                max_frontier = len(pq)
             current_cost, current = heapq.heappop(pq)
+            pops += 1
             
-            if current in visited:
+            if closed[current]:
                 continue
             
-            visited.add(current)
+            closed[current] = 1
+            visited.append(current)
             
-            if current == goal:
-                return reconstruct_path(came_from, start, goal), visited
+            if current == target:
+                path = reconstruct_node_path(came_from, target, graph.cells, include_root)
+                break
             
-            for neighbor in get_neighbors(current, board):
-                new_cost = current_cost + 1  # Uniform cost of 1 per move
-                
-                if neighbor not in cost_so_far or new_cost < cost_so_far[neighbor]:
+            new_cost = current_cost + 1  # Uniform cost of 1 per move
+            generated += offsets[current + 1] - offsets[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if cost_so_far[neighbor] < 0 or new_cost < cost_so_far[neighbor]:
                     cost_so_far[neighbor] = new_cost
-                    priority = new_cost
-                    heapq.heappush(pq, (priority, neighbor))
+                    heapq.heappush(pq, (new_cost, neighbor))
+                    pushes += 1
                     came_from[neighbor] = current
         
-        return [], visited
+        return SearchResult(path, start, visited, graph.cells, None, generated, pushes, pops,
+                            max_frontier)
 
 
 class AStar:
     """A* Search Algorithm"""
     
     @staticmethod
+    @timed_search
     def search(start, goal, board, heuristic=manhattan_distance):
         """
         Find optimal path using A* with heuristic
-        Returns: path (list of positions), visited_nodes (set)
+        Returns: SearchResult
         """
-        # Priority queue: (f_score, position)
-        pq = [(0, start)]
-        came_from = {start: None}
-        g_score = {start: 0}
-        visited = set()
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal, -1)
+        offsets, targets, cells = graph.offsets, graph.targets, graph.cells
         
+        # Priority queue: (f_score, node id)
+        root_cost = 1 if include_root else 0
+        if include_root:
+            pq = [(root_cost + heuristic(cells[node], goal), node) for node in roots]
+            heapq.heapify(pq)
+        else:
+            pq = [(0, roots[0])]
+        came_from = array('i', [-1]) * graph.size
+        g_score = array('l', [-1]) * graph.size
+        for node in roots:
+            g_score[node] = root_cost
+        closed = bytearray(graph.size)
+        visited = []
+        pushes = len(pq)
+        pops = generated = max_frontier = 0
+        
+        path = []
         while pq:
+            if len(pq) > max_frontier:
+                max_frontier = len(pq)
             _, current = heapq.heappop(pq)
+            pops += 1
             
-            if current in visited:
+            if closed[current]:
                 continue
             
-            visited.add(current)
+            closed[current] = 1
+            visited.append(current)
             
-            if current == goal:
-                return reconstruct_path(came_from, start, goal), visited
+            if current == target:
+                path = reconstruct_node_path(came_from, target, cells, include_root)
+                break
             
-            for neighbor in get_neighbors(current, board):
-                tentative_g = g_score[current] + 1
-                
-                if neighbor not in g_score or tentative_g < g_score[neighbor]:
+            tentative_g = g_score[current] + 1
+            generated += offsets[current + 1] - offsets[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
                     g_score[neighbor] = tentative_g
-                    f_score = tentative_g + heuristic(neighbor, goal)
+                    f_score = tentative_g + heuristic(cells[neighbor], goal)
                     heapq.heappush(pq, (f_score, neighbor))
+                    pushes += 1
                     came_from[neighbor] = current
         
-        return [], visited
+        return SearchResult(path, start, visited, cells, None, generated, pushes, pops,
+                            max_frontier)
+
+
+class JPS:
+    """Jump Point Search for the 4-connected uniform-cost grid"""
+    
+    # right, left, down, up, matching get_neighbors
+    DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+    # Directions worth trying after arriving in each direction (everything but reversing)
+    SUCCESSORS = [(0, 2, 3), (1, 2, 3), (2, 0, 1), (3, 0, 1)]
+    
+    @staticmethod
+    def jump(graph, row, col, dr, dc, goal):
+        """
+        Slide from (row, col) in one direction until a cell where a turn is possible,
+        the goal, or a wall
+        Returns: (node id, steps) of the jump point, or None at a dead end
+        """
+        rows, cols, node_ids = graph.rows, graph.cols, graph.node_ids
+        steps = 0
+        while True:
+            row += dr
+            col += dc
+            if not (0 <= row < rows and 0 <= col < cols) or node_ids[row * cols + col] < 0:
+                return None
+            steps += 1
+            if (row, col) == goal:
+                return node_ids[row * cols + col], steps
+            # Stop wherever a perpendicular move is open
+            if dr == 0:
+                side_a, side_b = (row - 1, col), (row + 1, col)
+            else:
+                side_a, side_b = (row, col - 1), (row, col + 1)
+            for r, c in (side_a, side_b):
+                if 0 <= r < rows and 0 <= c < cols and node_ids[r * cols + c] >= 0:
+                    return node_ids[row * cols + col], steps
+    
+    @staticmethod
+    @timed_search
+    def search(start, goal, board, heuristic=manhattan_distance):
+        """
+        Find optimal path with A* over jump points: straight corridor runs are
+        crossed in one jump instead of cell by cell
+        visited_nodes holds the expanded jump points
+        Returns: SearchResult
+        """
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal)
+        if target is None:
+            return AStar.search(start, goal, board, heuristic)
+        cells = graph.cells
+        
+        root_cost = 1 if include_root else 0
+        came_from = array('i', [-1]) * graph.size
+        came_dir = array('b', [-1]) * graph.size  # Direction of the jump into each node
+        g_score = array('l', [-1]) * graph.size
+        closed = bytearray(graph.size)
+        pq = []
+        for node in roots:
+            g_score[node] = root_cost
+            pq.append((root_cost + heuristic(cells[node], goal), node))
+        heapq.heapify(pq)
+        visited = []
+        pushes = len(pq)
+        pops = generated = max_frontier = 0
+        
+        path = []
+        while pq:
+            if len(pq) > max_frontier:
+                max_frontier = len(pq)
+            _, current = heapq.heappop(pq)
+            pops += 1
+            
+            if closed[current]:
+                continue
+            
+            closed[current] = 1
+            visited.append(current)
+            
+            if current == target:
+                path = JPS._expand_path(came_from, target, cells, include_root)
+                break
+            
+            row, col = cells[current]
+            arrived = came_dir[current]
+            directions = JPS.SUCCESSORS[arrived] if arrived >= 0 else range(4)
+            for d in directions:
+                dr, dc = JPS.DIRECTIONS[d]
+                jumped = JPS.jump(graph, row, col, dr, dc, goal)
+                if jumped is None:
+                    continue
+                generated += 1
+                neighbor, steps = jumped
+                tentative_g = g_score[current] + steps
+                if g_score[neighbor] < 0 or tentative_g < g_score[neighbor]:
+                    g_score[neighbor] = tentative_g
+                    came_from[neighbor] = current
+                    came_dir[neighbor] = d
+                    f_score = tentative_g + heuristic(cells[neighbor], goal)
+                    heapq.heappush(pq, (f_score, neighbor))
+                    pushes += 1
+        
+        return SearchResult(path, start, visited, cells, None, generated, pushes, pops,
+                            max_frontier)
+    
+    @staticmethod
+    def _expand_path(came_from, goal, cells, include_root):
+        """Fill in the straight cell runs between consecutive jump points"""
+        jump_points = reconstruct_node_path(came_from, goal, cells, True)
+        path = [jump_points[0]] if include_root else []
+        for (r0, c0), (r1, c1) in zip(jump_points, jump_points[1:]):
+            dr = (r1 > r0) - (r1 < r0)
+            dc = (c1 > c0) - (c1 < c0)
+            for step in range(1, abs(r1 - r0) + abs(c1 - c0) + 1):
+                path.append((r0 + dr * step, c0 + dc * step))
+        return path
+
+
+class HeapQueue:
+    """Binary-heap priority queue of (priority, item)"""
+    
+    def __init__(self):
+        self.heap = []
+    
+    def __len__(self):
+        return len(self.heap)
+    
+    def push(self, priority, item):
+        heapq.heappush(self.heap, (priority, item))
+    
+    def pop(self):
+        """Returns: (priority, item) with the lowest priority"""
+        return heapq.heappop(self.heap)
+
+
+class BucketQueue:
+    """
+    Priority queue for small non-negative integer priorities that never drop
+    below the last one popped (Dial's algorithm): one FIFO bucket per priority
+    """
+    
+    def __init__(self):
+        self.buckets = []
+        self.lowest = 0  # No live item has a smaller priority
+        self.size = 0
+    
+    def __len__(self):
+        return self.size
+    
+    def push(self, priority, item):
+        while len(self.buckets) <= priority:
+            self.buckets.append(deque())
+        self.buckets[priority].append(item)
+        self.size += 1
+    
+    def pop(self):
+        """Returns: (priority, item) with the lowest priority, oldest first"""
+        while not self.buckets[self.lowest]:
+            self.lowest += 1
+        self.size -= 1
+        return self.lowest, self.buckets[self.lowest].popleft()
+
+
+class JunctionSearch:
+    """BFS, UCS and A* run over the corridor-compressed junction graph"""
+    
+    @staticmethod
+    def bfs(start, goal, board):
+        """Shortest path, expanding junctions breadth-first in steps from a bucket queue"""
+        return JunctionSearch.search(start, goal, board, buckets=True)
+    
+    @staticmethod
+    def ucs(start, goal, board):
+        """Shortest path by Dijkstra over corridor lengths"""
+        return JunctionSearch.search(start, goal, board)
+    
+    @staticmethod
+    def astar(start, goal, board, heuristic=manhattan_distance):
+        """Shortest path by A* over corridor lengths"""
+        return JunctionSearch.search(start, goal, board, heuristic)
+    
+    @staticmethod
+    @timed_search
+    def search(start, goal, board, heuristic=None, buckets=False):
+        """
+        Search junctions only, then expand the corridors taken back into cells
+        Edges cost their corridor length; buckets=True keeps the frontier in a
+        BucketQueue (no heuristic) instead of a binary heap
+        visited_nodes holds the expanded junction cells
+        Returns: SearchResult
+        """
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        junctions = board.get_junction_graph()
+        graph = junctions.graph
+        cells, nodes = graph.cells, junctions.nodes
+        target = graph.index.get(goal)
+        if target is None:
+            return SearchResult([], start)
+        
+        # Ways onto the junction graph: (first node, steps to reach it, prefix of node ids)
+        node = graph.index.get(start)
+        if node is not None:
+            entries = [(node, 0, ())]
+        else:
+            entries = [(graph.index[n], 1, (graph.index[n],)) for n in get_neighbors(start, board)]
+        
+        exits = {}  # Junction id -> (steps to goal, node ids after the junction)
+        for junction, steps, walked in junctions.attachments(target):
+            if junction not in exits or steps < exits[junction][0]:
+                exits[junction] = (steps, walked[::-1][1:] + (target,) if walked else ())
+        
+        sink = junctions.size  # Virtual node joined to the goal's exits
+        cost = array('l', [-1]) * (sink + 1)
+        parent = array('i', [-1]) * (sink + 1)  # Previous junction, -1 for entries
+        came_by = [None] * (sink + 1)  # Corridor id, or the entry prefix for entries
+        for first, steps, prefix in entries:
+            walked = junctions.along(first, target)
+            if walked is not None or first == target:
+                # Goal lies on the same corridor: walk straight there
+                total = steps + len(walked or ())
+                if cost[sink] < 0 or total < cost[sink]:
+                    cost[sink] = total
+                    came_by[sink] = prefix + (walked or ())
+            for junction, more, walked in junctions.attachments(first):
+                total = steps + more
+                if cost[junction] < 0 or total < cost[junction]:
+                    cost[junction] = total
+                    came_by[junction] = prefix + walked
+        frontier = BucketQueue() if buckets else HeapQueue()
+        for junction in range(sink + 1):
+            if cost[junction] >= 0:
+                h = heuristic(cells[nodes[junction]], goal) if heuristic and junction < sink else 0
+                frontier.push(cost[junction] + h, junction)
+        
+        closed = bytearray(sink + 1)
+        visited = []
+        pushes = len(frontier)
+        pops = generated = max_frontier = 0
+        while frontier:
+            if len(frontier) > max_frontier:
+                max_frontier = len(frontier)
+            _, current = frontier.pop()
+            pops += 1
+            if closed[current]:
+                continue
+            closed[current] = 1
+            if current == sink:
+                break
+            visited.append(nodes[current])
+            
+            if current in exits:
+                total = cost[current] + exits[current][0]
+                if cost[sink] < 0 or total < cost[sink]:
+                    cost[sink] = total
+                    parent[sink] = current
+                    frontier.push(total, sink)
+                    pushes += 1
+            
+            generated += len(junctions.adjacency[current])
+            for neighbor, length, corridor in junctions.adjacency[current]:
+                total = cost[current] + length
+                if cost[neighbor] < 0 or total < cost[neighbor]:
+                    cost[neighbor] = total
+                    parent[neighbor] = current
+                    came_by[neighbor] = corridor
+                    h = heuristic(cells[nodes[neighbor]], goal) if heuristic else 0
+                    frontier.push(total + h, neighbor)
+                    pushes += 1
+        
+        counters = dict(generated=generated, pushes=pushes, pops=pops, max_frontier=max_frontier)
+        if not closed[sink]:
+            return SearchResult([], start, visited, cells, **counters)
+        junction = parent[sink]
+        if junction < 0:
+            walked = list(came_by[sink])
+        else:
+            segments = [exits[junction][1]]
+            while parent[junction] >= 0:
+                segments.append(junctions.corridor_path(came_by[junction], parent[junction]))
+                junction = parent[junction]
+            segments.append(came_by[junction])
+            walked = [n for segment in reversed(segments) for n in segment]
+        return SearchResult([cells[n] for n in walked], start, visited, cells, **counters)
+
+
+class DStarLite:
+    """
+    D* Lite incremental planner towards a fixed goal
+    Search state is kept between plan() calls, so moving the start or changing
+    board walkability only repairs the affected part of the search
+    """
+    
+    def __init__(self, board, goal, heuristic=manhattan_distance):
+        self.board = board
+        self.goal = goal
+        self.heuristic = heuristic
+        self.g = {}
+        self.rhs = {goal: 0}
+        self.km = 0
+        self.open = []  # Heap of (k1, k2, position); stale entries are skipped
+        self.open_keys = {}  # position -> key of its live heap entry
+        self.start = None
+        self.last_start = None
+        self.version = board.walkability_version
+        self._reset_counters()
+        self._push(goal, (heuristic(goal, goal), 0))
+    
+    def _reset_counters(self):
+        """Counters reported on the SearchResult of the next plan() call"""
+        self.expanded = 0
+        self.generated = 0
+        self.pushes = 0
+        self.pops = 0
+        self.max_frontier = 0
+    
+    def _push(self, pos, key):
+        self.open_keys[pos] = key
+        heapq.heappush(self.open, (key[0], key[1], pos))
+        self.pushes += 1
+    
+    def _key(self, pos):
+        m = min(self.g.get(pos, math.inf), self.rhs.get(pos, math.inf))
+        return (m + self.heuristic(self.start, pos) + self.km, m)
+    
+    def _neighbors(self, pos):
+        """Walkable 4-neighbors of a position (edges are symmetric)"""
+        row, col = pos
+        return [(row + dr, col + dc) for dr, dc in JPS.DIRECTIONS
+                if self.board.is_walkable(row + dr, col + dc)]
+    
+    def _update_vertex(self, pos):
+        if pos != self.goal:
+            best = math.inf
+            if self.board.is_walkable(*pos):
+                for neighbor in self._neighbors(pos):
+                    best = min(best, 1 + self.g.get(neighbor, math.inf))
+            self.rhs[pos] = best
+        self.open_keys.pop(pos, None)
+        if self.g.get(pos, math.inf) != self.rhs.get(pos, math.inf):
+            self._push(pos, self._key(pos))
+    
+    def _top_key(self):
+        while self.open:
+            k1, k2, pos = self.open[0]
+            if self.open_keys.get(pos) == (k1, k2):
+                return (k1, k2)
+            heapq.heappop(self.open)
+            self.pops += 1
+        return (math.inf, math.inf)
+    
+    def _compute_shortest_path(self, visited):
+        start = self.start
+        while (self._top_key() < self._key(start)
+               or self.rhs.get(start, math.inf) != self.g.get(start, math.inf)):
+            if not self.open:
+                break
+            if len(self.open) > self.max_frontier:
+                self.max_frontier = len(self.open)
+            k1, k2, pos = heapq.heappop(self.open)
+            self.pops += 1
+            del self.open_keys[pos]
+            visited.add(pos)
+            self.expanded += 1
+            
+            new_key = self._key(pos)
+            if (k1, k2) < new_key:
+                self._push(pos, new_key)
+            elif self.g.get(pos, math.inf) > self.rhs.get(pos, math.inf):
+                self.g[pos] = self.rhs[pos]
+                neighbors = self._neighbors(pos)
+                self.generated += len(neighbors)
+                for neighbor in neighbors:
+                    self._update_vertex(neighbor)
+            else:
+                self.g[pos] = math.inf
+                neighbors = self._neighbors(pos)
+                self.generated += len(neighbors)
+                for neighbor in neighbors + [pos]:
+                    self._update_vertex(neighbor)
+    
+    def _sync_walls(self):
+        """Repair edges around cells whose walkability changed since the last call"""
+        if self.board.walkability_version == self.version:
+            return True
+        changed = self.board.walkability_changes_since(self.version)
+        self.version = self.board.walkability_version
+        if changed is None:
+            return False
+        for row, col in changed:
+            self._update_vertex((row, col))
+            for dr, dc in JPS.DIRECTIONS:
+                self._update_vertex((row + dr, col + dc))
+        return True
+    
+    @timed_search
+    def plan(self, start):
+        """
+        Shortest path from start to the goal, repairing the previous search
+        visited_nodes holds the nodes expanded by this call
+        Returns: SearchResult
+        """
+        if start == self.goal:
+            return SearchResult([], start, goal_reached=True)
+        if not self.board.is_walkable(*start):
+            # Off the grid (wrap tunnel): plan this step from scratch
+            return AStar.search(start, self.goal, self.board, self.heuristic)
+        
+        if self.start is None:
+            self.start = self.last_start = start
+        elif start != self.start:
+            self.km += self.heuristic(self.last_start, start)
+            self.last_start = start
+            self.start = start
+        if not self._sync_walls():
+            self.__init__(self.board, self.goal, self.heuristic)
+            self.start = self.last_start = start
+        
+        visited = set()
+        self._reset_counters()
+        self._compute_shortest_path(visited)
+        
+        path = []
+        if self.g.get(start, math.inf) != math.inf:
+            current = start
+            while current != self.goal and len(path) < len(self.g):
+                current = min(self._neighbors(current), key=lambda n: self.g.get(n, math.inf))
+                path.append(current)
+        return SearchResult(path, start, visited, None, self.expanded, self.generated,
+                            self.pushes, self.pops, self.max_frontier)
+
+
+class BidirectionalBFS:
+    """Bidirectional Breadth-First Search"""
+    
+    @staticmethod
+    @timed_search
+    def search(start, goal, board):
+        """
+        Find shortest path by growing BFS levels from both ends, smaller frontier first
+        Returns: SearchResult
+        """
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal)
+        if target is None:
+            return BFS.search(start, goal, board)
+        offsets, targets = graph.offsets, graph.targets
+        
+        root_dist = 1 if include_root else 0
+        dist_f = array('i', [-1]) * graph.size
+        dist_b = array('i', [-1]) * graph.size
+        parent_f = array('i', [-1]) * graph.size
+        parent_b = array('i', [-1]) * graph.size
+        for node in roots:
+            dist_f[node] = root_dist
+        dist_b[target] = 0
+        frontier_f = list(roots)
+        frontier_b = [target]
+        order = list(roots) + [target]
+        
+        best, meet = (root_dist, target) if target in roots else (-1, -1)
+        expanded = generated = max_frontier = 0
+        while meet < 0 and frontier_f and frontier_b:
+            if len(frontier_f) + len(frontier_b) > max_frontier:
+                max_frontier = len(frontier_f) + len(frontier_b)
+            # Expand one full level on the side with the smaller frontier
+            if len(frontier_f) <= len(frontier_b):
+                frontier, dist, parent, other = frontier_f, dist_f, parent_f, dist_b
+            else:
+                frontier, dist, parent, other = frontier_b, dist_b, parent_b, dist_f
+            
+            next_frontier = []
+            expanded += len(frontier)
+            for current in frontier:
+                generated += offsets[current + 1] - offsets[current]
+                for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                    if dist[neighbor] < 0:
+                        dist[neighbor] = dist[current] + 1
+                        parent[neighbor] = current
+                        next_frontier.append(neighbor)
+                        order.append(neighbor)
+                        # Meeting: keep the shortest join found in this level
+                        if other[neighbor] >= 0:
+                            total = dist[neighbor] + other[neighbor]
+                            if meet < 0 or total < best:
+                                best, meet = total, neighbor
+            
+            if frontier is frontier_f:
+                frontier_f = next_frontier
+            else:
+                frontier_b = next_frontier
+        
+        path = [] if meet < 0 else _join_paths(parent_f, parent_b, meet, graph.cells, include_root)
+        return SearchResult(path, start, order, graph.cells, expanded, generated, len(order),
+                            expanded, max_frontier)
+
+
+class BidirectionalAStar:
+    """Bidirectional A* Search (symmetric, front-to-end heuristics)"""
+    
+    @staticmethod
+    @timed_search
+    def search(start, goal, board, heuristic=manhattan_distance):
+        """
+        Find optimal path with A* running forward towards goal and backward towards start
+        Each step expands the side with fewer open nodes; nodes already closed by the
+        other side are not expanded again. Stops once either side's smallest f-score
+        reaches the best path found
+        Returns: SearchResult
+        """
+        if start == goal:
+            return SearchResult([], start, goal_reached=True)
+        graph, roots, include_root = search_roots(start, board)
+        target = graph.index.get(goal)
+        if target is None:
+            return AStar.search(start, goal, board, heuristic)
+        offsets, targets, cells = graph.offsets, graph.targets, graph.cells
+        
+        root_cost = 1 if include_root else 0
+        g_f = array('l', [-1]) * graph.size
+        g_b = array('l', [-1]) * graph.size
+        parent_f = array('i', [-1]) * graph.size
+        parent_b = array('i', [-1]) * graph.size
+        closed_f = bytearray(graph.size)
+        closed_b = bytearray(graph.size)
+        pq_f = []
+        for node in roots:
+            g_f[node] = root_cost
+            pq_f.append((root_cost + heuristic(cells[node], goal), node))
+        heapq.heapify(pq_f)
+        g_b[target] = 0
+        pq_b = [(heuristic(goal, start), target)]
+        visited = []
+        pushes = len(pq_f) + 1
+        pops = generated = max_frontier = 0
+        
+        best, meet = (root_cost, target) if target in roots else (math.inf, -1)
+        while pq_f and pq_b:
+            if max(pq_f[0][0], pq_b[0][0]) >= best:
+                break
+            if len(pq_f) + len(pq_b) > max_frontier:
+                max_frontier = len(pq_f) + len(pq_b)
+            if len(pq_f) <= len(pq_b):
+                pq, g, other, parent, closed, other_closed, end = (
+                    pq_f, g_f, g_b, parent_f, closed_f, closed_b, goal)
+            else:
+                pq, g, other, parent, closed, other_closed, end = (
+                    pq_b, g_b, g_f, parent_b, closed_b, closed_f, start)
+            
+            _, current = heapq.heappop(pq)
+            pops += 1
+            if closed[current]:
+                continue
+            closed[current] = 1
+            visited.append(current)
+            if other_closed[current]:
+                continue  # Paths through here are already accounted for
+            
+            tentative_g = g[current] + 1
+            generated += offsets[current + 1] - offsets[current]
+            for neighbor in targets[offsets[current]:offsets[current + 1]]:
+                if g[neighbor] < 0 or tentative_g < g[neighbor]:
+                    g[neighbor] = tentative_g
+                    parent[neighbor] = current
+                    heapq.heappush(pq, (tentative_g + heuristic(cells[neighbor], end), neighbor))
+                    pushes += 1
+                    if other[neighbor] >= 0 and tentative_g + other[neighbor] < best:
+                        best, meet = tentative_g + other[neighbor], neighbor
+        
+        path = [] if meet < 0 else _join_paths(parent_f, parent_b, meet, cells, include_root)
+        return SearchResult(path, start, visited, cells, None, generated, pushes, pops,
+                            max_frontier)
+
+
+def _join_paths(parent_f, parent_b, meet, cells, include_root):
+    """Join the forward path to a meeting node with the backward chain to the goal"""
+    path = reconstruct_node_path(parent_f, meet, cells, include_root)
+    node = parent_b[meet]
+    while node != -1:
+        path.append(cells[node])
+        node = parent_b[node]
+    return path
+
+
+def greedy_ghost_moves(ghost_positions, player_pos, board, distance=manhattan_distance):
+    """Move every ghost one step closer to the player (the cheap ghost model)"""
+    new_ghost_positions = []
+    for ghost_pos in ghost_positions:
+        ghost_neighbors = get_neighbors(ghost_pos, board)
+        if ghost_neighbors:
+            # Ghost moves closer to player
+            closest = min(ghost_neighbors, 
+                        key=lambda p: distance(p, player_pos))
+            new_ghost_positions.append(closest)
+        else:
+            new_ghost_positions.append(ghost_pos)
+    return new_ghost_positions
+
+
+def ghost_replies(ghost_positions, player_pos, board, distance=manhattan_distance,
+                  radius=GHOST_RELEVANCE_RADIUS):
+    """
+    Lazily generate joint ghost moves for an adversarial min node
+    Each ghost's moves are ordered closest to the player first, so the greedy
+    reply comes first; ghosts farther than radius only get their greedy move
+    """
+    options = []
+    for ghost_pos in ghost_positions:
+        ghost_neighbors = get_neighbors(ghost_pos, board)
+        if not ghost_neighbors:
+            options.append((ghost_pos,))
+            continue
+        ranked = sorted(ghost_neighbors, key=lambda p: distance(p, player_pos))
+        if distance(ghost_pos, player_pos) > radius:
+            options.append(ranked[:1])
+        else:
+            options.append(ranked)
+    return itertools.product(*options)
 
 
 class Minimax:
     """Minimax Algorithm for adversarial search"""
     
     @staticmethod
-    def evaluate_state(player_pos, ghost_positions, board):
+    def evaluate_state(player_pos, ghost_positions, board, distance=manhattan_distance):
         """
         Evaluate game state from player's perspective
         Higher score = better for player
@@ -191,13 +1010,12 @@ class Minimax:
         
         # Distance to nearest ghost (we want to maximize this)
         if ghost_positions:
-            min_ghost_dist = min(manhattan_distance(player_pos, g) for g in ghost_positions)
+            min_ghost_dist = min(distance(player_pos, g) for g in ghost_positions)
             score += min_ghost_dist * 10
         
-        # Distance to nearest dot (we want to minimize this)
-        dots = board.get_all_dots()
-        if dots:
-            min_dot_dist = min(manhattan_distance(player_pos, (d[0], d[1])) for d in dots)
+        # Maze distance to nearest dot (we want to minimize this)
+        min_dot_dist = board.get_dot_field().distance(player_pos)
+        if min_dot_dist != math.inf:
             score -= min_dot_dist * 5
         
         # Prefer positions with more escape routes
@@ -207,13 +1025,16 @@ class Minimax:
         return score
     
     @staticmethod
-    def minimax(player_pos, ghost_positions, board, depth, is_maximizing):
+    def minimax(player_pos, ghost_positions, board, depth, is_maximizing,
+                distance=manhattan_distance, adversarial=False):
         """
         Minimax algorithm implementation
+        adversarial=True branches over ghost replies instead of moving ghosts greedily
         Returns: (best_score, best_move)
         """
         if depth == 0:
-            return Minimax.evaluate_state(player_pos, ghost_positions, board), player_pos
+            score = Minimax.evaluate_state(player_pos, ghost_positions, board, distance)
+            return score, player_pos
         
         if is_maximizing:
             # Player's turn (maximize)
@@ -222,7 +1043,7 @@ class Minimax:
             
             for neighbor in get_neighbors(player_pos, board):
                 eval_score, _ = Minimax.minimax(neighbor, ghost_positions, board, 
-                                                depth - 1, False)
+                                                depth - 1, False, distance, adversarial)
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = neighbor
@@ -233,106 +1054,427 @@ class Minimax:
             min_eval = float('inf')
             best_move = player_pos
             
-            # Simulate ghosts moving towards player
-            new_ghost_positions = []
-            for ghost_pos in ghost_positions:
-                ghost_neighbors = get_neighbors(ghost_pos, board)
-                if ghost_neighbors:
-                    # Ghost moves closer to player
-                    closest = min(ghost_neighbors, 
-                                key=lambda p: manhattan_distance(p, player_pos))
-                    new_ghost_positions.append(closest)
-                else:
-                    new_ghost_positions.append(ghost_pos)
+            if adversarial:
+                # Search every relevant joint ghost reply
+                for reply in ghost_replies(ghost_positions, player_pos, board, distance):
+                    eval_score, _ = Minimax.minimax(player_pos, list(reply), board,
+                                                    depth - 1, True, distance, adversarial)
+                    min_eval = min(min_eval, eval_score)
+                return min_eval, player_pos
             
+            # Simulate ghosts moving towards player
+            new_ghost_positions = greedy_ghost_moves(ghost_positions, player_pos, board, distance)
             eval_score, _ = Minimax.minimax(player_pos, new_ghost_positions, board, 
-                                           depth - 1, True)
+                                           depth - 1, True, distance)
             min_eval = min(min_eval, eval_score)
             
             return min_eval, player_pos
     
     @staticmethod
-    def get_best_move(player_pos, ghost_positions, board, depth=MINIMAX_DEPTH):
+    def get_best_move(player_pos, ghost_positions, board, depth=MINIMAX_DEPTH,
+                      distance=manhattan_distance, adversarial=False):
         """Get best move using minimax"""
-        _, best_move = Minimax.minimax(player_pos, ghost_positions, board, depth, True)
+        _, best_move = Minimax.minimax(player_pos, ghost_positions, board, depth, True, distance,
+                                       adversarial)
         return best_move
 
 
+class SearchTimeout(Exception):
+    """Raised inside a game-tree search when its time budget runs out"""
+
+
+class TranspositionTable:
+    """Cache of searched game-tree states with depth, score, bound type and best move"""
+    
+    EXACT = 0
+    LOWER = 1  # Score is a lower bound (search failed high)
+    UPPER = 2  # Score is an upper bound (search failed low)
+    
+    def __init__(self, max_entries=200000):
+        self.max_entries = max_entries
+        self.entries = {}
+        self.board_key = None
+    
+    def sync(self, board, distance, adversarial=False):
+        """Forget stored scores once the dots, the evaluation distance or the ghost model change"""
+        key = (board.dots_version, board.walkability_version, distance, adversarial)
+        if key != self.board_key:
+            self.entries.clear()
+            self.board_key = key
+    
+    def lookup(self, key):
+        """Returns: (depth, score, flag, best_move) or None"""
+        return self.entries.get(key)
+    
+    def store(self, key, depth, score, flag, best_move):
+        """Record a searched state, keeping the deeper of two results"""
+        entry = self.entries.get(key)
+        if entry is not None and entry[0] > depth:
+            return
+        if entry is None and len(self.entries) >= self.max_entries:
+            self.entries.clear()
+        self.entries[key] = (depth, score, flag, best_move)
+
+
+class SearchStats:
+    """Node and cutoff counters for one AlphaBeta decision"""
+    
+    def __init__(self):
+        self.nodes = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0  # Cutoffs caused by the first move tried
+        self.tt_hits = 0
+        self.depth = 0
+    
+    def first_move_cutoff_rate(self):
+        """Fraction of cutoffs found on the first move (1.0 = perfect ordering)"""
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+    
+    def as_dict(self):
+        return {
+            'nodes': self.nodes,
+            'cutoffs': self.cutoffs,
+            'first_move_cutoffs': self.first_move_cutoffs,
+            'first_move_cutoff_rate': self.first_move_cutoff_rate(),
+            'tt_hits': self.tt_hits,
+            'depth': self.depth,
+        }
+
+
+class MoveOrdering:
+    """
+    Player move ordering for AlphaBeta: the stored best move first, then
+    killer moves for the ply, then moves with the highest history score
+    Killers are reset per decision; the history table persists across frames
+    Under the default greedy ghost model (ADVERSARIAL_GHOSTS = False) every min
+    node has one child, so there are no cutoffs and ordering has no effect
+    """
+    
+    def __init__(self, use_hash_move=True, use_killers=True, use_history=True, killer_slots=2):
+        self.use_hash_move = use_hash_move
+        self.use_killers = use_killers
+        self.use_history = use_history
+        self.killer_slots = killer_slots
+        self.killers = {}  # ply -> recent cutoff directions (dr, dc)
+        self.history = {}  # (from, to) -> accumulated depth^2 of cutoffs
+    
+    def new_decision(self):
+        """Start a new root search: drop killers and age the history table"""
+        self.killers.clear()
+        for move in list(self.history):
+            self.history[move] //= 2
+            if not self.history[move]:
+                del self.history[move]
+    
+    def order(self, position, moves, ply, hash_move=None):
+        """Return moves sorted most promising first"""
+        killers = self.killers.get(ply, ()) if self.use_killers else ()
+        
+        def rank(move):
+            if self.use_hash_move and move == hash_move:
+                return (0, 0)
+            delta = (move[0] - position[0], move[1] - position[1])
+            if delta in killers:
+                return (1, killers.index(delta))
+            if self.use_history:
+                return (2, -self.history.get((position, move), 0))
+            return (2, 0)
+        
+        return sorted(moves, key=rank)
+    
+    def record_cutoff(self, position, move, ply, depth):
+        """Remember a move that caused a beta cutoff"""
+        if self.use_killers:
+            delta = (move[0] - position[0], move[1] - position[1])
+            slots = self.killers.setdefault(ply, [])
+            if delta in slots:
+                slots.remove(delta)
+            slots.insert(0, delta)
+            del slots[self.killer_slots:]
+        if self.use_history:
+            key = (position, move)
+            self.history[key] = self.history.get(key, 0) + depth * depth
+
+
+class SearchContext:
+    """State shared by every node of one AlphaBeta search"""
+    
+    def __init__(self, table=None, deadline=None, ordering=None, stats=None, root_depth=0):
+        self.table = table
+        self.deadline = deadline  # time.perf_counter() value, or None for no limit
+        self.ordering = ordering
+        self.stats = stats if stats is not None else SearchStats()
+        self.root_depth = root_depth  # Used to turn remaining depth into ply
+    
+    def visit(self):
+        """Count a node and abort the search once past the deadline"""
+        self.stats.nodes += 1
+        if (self.deadline is not None and not self.stats.nodes & 63
+                and time.perf_counter() > self.deadline):
+            raise SearchTimeout()
+
+
 class AlphaBeta:
     """Alpha-Beta Pruning optimization of Minimax"""
     
     @staticmethod
-    def evaluate_state(player_pos, ghost_positions, board):
+    def evaluate_state(player_pos, ghost_positions, board, distance=manhattan_distance):
         """Same evaluation as Minimax"""
-        return Minimax.evaluate_state(player_pos, ghost_positions, board)
+        return Minimax.evaluate_state(player_pos, ghost_positions, board, distance)
     
     @staticmethod
-    def alphabeta(player_pos, ghost_positions, board, depth, alpha, beta, is_maximizing):
+    def alphabeta(player_pos, ghost_positions, board, depth, alpha, beta, is_maximizing,
+                  distance=manhattan_distance, context=None, adversarial=False):
         """
         Alpha-Beta pruning algorithm
+        Optional context supplies a transposition table and deadline;
+        adversarial=True branches over ghost replies instead of moving ghosts greedily
         Returns: (best_score, best_move)
         """
+        if context is not None:
+            context.visit()
+        
         if depth == 0:
-            return AlphaBeta.evaluate_state(player_pos, ghost_positions, board), player_pos
+            score = AlphaBeta.evaluate_state(player_pos, ghost_positions, board, distance)
+            return score, player_pos
+        
+        table = context.table if context is not None else None
+        hash_move = None
+        if table is not None:
+            key = (player_pos, tuple(ghost_positions), is_maximizing)
+            entry = table.lookup(key)
+            if entry is not None:
+                hash_move = entry[3]  # Best move from an earlier iteration
+            if entry is not None and entry[0] >= depth:
+                _, stored_score, flag, stored_move = entry
+                context.stats.tt_hits += 1
+                if flag == TranspositionTable.EXACT:
+                    return stored_score, stored_move
+                if flag == TranspositionTable.LOWER:
+                    alpha = max(alpha, stored_score)
+                else:
+                    beta = min(beta, stored_score)
+                if beta <= alpha:
+                    return stored_score, stored_move
+            alpha_orig, beta_orig = alpha, beta
         
         if is_maximizing:
             # Player's turn (maximize)
             max_eval = float('-inf')
             best_move = player_pos
             
-            for neighbor in get_neighbors(player_pos, board):
+            moves = get_neighbors(player_pos, board)
+            ordering = context.ordering if context is not None else None
+            ply = context.root_depth - depth if context is not None else 0
+            if ordering is not None:
+                moves = ordering.order(player_pos, moves, ply, hash_move)
+            
+            for i, neighbor in enumerate(moves):
                 eval_score, _ = AlphaBeta.alphabeta(neighbor, ghost_positions, board, 
-                                                     depth - 1, alpha, beta, False)
+                                                     depth - 1, alpha, beta, False, distance,
+                                                     context, adversarial)
                 if eval_score > max_eval:
                     max_eval = eval_score
                     best_move = neighbor
                 
                 alpha = max(alpha, eval_score)
                 if beta <= alpha:
-                    break  # Beta cutoff
+                    # Beta cutoff
+                    if ordering is not None:
+                        ordering.record_cutoff(player_pos, neighbor, ply, depth)
+                    if context is not None:
+                        context.stats.cutoffs += 1
+                        if i == 0:
+                            context.stats.first_move_cutoffs += 1
+                    break
             
-            return max_eval, best_move
+            best_score = max_eval
         else:
             # Ghosts' turn (minimize)
             min_eval = float('inf')
             best_move = player_pos
             
-            # Simulate ghosts moving towards player
-            new_ghost_positions = []
-            for ghost_pos in ghost_positions:
-                ghost_neighbors = get_neighbors(ghost_pos, board)
-                if ghost_neighbors:
-                    # Ghost moves closer to player
-                    closest = min(ghost_neighbors, 
-                                key=lambda p: manhattan_distance(p, player_pos))
-                    new_ghost_positions.append(closest)
-                else:
-                    new_ghost_positions.append(ghost_pos)
-            
-            eval_score, _ = AlphaBeta.alphabeta(player_pos, new_ghost_positions, board, 
-                                               depth - 1, alpha, beta, True)
-            min_eval = min(min_eval, eval_score)
-            beta = min(beta, eval_score)
+            if adversarial:
+                # Search joint ghost replies, most threatening first
+                replies = ghost_replies(ghost_positions, player_pos, board, distance)
+                for i, reply in enumerate(replies):
+                    eval_score, _ = AlphaBeta.alphabeta(player_pos, list(reply), board,
+                                                       depth - 1, alpha, beta, True, distance,
+                                                       context, adversarial)
+                    min_eval = min(min_eval, eval_score)
+                    beta = min(beta, eval_score)
+                    if beta <= alpha:
+                        # Alpha cutoff
+                        if context is not None:
+                            context.stats.cutoffs += 1
+                            if i == 0:
+                                context.stats.first_move_cutoffs += 1
+                        break
+            else:
+                # Simulate ghosts moving towards player
+                new_ghost_positions = greedy_ghost_moves(ghost_positions, player_pos, board,
+                                                         distance)
+                eval_score, _ = AlphaBeta.alphabeta(player_pos, new_ghost_positions, board, 
+                                                   depth - 1, alpha, beta, True, distance,
+                                                   context)
+                min_eval = min(min_eval, eval_score)
+                beta = min(beta, eval_score)
             
-            return min_eval, player_pos
+            best_score = min_eval
+        
+        if table is not None:
+            if best_score <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif best_score >= beta_orig:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            table.store(key, depth, best_score, flag, best_move)
+        
+        return best_score, best_move
     
     @staticmethod
-    def get_best_move(player_pos, ghost_positions, board, depth=ALPHABETA_DEPTH):
+    def get_best_move(player_pos, ghost_positions, board, depth=ALPHABETA_DEPTH,
+                      distance=manhattan_distance, adversarial=False):
         """Get best move using alpha-beta pruning"""
         _, best_move = AlphaBeta.alphabeta(player_pos, ghost_positions, board, 
-                                          depth, float('-inf'), float('inf'), True)
+                                          depth, float('-inf'), float('inf'), True, distance,
+                                          adversarial=adversarial)
         return best_move
+    
+    @staticmethod
+    def iterative_deepening(player_pos, ghost_positions, board, max_depth=ALPHABETA_MAX_DEPTH,
+                            time_budget_ms=ALPHABETA_TIME_BUDGET_MS, table=None,
+                            distance=manhattan_distance, ordering=None, stats=None,
+                            adversarial=False):
+        """
+        Search one full move (player + ghosts) deeper per iteration until the
+        time budget runs out, reusing the transposition table between iterations;
+        an odd max_depth ends with one extra player ply
+        Every iteration is bound by the deadline; with a budget, a one-ply search
+        first supplies a move in case even depth 2 does not finish in time.
+        time_budget_ms=None searches to max_depth
+        Optional ordering (MoveOrdering) and stats (SearchStats) are updated in place
+        Returns: (best_move, depth_completed)
+        """
+        if table is not None:
+            table.sync(board, distance, adversarial)
+        if ordering is not None:
+            ordering.new_decision()
+        if stats is None:
+            stats = SearchStats()
+        deadline = None
+        if time_budget_ms is not None:
+            deadline = time.perf_counter() + time_budget_ms / 1000.0
+        
+        depths = list(range(2, max_depth + 1, 2))
+        if max_depth % 2 or not depths:
+            depths.append(max(max_depth, 1))
+        
+        best_move = player_pos
+        completed = 0
+        if deadline is not None and depths[0] > 1:
+            # Fallback move: one player ply is cheap enough to never time out
+            context = SearchContext(table, None, ordering, stats, root_depth=1)
+            _, best_move = AlphaBeta.alphabeta(player_pos, ghost_positions, board, 1,
+                                               float('-inf'), float('inf'), True, distance,
+                                               context, adversarial)
+            completed = stats.depth = 1
+        
+        for depth in depths:
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+            context = SearchContext(table, deadline, ordering, stats, root_depth=depth)
+            try:
+                _, move = AlphaBeta.alphabeta(player_pos, ghost_positions, board, depth,
+                                              float('-inf'), float('inf'), True, distance,
+                                              context, adversarial)
+            except SearchTimeout:
+                break
+            best_move = move
+            completed = depth
+            stats.depth = depth
+            if deadline is not None and time.perf_counter() > deadline:
+                break
+        
+        return best_move, completed
+
+
+class PathCache:
+    """LRU cache of search results keyed by (algorithm, start, goal, board, walkability version)"""
+    
+    def __init__(self, max_entries=PATH_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key):
+        """Returns: SearchResult or None"""
+        result = self.entries.get(key)
+        if result is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return result
+    
+    def put(self, key, result):
+        """Store a search result, evicting the least recently used one when full"""
+        self.entries[key] = result
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+    
+    def clear(self):
+        self.entries.clear()
+
+
+# Path search used by each pathfinding mode
+PATH_SEARCHES = {
+    MODE_BFS: BFS.search,
+    MODE_DFS: DFS.search,
+    MODE_UCS: UCS.search,
+    MODE_ASTAR: AStar.search,
+    MODE_BIDIRECTIONAL_BFS: BidirectionalBFS.search,
+    MODE_BIDIRECTIONAL_ASTAR: BidirectionalAStar.search,
+    MODE_JPS: JPS.search,
+}
+
+# Junction-graph variants used when the agent searches the compressed maze
+JUNCTION_SEARCHES = {
+    MODE_BFS: JunctionSearch.bfs,
+    MODE_UCS: JunctionSearch.ucs,
+    MODE_ASTAR: JunctionSearch.astar,
+}
 
 
 class PathfindingAgent:
     """Agent that uses pathfinding algorithms to navigate"""
     
-    def __init__(self, algorithm_mode=MODE_BFS):
+    def __init__(self, algorithm_mode=MODE_BFS, use_maze_distance=USE_MAZE_DISTANCE,
+                 use_junction_graph=USE_JUNCTION_GRAPH, telemetry=None):
         self.algorithm_mode = algorithm_mode
+        # Planning events; without a shared Telemetry they only go to a private buffer
+        self.telemetry = telemetry if telemetry is not None else Telemetry()
+        self.use_maze_distance = use_maze_distance  # Wall-aware distances via DistanceOracle
+        self.use_junction_graph = use_junction_graph  # BFS/UCS/A* over JunctionGraph
         self.current_path = []
         self.path_index = 0
-        self.visited_nodes = set()
+        self.last_result = None  # SearchResult of the last path search
+        self.last_result_cached = False  # last_result came from path_cache, not a new search
         self.last_direction = None  # Track last issued direction to avoid oscillation
+        self.path_cache = PathCache()
+        self.replanner = None  # DStarLite state kept between replans
+        
+        # Adversarial search settings
+        self.max_depth = ALPHABETA_MAX_DEPTH
+        self.time_budget_ms = ALPHABETA_TIME_BUDGET_MS
+        self.transposition_table = TranspositionTable()
+        self.move_ordering = MoveOrdering()
+        self.adversarial_ghosts = ADVERSARIAL_GHOSTS
+        self.last_search_depth = 0
+        self.last_search_stats = SearchStats()
         
     def set_algorithm(self, mode):
         """Change the algorithm being used"""
@@ -340,11 +1482,24 @@ class PathfindingAgent:
         self.current_path = []
         self.path_index = 0
         self.last_direction = None
+        self.replanner = None
+    
+    @property
+    def visited_nodes(self):
+        """Positions explored by the last path search"""
+        if self.last_result is None:
+            return set()
+        return self.last_result.visited
+    
+    def distance_function(self, board):
+        """Distance used for ghost proximity in evaluation and fallback scoring"""
+        if self.use_maze_distance:
+            return board.get_distance_oracle().distance
+        return manhattan_distance
         
     def find_nearest_dot(self, player_pos, board):
-        """Find the nearest dot or power pellet"""
-        dots = board.get_all_dots()
-        if not dots:
+        """Find the nearest dot or power pellet by maze distance"""
+        if board.is_complete():
             return None
         # Convert player position (top-left x,y) to center and grid coordinates
         center_x = player_pos[0] + TILE_WIDTH // 2
@@ -352,9 +1507,52 @@ class PathfindingAgent:
         player_grid = (center_y // TILE_HEIGHT, center_x // TILE_WIDTH)
 
         # Find nearest dot (grid coordinates)
-        nearest_dot = min(dots, key=lambda d: manhattan_distance(player_grid, d))
+        nearest_dot = board.get_dot_field().nearest(player_grid)
+        if nearest_dot is None:
+            # Off the maze or walled off from every dot: fall back to Manhattan distance
+            nearest_dot = board.get_dot_index().nearest(player_grid)[0]
         return nearest_dot
     
+    def _plan(self, start, goal, board):
+        """Find a path with the selected algorithm, recording replan telemetry"""
+        self.telemetry.emit('replan', start=start, goal=goal, mode=self.algorithm_mode)
+        self._search(start, goal, board)
+        result = self.last_result
+        if result is not None:
+            # A cache hit cost no search time this frame
+            self.telemetry.emit('path_found', steps=len(self.current_path),
+                                expanded=result.expanded, cached=self.last_result_cached,
+                                elapsed_ns=0 if self.last_result_cached else result.elapsed_ns,
+                                goal_reached=result.goal_reached)
+    
+    def _search(self, start, goal, board):
+        """Run the selected path search, reusing cached results"""
+        if self.algorithm_mode == MODE_DSTAR_LITE:
+            # Incremental planner: reuse its search state while the goal stays the same
+            if (self.replanner is None or self.replanner.goal != goal
+                    or self.replanner.board is not board):
+                self.replanner = DStarLite(board, goal)
+            self.last_result = self.replanner.plan(start)
+            self.last_result_cached = False
+            self.current_path = list(self.last_result.path)
+            self.path_index = 0
+            return
+        
+        search = PATH_SEARCHES.get(self.algorithm_mode)
+        if self.use_junction_graph:
+            search = JUNCTION_SEARCHES.get(self.algorithm_mode, search)
+        if search is None:
+            return
+        key = (search, start, goal, board.layout_id, board.walkability_version)
+        result = self.path_cache.get(key)
+        self.last_result_cached = result is not None
+        if result is None:
+            result = search(start, goal, board)
+            self.path_cache.put(key, result)
+        self.last_result = result
+        self.current_path = list(result.path)
+        self.path_index = 0
+    
     def get_next_move(self, player_pos, ghost_positions, board, goal=None):
         """
         Get next move based on selected algorithm
@@ -374,8 +1572,13 @@ class PathfindingAgent:
                 gy = g[1] + TILE_HEIGHT // 2
                 ghost_grids.append((gy // TILE_HEIGHT, gx // TILE_WIDTH))
 
-            # Use alpha-beta pruning implementation under the hood
-            next_pos = AlphaBeta.get_best_move(player_grid, ghost_grids, board)
+            # Use alpha-beta pruning implementation under the hood, as deep as time allows
+            distance = self.distance_function(board)
+            self.last_search_stats = SearchStats()
+            next_pos, self.last_search_depth = AlphaBeta.iterative_deepening(
+                player_grid, ghost_grids, board, self.max_depth, self.time_budget_ms,
+                self.transposition_table, distance, self.move_ordering,
+                self.last_search_stats, self.adversarial_ghosts)
             # Convert position to direction; ensure we always move
             dir_from_minimax = self._position_to_direction(player_grid, next_pos) if next_pos else None
             if dir_from_minimax is None:
@@ -402,15 +1605,14 @@ class PathfindingAgent:
                     return None
 
                 # Build a simple score for each candidate
-                dots = board.get_all_dots()
+                dot_field = board.get_dot_field()
                 def dot_dist(p):
-                    if not dots:
-                        return 0
-                    return min(manhattan_distance(p, d) for d in dots)
+                    d = dot_field.distance(p)
+                    return 0 if d == math.inf else d
                 def ghost_dist(p):
                     if not ghost_grids:
                         return 10
-                    return min(manhattan_distance(p, g) for g in ghost_grids)
+                    return min(distance(p, g) for g in ghost_grids)
 
                 scored = []
                 for nxt in candidates:
@@ -444,19 +1646,7 @@ class PathfindingAgent:
                 return None
             
             # Find path using selected algorithm
-            print(f"Finding path from {player_grid} to {goal} using {self.algorithm_mode}")
-            
-            if self.algorithm_mode == MODE_BFS:
-                self.current_path, self.visited_nodes = BFS.search(player_grid, goal, board)
-            elif self.algorithm_mode == MODE_DFS:
-                self.current_path, self.visited_nodes = DFS.search(player_grid, goal, board)
-            elif self.algorithm_mode == MODE_UCS:
-                self.current_path, self.visited_nodes = UCS.search(player_grid, goal, board)
-            elif self.algorithm_mode == MODE_ASTAR:
-                self.current_path, self.visited_nodes = AStar.search(player_grid, goal, board)
-            
-            print(f"Path found with {len(self.current_path)} steps, visited {len(self.visited_nodes)} nodes")
-            self.path_index = 0
+            self._plan(player_grid, goal, board)
         
         # If we have a path, step strictly node-by-node using grid deltas
         if self.current_path and self.path_index < len(self.current_path):
@@ -476,15 +1666,7 @@ class PathfindingAgent:
                     goal = self.find_nearest_dot((player_pos[0], player_pos[1]), board)
                 if not goal:
                     return None
-                if self.algorithm_mode == MODE_BFS:
-                    self.current_path, self.visited_nodes = BFS.search(player_grid, goal, board)
-                elif self.algorithm_mode == MODE_DFS:
-                    self.current_path, self.visited_nodes = DFS.search(player_grid, goal, board)
-                elif self.algorithm_mode == MODE_UCS:
-                    self.current_path, self.visited_nodes = UCS.search(player_grid, goal, board)
-                elif self.algorithm_mode == MODE_ASTAR:
-                    self.current_path, self.visited_nodes = AStar.search(player_grid, goal, board)
-                self.path_index = 0
+                self._plan(player_grid, goal, board)
                 if not self.current_path:
                     return None
                 next_grid = self.current_path[self.path_index]
@@ -0,0 +1,108 @@
+"""
+Ghost benchmark - Times ghost updates for growing numbers of ghosts, scalar
+Ghost objects against the NumPy GhostSwarm, and checks they stay identical
+Both sides start from the same seeded positions and see the same scripted
+player moves, powerups and ghost kills
+
+Usage:
+    python benchmarks/bench_ghosts.py --counts 4 64 256 1024 --ticks 500
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ghost_swarm import GhostSwarm
+
+
+def script(tick, count, rng):
+    """Player position, powerup flag and ghosts killed at this tick"""
+    cells = [(450, 663), (56, 58), (800, 58), (56, 850), (800, 850)]
+    player_x, player_y = cells[(tick // 150) % len(cells)]
+    powerup = (tick // 200) % 3 == 1
+    killed = [rng.randrange(count) for _ in range(2)] if powerup and tick % 50 == 0 else []
+    return player_x, player_y, powerup, killed
+
+
+def snapshot(ghosts):
+    return [(g.x, g.y, g.direction, g.speed, tuple(g.target), g.dead, g.in_box, list(g.turns))
+            for g in ghosts]
+
+
+def run(count, ticks, seed, check):
+    from main import PacManGame
+
+    game = PacManGame(headless=True)
+    swarm = GhostSwarm.spawn(game.board.get_graph().cells, count, random.Random(seed))
+    game.ghosts = swarm.to_ghosts()
+    game.eaten_ghosts = [False] * count
+    game.moving = True
+    board = game.board
+    scalar_ns = 0
+    swarm_ns = 0
+    mismatch = None
+
+    script_rng = random.Random(seed)
+    for tick in range(ticks):
+        player_x, player_y, powerup, killed = script(tick, count, script_rng)
+        game.player.x, game.player.y = player_x, player_y
+        if powerup != game.powerup:
+            game.eaten_ghosts = [False] * count
+            swarm.eaten[:] = False
+        game.powerup = powerup
+        for i in killed:
+            game.ghosts[i].dead = True
+            game.eaten_ghosts[i] = True
+            swarm.dead[i] = True
+            swarm.eaten[i] = True
+
+        began = time.perf_counter_ns()
+        game.update_ghost_speeds()
+        game.update_ghost_targets()
+        game.update_ghosts()
+        scalar_ns += time.perf_counter_ns() - began
+
+        began = time.perf_counter_ns()
+        swarm.update(board, player_x, player_y, powerup)
+        swarm_ns += time.perf_counter_ns() - began
+
+        if check and mismatch is None and snapshot(game.ghosts) != snapshot(swarm.to_ghosts()):
+            mismatch = tick
+
+    game.telemetry.close()
+    return {
+        'ghosts': count,
+        'scalar_us_per_tick': scalar_ns / ticks / 1000,
+        'swarm_us_per_tick': swarm_ns / ticks / 1000,
+        'first_mismatch_tick': mismatch,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--counts', type=int, nargs='+', default=[4, 64, 256, 1024])
+    parser.add_argument('--ticks', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--no-check', action='store_true',
+                        help='skip the per-tick comparison of scalar and swarm state')
+    args = parser.parse_args()
+
+    failed = False
+    for count in args.counts:
+        result = run(count, args.ticks, args.seed, not args.no_check)
+        status = ''
+        if result['first_mismatch_tick'] is not None:
+            status = '  MISMATCH at tick %d' % result['first_mismatch_tick']
+            failed = True
+        print('%5d ghosts  scalar %9.1f us/tick  swarm %8.1f us/tick  %5.1fx%s' % (
+            count, result['scalar_us_per_tick'], result['swarm_us_per_tick'],
+            result['scalar_us_per_tick'] / result['swarm_us_per_tick'], status))
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
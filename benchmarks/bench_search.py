@@ -0,0 +1,298 @@
+"""
+Search benchmark - Runs the path searches and Alpha-Beta over a fixed corpus
+Every query is generated from a seed, so two runs on the same code search
+exactly the same (start, goal) pairs and game states
+
+Usage:
+    python benchmarks/bench_search.py --output bench.json
+    python benchmarks/bench_search.py --baseline bench.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from algorithms import (AlphaBeta, BFS, JUNCTION_SEARCHES, MoveOrdering, PATH_SEARCHES,
+                        SearchStats, TranspositionTable)
+from board import Board
+from config import *
+
+
+# Metrics where a larger value is worse, with the relative slack allowed before
+# a change counts as a regression (timings are noisy, node counts are exact)
+REGRESSION_TOLERANCE = {
+    'time_p50_us': 0.25,
+    'time_p99_us': 0.50,
+    'expanded_mean': 0.0,
+    'max_frontier_mean': 0.0,
+    'peak_memory_max_bytes': 0.10,
+    'nodes_mean': 0.0,
+}
+
+# Maze steps between the player and each ghost in Alpha-Beta game states
+GHOST_STEPS = range(2, 6)
+
+# Alpha-Beta depth: deep enough for move ordering to change the node counts
+BENCH_ALPHABETA_DEPTH = 6
+
+# Alpha-Beta variants: (name suffix, move ordering, adversarial ghost replies)
+ALPHABETA_VARIANTS = [
+    ('', False, False),
+    (' ordered', True, False),
+    (' adversarial', False, True),
+    (' adversarial ordered', True, True),
+]
+
+
+def board_states(seed, load=Board):
+    """Named board states searched by every algorithm, all made by load()"""
+    rng = random.Random(seed)
+    states = {'stock': load()}
+
+    # Half the dots eaten: path searches are unchanged, evaluation sees fewer dots
+    board = load()
+    for pos in rng.sample(sorted(board.get_all_dots()), len(board.get_all_dots()) // 2):
+        board.set_tile(pos[0], pos[1], 0)
+    states['half_eaten'] = board
+
+    # A few corridor cells walled off, forcing detours
+    board = load()
+    cells = board.get_graph().cells
+    for row, col in rng.sample(cells, len(cells) // 40):
+        board.set_tile(row, col, 3)
+    states['extra_walls'] = board
+    return states
+
+
+def query_pairs(board, count, seed):
+    """(start, goal) pairs of walkable cells"""
+    rng = random.Random(seed)
+    cells = board.get_graph().cells
+    return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+
+
+def game_positions(board, count, seed):
+    """
+    (player, ghost positions) states for adversarial search
+    Ghosts start GHOST_STEPS maze steps from the player, inside
+    GHOST_RELEVANCE_RADIUS, so adversarial min nodes branch over their replies
+    """
+    rng = random.Random(seed)
+    cells = board.get_graph().cells
+    oracle = board.get_distance_oracle()
+    positions = []
+    while len(positions) < count:
+        player = rng.choice(cells)
+        near = [cell for cell in cells if oracle.distance(player, cell) in GHOST_STEPS]
+        if near:
+            positions.append((player, [rng.choice(near) for _ in range(4)]))
+    return positions
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    ordered = sorted(values)
+    if not ordered:
+        return 0
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def timing_summary(samples_ns):
+    return {
+        'time_p50_us': percentile(samples_ns, 0.50) / 1000,
+        'time_p90_us': percentile(samples_ns, 0.90) / 1000,
+        'time_p99_us': percentile(samples_ns, 0.99) / 1000,
+        'time_max_us': max(samples_ns) / 1000,
+    }
+
+
+def peak_memory(run, queries):
+    """Largest and mean tracemalloc peak over the queries, traced in a separate pass"""
+    peaks = []
+    tracemalloc.start()
+    for query in queries:
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        run(*query)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+    return {
+        'peak_memory_max_bytes': max(peaks),
+        'peak_memory_mean_bytes': sum(peaks) / len(peaks),
+    }
+
+
+def bench_path_search(search, board, pairs, repeat):
+    """Time one path search over every pair and check its path lengths against BFS"""
+    samples = []
+    expanded = []
+    frontier = []
+    optimal = 0
+    excess = 0
+    found = 0
+    for start, goal in pairs:
+        reference = BFS.search(start, goal, board).path
+        best = None
+        for _ in range(repeat):
+            began = time.perf_counter_ns()
+            result = search(start, goal, board)
+            elapsed = time.perf_counter_ns() - began
+            best = elapsed if best is None else min(best, elapsed)
+        samples.append(best)
+        expanded.append(result.expanded)
+        frontier.append(result.max_frontier)
+        path = result.path
+        if path or not reference:
+            found += bool(path)
+            optimal += len(path) == len(reference)
+            excess += len(path) - len(reference)
+
+    result = timing_summary(samples)
+    result.update({
+        'queries': len(pairs),
+        'found': found,
+        'expanded_mean': sum(expanded) / len(expanded),
+        'expanded_max': max(expanded),
+        'max_frontier_mean': sum(frontier) / len(frontier),
+        'max_frontier_max': max(frontier),
+        'optimal_fraction': optimal / len(pairs),
+        'mean_excess_steps': excess / len(pairs),
+    })
+    result.update(peak_memory(lambda start, goal: search(start, goal, board), pairs))
+    return result
+
+
+def bench_alphabeta(board, positions, depth, ordered=False, adversarial=False):
+    """Time fixed-depth Alpha-Beta decisions from every position"""
+    def decide(player, ghosts, stats=None):
+        ordering = MoveOrdering() if ordered else None
+        return AlphaBeta.iterative_deepening(player, ghosts, board, max_depth=depth,
+                                             time_budget_ms=None, table=TranspositionTable(),
+                                             ordering=ordering, stats=stats,
+                                             adversarial=adversarial)
+
+    samples = []
+    nodes = []
+    cutoffs = []
+    first_move_cutoffs = 0
+    for player, ghosts in positions:
+        stats = SearchStats()
+        began = time.perf_counter_ns()
+        decide(player, ghosts, stats)
+        samples.append(time.perf_counter_ns() - began)
+        nodes.append(stats.nodes)
+        cutoffs.append(stats.cutoffs)
+        first_move_cutoffs += stats.first_move_cutoffs
+
+    result = timing_summary(samples)
+    result.update({
+        'queries': len(positions),
+        'depth': depth,
+        'ordered': ordered,
+        'adversarial': adversarial,
+        'nodes_mean': sum(nodes) / len(nodes),
+        'nodes_max': max(nodes),
+        'cutoffs_mean': sum(cutoffs) / len(cutoffs),
+        'first_move_cutoff_rate': first_move_cutoffs / sum(cutoffs) if sum(cutoffs) else 0.0,
+    })
+    result.update(peak_memory(decide, positions))
+    return result
+
+
+def run(pairs, positions, seed, repeat, depth, board_path=None):
+    """Benchmark every algorithm on every board state"""
+    searches = {ALGORITHM_NAMES[mode]: search for mode, search in PATH_SEARCHES.items()}
+    for mode, search in JUNCTION_SEARCHES.items():
+        searches['Junction ' + ALGORITHM_NAMES[mode]] = search
+
+    results = {}
+    load = Board if board_path is None else lambda: Board.load(board_path)
+    for state, board in board_states(seed, load).items():
+        corpus = query_pairs(board, pairs, seed)
+        for name, search in searches.items():
+            results[state + '/' + name] = bench_path_search(search, board, corpus, repeat)
+            print('%-44s p50 %8.1f us  expanded %7.1f' % (
+                state + '/' + name, results[state + '/' + name]['time_p50_us'],
+                results[state + '/' + name]['expanded_mean']))
+        game_states = game_positions(board, positions, seed)
+        for suffix, ordered, adversarial in ALPHABETA_VARIANTS:
+            key = state + '/Alpha-Beta' + suffix
+            results[key] = bench_alphabeta(board, game_states, depth, ordered, adversarial)
+            print('%-44s p50 %8.1f us  nodes    %7.1f  cutoffs %6.1f' % (
+                key, results[key]['time_p50_us'], results[key]['nodes_mean'],
+                results[key]['cutoffs_mean']))
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'pairs': pairs,
+            'positions': positions,
+            'repeat': repeat,
+            'depth': depth,
+            'board': board_path,
+        },
+        'results': results,
+    }
+
+
+def compare(current, baseline):
+    """Regressions of current against baseline as (benchmark, metric, old, new)"""
+    regressions = []
+    for key, old in baseline['results'].items():
+        new = current['results'].get(key)
+        if new is None:
+            continue
+        for metric, tolerance in REGRESSION_TOLERANCE.items():
+            if metric in old and new[metric] > old[metric] * (1 + tolerance):
+                regressions.append((key, metric, old[metric], new[metric]))
+        if new.get('optimal_fraction', 1) < old.get('optimal_fraction', 1):
+            regressions.append((key, 'optimal_fraction', old['optimal_fraction'],
+                                new['optimal_fraction']))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--pairs', type=int, default=200, help='(start, goal) pairs per board')
+    parser.add_argument('--positions', type=int, default=20,
+                        help='game states per board for Alpha-Beta')
+    parser.add_argument('--seed', type=int, default=2024)
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='timed runs per query (the fastest is kept)')
+    parser.add_argument('--depth', type=int, default=BENCH_ALPHABETA_DEPTH,
+                        help='Alpha-Beta search depth in plies')
+    parser.add_argument('--board', help='layout file to search instead of the stock maze '
+                                        '(.txt or .npy; see layouts.py)')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='JSON from an earlier run to check for regressions')
+    args = parser.parse_args()
+
+    current = run(args.pairs, args.positions, args.seed, args.repeat, args.depth, args.board)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline['meta']['seed'] != args.seed or baseline['meta']['pairs'] != args.pairs
+                or baseline['meta'].get('board') != args.board):
+            print('Warning: baseline was recorded with a different corpus')
+        regressions = compare(current, baseline)
+        for key, metric, old, new in regressions:
+            print('REGRESSION %s %s: %.1f -> %.1f' % (key, metric, old, new))
+        if regressions:
+            sys.exit(1)
+        print('No regressions against', args.baseline)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Batch game runner - Plays headless games for every algorithm mode, seed and
+Alpha-Beta depth across a process pool
+Each seed picks the player's start cell, so seeds play different games
+Results are appended to a JSONL file as each game finishes, then aggregated
+
+Usage:
+    python benchmarks/run_games.py --seeds 50 --depths 2 4 6 --output games.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import *
+
+
+AI_MODES = [mode for mode in ALGORITHM_NAMES if mode != MODE_MANUAL]
+
+
+def play_game(mode, seed, depth, max_ticks, time_budget_ms):
+    """Play one headless game in a worker process and return its result"""
+    from main import PacManGame
+
+    game = PacManGame(headless=True, ai_mode=mode, seed=seed)
+    game.agent.max_depth = depth
+    game.agent.time_budget_ms = time_budget_ms
+    began = time.perf_counter()
+    result = game.step(max_ticks)
+    result.update({
+        'mode': mode,
+        'algorithm': ALGORITHM_NAMES[mode],
+        'seed': seed,
+        'depth': depth,
+        'seconds': time.perf_counter() - began,
+    })
+    game.telemetry.close()
+    return result
+
+
+def game_specs(modes, seeds, depths):
+    """(mode, seed, depth) of every game; depth only varies for Alpha-Beta"""
+    specs = []
+    for mode in modes:
+        for seed in seeds:
+            for depth in (depths if mode == MODE_MINIMAX else depths[:1]):
+                specs.append((mode, seed, depth))
+    return specs
+
+
+def aggregate(results):
+    """Summary statistics per (algorithm, depth)"""
+    groups = {}
+    for result in results:
+        groups.setdefault((result['mode'], result['depth']), []).append(result)
+
+    summary = []
+    for (mode, depth), games in sorted(groups.items()):
+        scores = sorted(game['score'] for game in games)
+        summary.append({
+            'algorithm': ALGORITHM_NAMES[mode],
+            'depth': depth,
+            'games': len(games),
+            'win_rate': sum(game['won'] for game in games) / len(games),
+            'mean_score': sum(scores) / len(scores),
+            'median_score': scores[len(scores) // 2],
+            'mean_ticks': sum(game['ticks'] for game in games) / len(games),
+            'mean_seconds': sum(game['seconds'] for game in games) / len(games),
+        })
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--modes', type=int, nargs='+', default=AI_MODES,
+                        help='algorithm modes to play (default: every AI mode)')
+    parser.add_argument('--seeds', type=int, default=10, help='number of seeds per mode')
+    parser.add_argument('--first-seed', type=int, default=0)
+    parser.add_argument('--depths', type=int, nargs='+', default=[ALPHABETA_DEPTH],
+                        help='Alpha-Beta depths in plies, odd or even (Minimax mode only)')
+    parser.add_argument('--time-budget-ms', type=float, default=None,
+                        help='Alpha-Beta time budget per move (default: none, so games '
+                             'are reproducible)')
+    parser.add_argument('--ticks', type=int, default=20000, help='maximum updates per game')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='worker processes (default: all cores)')
+    parser.add_argument('--output', default='games.jsonl',
+                        help='JSONL file that per-game results are appended to')
+    args = parser.parse_args()
+    if min(args.depths) < 1:
+        parser.error('--depths must be at least 1 ply')
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    specs = game_specs(args.modes, seeds, args.depths)
+    print('Playing %d games on %d workers' % (len(specs), args.workers))
+
+    results = []
+    began = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool, \
+            open(args.output, 'a') as out:
+        futures = [pool.submit(play_game, mode, seed, depth, args.ticks, args.time_budget_ms)
+                   for mode, seed, depth in specs]
+        for future in as_completed(futures):
+            result = future.result()
+            results.append(result)
+            out.write(json.dumps(result) + '\n')
+            out.flush()
+    elapsed = time.perf_counter() - began
+
+    for row in aggregate(results):
+        print('%-26s depth %2d  games %4d  win %5.1f%%  score %8.1f  ticks %7.1f  %6.2fs/game' % (
+            row['algorithm'], row['depth'], row['games'], 100 * row['win_rate'],
+            row['mean_score'], row['mean_ticks'], row['mean_seconds']))
+    print('%d games in %.1fs (%.2f games/s)' % (len(results), elapsed, len(results) / elapsed))
+
+
+if __name__ == '__main__':
+    main()
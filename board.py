@@ -5,7 +5,10 @@ Complete implementation with all board management functions
 import pygame
 import math
 import copy
+import itertools
 from config import *
+from layouts import MappedLayout, load_layout, save_layout
+from maze import DistanceOracle, DotDistanceField, DotIndex, JunctionGraph, MazeGraph
 
 # Original board layout
 # 0 = empty black rectangle, 1 = dot, 2 = big dot (power pellet), 3 = vertical line,
@@ -46,61 +49,170 @@ BOARDS = [
     [7, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 4, 8]
 ]
 
+# Distinguishes boards in caches shared between them (ids of freed boards get reused)
+_layout_ids = itertools.count()
+
 
 class Board:
     """Manages the game board and rendering"""
     
-    def __init__(self):
+    def __init__(self, layout=None):
+        """layout: rows of tiles or a MappedLayout (default: the stock maze)"""
         self.level = None
-        self.original_board = copy.deepcopy(BOARDS)
+        self.layout_id = next(_layout_ids)
+        if isinstance(layout, MappedLayout):
+            self.original_board = layout
+        else:
+            self.original_board = copy.deepcopy(BOARDS if layout is None else layout)
+        self._layout_cache = {}  # Tables derived from the wall layout
+        self._movement_tables = {}  # Tables derived from the wall and gate tiles
+        self.walkability_version = 0
+        self.dots_version = 0  # Bumped whenever any dot is added or removed
+        self._walls_modified = False
+        self._wall_log = []  # (version, position) of each walkability change
+        self._wall_log_base = 0  # Oldest version the log can answer for
+        self._maze_surface = None  # Wall layer rendered once by draw()
+        self._maze_surface_key = None
+        self._dot_surface = None  # Wall layer plus small dots, patched as dots change
+        self._stale_tiles = []  # Tiles to re-render on the dot surface
+        self._dirty_tiles = []  # Tiles whose dot changed since the last take_dirty_rects()
+        self._maze_dirty = True  # Wall layer changed: the whole screen needs updating
         self.reset()
+    
+    @classmethod
+    def load(cls, path, cols=None):
+        """Board with a layout read from a file (see layouts.load_layout)"""
+        return cls(load_layout(path, cols))
+    
+    def save(self, path):
+        """Write the current tiles to a file (see layouts.save_layout)"""
+        save_layout(self.level, path)
         
     def reset(self):
         """Reset board to initial state"""
-        self.level = copy.deepcopy(self.original_board)
+        if isinstance(self.original_board, MappedLayout):
+            self.level = self.original_board.open()
+        else:
+            self.level = copy.deepcopy(self.original_board)
+        self._index_dots()
+        self._movement_tables = {}
+        self._maze_surface = None
+        self._maze_dirty = True
+        self._stale_tiles = []
+        self._dirty_tiles = []
+        if self._walls_modified:
+            self._walls_modified = False
+            self._invalidate_layout()
+            self._wall_log = []
+            self._wall_log_base = self.walkability_version
+    
+    def _index_dots(self):
+        """
+        Count the remaining dots and power pellets; the position map, DotIndex
+        and distance field over them are built on first use
+        """
+        self.dots_version += 1
+        self.dot_count = 0
+        self.power_pellet_count = 0
+        for row in self.level:
+            tiles = bytes(row)  # Counted at C speed
+            self.dot_count += tiles.count(TILE_DOT)
+            self.power_pellet_count += tiles.count(TILE_POWER_PELLET)
+        self._dots = None  # position -> tile, kept in row-major order
+        self._dot_index = None
+        self._dot_field = None
+    
+    def _dot_tiles(self):
+        """Remaining dots and power pellets as position -> tile, in row-major order"""
+        if self._dots is None:
+            self._dots = {}
+            for i, row in enumerate(self.level):
+                tiles = bytes(row)  # Lets rows without dots be skipped at C speed
+                if TILE_DOT not in tiles and TILE_POWER_PELLET not in tiles:
+                    continue
+                self._dots.update({(i, j): tile for j, tile in enumerate(tiles)
+                                   if tile == TILE_DOT or tile == TILE_POWER_PELLET})
+        return self._dots
+    
+    def _add_dot(self, row, col, tile):
+        """Record a dot or power pellet placed at a position"""
+        if tile == TILE_DOT:
+            self.dot_count += 1
+        elif tile == TILE_POWER_PELLET:
+            self.power_pellet_count += 1
+        else:
+            return
+        self.dots_version += 1
+        if self._dots is None:
+            return
+        self._dots[(row, col)] = tile
+        if self._dot_index is not None:
+            self._dot_index.add((row, col))
+        if self._dot_field is not None:
+            self._dot_field.add((row, col))
+    
+    def _remove_dot(self, row, col):
+        """Forget a dot or power pellet removed from a position"""
+        tile = self.level[row][col]
+        if tile == TILE_DOT:
+            self.dot_count -= 1
+        elif tile == TILE_POWER_PELLET:
+            self.power_pellet_count -= 1
+        else:
+            return
+        self.dots_version += 1
+        if self._dots is None:
+            return
+        del self._dots[(row, col)]
+        if self._dot_index is not None:
+            self._dot_index.remove((row, col))
+        if self._dot_field is not None:
+            self._dot_field.remove((row, col))
+    
+    def _invalidate_layout(self):
+        """Drop tables derived from the wall layout after walkability changed"""
+        self.walkability_version += 1
+        self._layout_cache = {}
+        self._dot_field = None
         
-    def draw(self, screen, flicker, color=BLUE):
-        """Draw the board on screen with all maze elements"""
+    def render_maze(self, size, color=BLUE):
+        """Render the wall and gate tiles onto a new black surface of the given size"""
+        surface = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert()
+        surface.fill(BLACK)
         for i in range(len(self.level)):
             for j in range(len(self.level[i])):
                 x = j * TILE_WIDTH + (0.5 * TILE_WIDTH)
                 y = i * TILE_HEIGHT + (0.5 * TILE_HEIGHT)
                 
-                if self.level[i][j] == TILE_DOT:
-                    # Draw small dot
-                    pygame.draw.circle(screen, WHITE, (int(x), int(y)), 4)
-                    
-                elif self.level[i][j] == TILE_POWER_PELLET and not flicker:
-                    # Draw power pellet (flickers)
-                    pygame.draw.circle(screen, WHITE, (int(x), int(y)), 10)
-                    
-                elif self.level[i][j] == TILE_VERTICAL:
+                if self.level[i][j] == TILE_VERTICAL:
                     # Draw vertical wall
-                    pygame.draw.line(screen, color, (int(x), int(i * TILE_HEIGHT)),
+                    pygame.draw.line(surface, color, (int(x), int(i * TILE_HEIGHT)),
                                    (int(x), int(i * TILE_HEIGHT + TILE_HEIGHT)), 3)
                     
                 elif self.level[i][j] == TILE_HORIZONTAL:
                     # Draw horizontal wall
-                    pygame.draw.line(screen, color, (int(j * TILE_WIDTH), int(y)),
+                    pygame.draw.line(surface, color, (int(j * TILE_WIDTH), int(y)),
                                    (int(j * TILE_WIDTH + TILE_WIDTH), int(y)), 3)
                     
                 elif self.level[i][j] == TILE_TOP_RIGHT:
                     # Draw top-right corner
-                    pygame.draw.arc(screen, color, 
+                    pygame.draw.arc(surface, color, 
                                   [int(j * TILE_WIDTH - (TILE_WIDTH * 0.4) - 2), int(y), 
                                    int(TILE_WIDTH), int(TILE_HEIGHT)],
                                   0, math.pi / 2, 3)
                     
                 elif self.level[i][j] == TILE_TOP_LEFT:
                     # Draw top-left corner
-                    pygame.draw.arc(screen, color,
+                    pygame.draw.arc(surface, color,
                                   [int(j * TILE_WIDTH + (TILE_WIDTH * 0.5)), int(y), 
                                    int(TILE_WIDTH), int(TILE_HEIGHT)],
                                   math.pi / 2, math.pi, 3)
                     
                 elif self.level[i][j] == TILE_BOTTOM_LEFT:
                     # Draw bottom-left corner
-                    pygame.draw.arc(screen, color, 
+                    pygame.draw.arc(surface, color, 
                                   [int(j * TILE_WIDTH + (TILE_WIDTH * 0.5)), 
                                    int(i * TILE_HEIGHT - (0.4 * TILE_HEIGHT)), 
                                    int(TILE_WIDTH), int(TILE_HEIGHT)],
@@ -108,7 +220,7 @@ class Board:
                     
                 elif self.level[i][j] == TILE_BOTTOM_RIGHT:
                     # Draw bottom-right corner
-                    pygame.draw.arc(screen, color,
+                    pygame.draw.arc(surface, color,
                                   [int(j * TILE_WIDTH - (TILE_WIDTH * 0.4) - 2), 
                                    int(i * TILE_HEIGHT - (0.4 * TILE_HEIGHT)), 
                                    int(TILE_WIDTH), int(TILE_HEIGHT)],
@@ -116,8 +228,69 @@ class Board:
                     
                 elif self.level[i][j] == TILE_GATE:
                     # Draw gate (for ghost house)
-                    pygame.draw.line(screen, WHITE, (int(j * TILE_WIDTH), int(y)),
+                    pygame.draw.line(surface, WHITE, (int(j * TILE_WIDTH), int(y)),
                                    (int(j * TILE_WIDTH + TILE_WIDTH), int(y)), 3)
+        return surface
+    
+    def draw(self, screen, flicker, color=BLUE):
+        """
+        Draw the board on screen: the cached wall layer (which also clears the
+        screen), then the dots and power pellets still present
+        """
+        key = (screen.get_size(), color)
+        if self._maze_surface is None or self._maze_surface_key != key:
+            self._maze_surface = self.render_maze(key[0], color)
+            self._maze_surface_key = key
+            self._dot_surface = self._maze_surface.copy()
+            for (i, j), tile in self._dot_tiles().items():
+                if tile == TILE_DOT:
+                    self._draw_dot(self._dot_surface, i, j)
+            self._stale_tiles = []
+        
+        # Patch tiles whose dot was eaten or placed since the last frame
+        for row, col in self._stale_tiles:
+            rect = self.tile_rect(row, col)
+            self._dot_surface.blit(self._maze_surface, rect, rect)
+            if self.level[row][col] == TILE_DOT:
+                self._draw_dot(self._dot_surface, row, col)
+        self._stale_tiles = []
+        screen.blit(self._dot_surface, (0, 0))
+        
+        if not flicker:
+            for (i, j), tile in self._dot_tiles().items():
+                if tile == TILE_POWER_PELLET:
+                    # Draw power pellet (flickers)
+                    x = int(j * TILE_WIDTH + (0.5 * TILE_WIDTH))
+                    y = int(i * TILE_HEIGHT + (0.5 * TILE_HEIGHT))
+                    pygame.draw.circle(screen, WHITE, (x, y), 10)
+    
+    def _draw_dot(self, surface, row, col):
+        """Draw a small dot centered in its tile"""
+        x = int(col * TILE_WIDTH + (0.5 * TILE_WIDTH))
+        y = int(row * TILE_HEIGHT + (0.5 * TILE_HEIGHT))
+        pygame.draw.circle(surface, WHITE, (x, y), 4)
+    
+    def tile_rect(self, row, col):
+        """Screen rectangle covered by a tile"""
+        return pygame.Rect(col * TILE_WIDTH, row * TILE_HEIGHT, TILE_WIDTH, TILE_HEIGHT)
+    
+    def take_dirty_rects(self):
+        """
+        Screen rectangles of tiles whose dot changed since the last call, or None
+        when the wall layer changed and the whole screen must be updated
+        """
+        if self._maze_dirty:
+            rects = None
+        else:
+            rects = [self.tile_rect(row, col) for row, col in self._dirty_tiles]
+        self._maze_dirty = False
+        self._dirty_tiles = []
+        return rects
+    
+    def power_pellet_rects(self):
+        """Screen rectangles of the remaining power pellets (they change when flickering)"""
+        return [self.tile_rect(row, col) for (row, col), tile in self._dot_tiles().items()
+                if tile == TILE_POWER_PELLET]
     
     def is_walkable(self, row, col):
         """Check if a position is walkable (not a wall)"""
@@ -136,32 +309,89 @@ class Board:
     def set_tile(self, row, col, value):
         """Set tile type at position"""
         if 0 <= row < len(self.level) and 0 <= col < len(self.level[0]):
+            was_walkable = self.is_walkable(row, col)
+            old = self.level[row][col]
+            self._remove_dot(row, col)
             self.level[row][col] = value
+            self._add_dot(row, col, value)
+            if max(old, value) >= TILE_VERTICAL and old != value:
+                # Wall or gate tile changed: re-render the wall layer
+                self._maze_surface = None
+                self._maze_dirty = True
+                self._movement_tables = {}
+            elif old != value:
+                self._stale_tiles.append((row, col))
+                self._dirty_tiles.append((row, col))
+            if self.is_walkable(row, col) != was_walkable:
+                self._walls_modified = True
+                self._invalidate_layout()
+                self._wall_log.append((self.walkability_version, (row, col)))
     
     def is_complete(self):
         """Check if all dots and power pellets are collected"""
-        for row in self.level:
-            if TILE_DOT in row or TILE_POWER_PELLET in row:
-                return False
-        return True
+        return not self.dot_count and not self.power_pellet_count
     
     def get_all_dots(self):
-        """Get positions of all dots and power pellets"""
-        dots = []
-        for i in range(len(self.level)):
-            for j in range(len(self.level[i])):
-                if self.level[i][j] in [TILE_DOT, TILE_POWER_PELLET]:
-                    dots.append((i, j))
-        return dots
+        """
+        Get positions of all dots and power pellets
+        Returns a live read-only view in row-major order; copy it before mutating the board
+        """
+        return self._dot_tiles().keys()
+    
+    def get_dot_index(self):
+        """Spatial index over the remaining dots for nearest/farthest/rank queries"""
+        if self._dot_index is None:
+            rows, cols = len(self.level), len(self.level[0])
+            # Buckets grow with the board so large mazes keep a few thousand of them
+            bucket_size = max(4, math.ceil(math.sqrt(rows * cols / 4096)))
+            self._dot_index = DotIndex(rows, cols, bucket_size, self._dot_tiles())
+        return self._dot_index
+    
+    def get_dot_field(self):
+        """Maze distance field to the nearest remaining dot, repaired as dots are eaten"""
+        if self._dot_field is None:
+            self._dot_field = DotDistanceField(self.get_graph(), self._dot_tiles())
+        return self._dot_field
+    
+    def walkability_changes_since(self, version):
+        """Cells whose walkability changed after version, or None if that is no longer known"""
+        if version < self._wall_log_base:
+            return None
+        return [pos for changed, pos in self._wall_log if changed > version]
+    
+    def layout_cached(self, key, build):
+        """Return a table derived from the wall layout, building it on first use"""
+        if key not in self._layout_cache:
+            self._layout_cache[key] = build(self)
+        return self._layout_cache[key]
+    
+    def movement_cached(self, key, build):
+        """
+        Return a table derived from the wall and gate tiles, building it on first use
+        Unlike layout_cached() this is also dropped when a gate opens or closes
+        """
+        if key not in self._movement_tables:
+            self._movement_tables[key] = build(self)
+        return self._movement_tables[key]
+    
+    def get_graph(self):
+        """Integer-id graph of walkable cells for this layout"""
+        return self.layout_cached('graph', MazeGraph)
+    
+    def get_junction_graph(self):
+        """Corridor-compressed junction graph for this layout"""
+        return self.layout_cached('junction_graph', JunctionGraph)
+    
+    def get_distance_oracle(self):
+        """All-pairs maze distance oracle for this layout"""
+        return self.layout_cached('distance_oracle', DistanceOracle)
     
     def get_random_walkable_position(self):
         """Get a random walkable position for goal setting"""
         import random
-        walkable_positions = []
-        for i in range(len(self.level)):
-            for j in range(len(self.level[i])):
-                if self.is_walkable(i, j) and not (350 < j * TILE_WIDTH < 550 and 370 < i * TILE_HEIGHT < 480):
-                    walkable_positions.append((i, j))
+        walkable_positions = self.layout_cached('goal_cells', lambda board: [
+            (i, j) for i, j in board.get_graph().cells
+            if not (350 < j * TILE_WIDTH < 550 and 370 < i * TILE_HEIGHT < 480)])
         if walkable_positions:
             return random.choice(walkable_positions)
         return (15, 15)  # Default fallback
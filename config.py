@@ -78,6 +78,10 @@ MODE_DFS = 2
 MODE_UCS = 3
 MODE_ASTAR = 4
 MODE_MINIMAX = 5
+MODE_BIDIRECTIONAL_BFS = 6
+MODE_BIDIRECTIONAL_ASTAR = 7
+MODE_JPS = 8
+MODE_DSTAR_LITE = 9
 
 # Algorithm names for display
 ALGORITHM_NAMES = {
@@ -86,9 +90,50 @@ ALGORITHM_NAMES = {
     MODE_DFS: "Depth-First Search",
     MODE_UCS: "Uniform Cost Search",
     MODE_ASTAR: "A* Search",
-    MODE_MINIMAX: "Minimax (Alpha-Beta)"
+    MODE_MINIMAX: "Minimax (Alpha-Beta)",
+    MODE_BIDIRECTIONAL_BFS: "Bidirectional BFS",
+    MODE_BIDIRECTIONAL_ASTAR: "Bidirectional A*",
+    MODE_JPS: "Jump Point Search",
+    MODE_DSTAR_LITE: "D* Lite (Incremental)"
 }
 
+# Number of (algorithm, start, goal) search results kept by the agent
+PATH_CACHE_SIZE = 256
+
 # Minimax settings
 MINIMAX_DEPTH = 3
 ALPHABETA_DEPTH = 4
+
+# Iterative-deepening Alpha-Beta used by the agent: plies searched at most,
+# and wall-clock budget per decision (None disables the limit)
+ALPHABETA_MAX_DEPTH = 16
+ALPHABETA_TIME_BUDGET_MS = 8
+
+# Ghost model for adversarial search: False moves every ghost greedily
+# towards the player; True searches ghost replies, with ghosts farther than
+# GHOST_RELEVANCE_RADIUS collapsed to their greedy move
+ADVERSARIAL_GHOSTS = False
+GHOST_RELEVANCE_RADIUS = 6
+
+# Ghost swarm: GHOST_SWARM_COUNT ghosts driven by the NumPy GhostSwarm replace
+# the four classic ghosts (0 keeps the classic ghosts). They start at least
+# GHOST_SWARM_CLEARANCE cells from the player, and the agent plans against the
+# GHOST_SWARM_PLANNED nearest of them
+GHOST_SWARM_COUNT = 0
+GHOST_SWARM_CLEARANCE = 8
+GHOST_SWARM_PLANNED = 4
+
+# Use true maze distances (DistanceOracle) instead of Manhattan distance
+# for ghost proximity in state evaluation and ghost simulation
+USE_MAZE_DISTANCE = False
+
+# Run BFS, UCS and A* on the corridor-compressed junction graph, expanding
+# corridors back into cells afterwards
+USE_JUNCTION_GRAPH = False
+
+# Telemetry: JSONL file that game and planning events are flushed to (None keeps
+# them in memory only), the lowest level recorded ('debug' includes every
+# replan), and the fraction of events kept per event type
+TELEMETRY_PATH = None
+TELEMETRY_LEVEL = 'info'
+TELEMETRY_SAMPLE_RATES = {}
@@ -5,6 +5,259 @@ import pygame
 from config import *
 
 
+# Turn masks: bit d is set when direction d (DIR_RIGHT..DIR_DOWN) is allowed
+MASK_TURNS = [[bool(mask >> direction & 1) for direction in range(4)] for mask in range(16)]
+
+
+def _offset_bands(size):
+    """
+    Group the pixel offsets within a tile by every test the turn checks make
+    on them (the 12-18 alignment window and the +-15 probes); offsets in the
+    same band always give the same turns
+    Returns: (band of each offset, representative offset of each band)
+    """
+    bands = []
+    representatives = []
+    signatures = {}
+    for offset in range(size):
+        signature = (12 <= offset <= 18, (offset - 15) // size, (offset + 15) // size)
+        if signature not in signatures:
+            signatures[signature] = len(representatives)
+            representatives.append(offset)
+        bands.append(signatures[signature])
+    return bands, representatives
+
+
+X_BANDS, X_OFFSETS = _offset_bands(TILE_WIDTH)
+Y_BANDS, Y_OFFSETS = _offset_bands(TILE_HEIGHT)
+
+
+def _tile_class(board, row, col):
+    """0 for open tiles (and off the board, as get_tile reports), 1 for the gate, 2 for walls"""
+    tile = board.get_tile(row, col)
+    if tile < 3:
+        return 0
+    return 1 if tile == TILE_GATE else 2
+
+
+class TurnTable:
+    """
+    Allowed-turn masks for every (cell, x band, y band, direction, variant),
+    stored in one flat bytes object and read with a single index
+    The checks only probe a cell and its four neighbours, so cells with the
+    same neighbourhood share masks: each distinct neighbourhood is evaluated
+    once with the tile-by-tile check and the result copied to every cell
+    """
+    
+    def __init__(self, board, variants):
+        self.rows = len(board.level)
+        self.cols = len(board.level[0])
+        self.variants = len(variants)  # Turn checks, e.g. gate closed / open
+        self.y_stride = 4 * self.variants
+        self.x_stride = len(Y_OFFSETS) * self.y_stride
+        self.stride = len(X_OFFSETS) * self.x_stride
+        
+        by_code = {}
+        cells = []
+        for row in range(self.rows):
+            for col in range(self.cols):
+                # The column also decides the tunnel checks at the board edges
+                code = (tuple(_tile_class(board, row + dr, col + dc)
+                              for dr, dc in ((0, 0), (0, -1), (0, 1), (-1, 0), (1, 0))),
+                        col == 0, col >= 29)
+                masks = by_code.get(code)
+                if masks is None:
+                    masks = by_code[code] = self._cell_masks(board, row, col, variants)
+                cells.append(masks)
+        self.masks = b''.join(cells)
+    
+    @staticmethod
+    def _cell_masks(board, row, col, variants):
+        masks = bytearray()
+        for x_offset in X_OFFSETS:
+            for y_offset in Y_OFFSETS:
+                center_x = col * TILE_WIDTH + x_offset
+                center_y = row * TILE_HEIGHT + y_offset
+                for direction in range(4):
+                    for turns in variants:
+                        allowed = turns(board, center_x, center_y, direction)
+                        masks.append(sum(1 << d for d in range(4) if allowed[d]))
+        return bytes(masks)
+    
+    def lookup(self, center_x, center_y, direction, variant=0):
+        """Turn mask at a center pixel, or None off the board (callers check tile by tile)"""
+        col, x_offset = divmod(center_x, TILE_WIDTH)
+        row, y_offset = divmod(center_y, TILE_HEIGHT)
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return None
+        return self.masks[(row * self.cols + col) * self.stride + X_BANDS[x_offset] * self.x_stride
+                          + Y_BANDS[y_offset] * self.y_stride + direction * self.variants + variant]
+
+
+def _player_turns(board, center_x, center_y, direction):
+    """Directions the player can turn, read tile by tile (builds and backs up TurnTable)"""
+    turns = [False, False, False, False]  # R, L, U, D
+    num3 = 15
+
+    if center_x // 30 < 29:
+        # Check each direction
+        if direction == DIR_RIGHT:
+            if board.get_tile(center_y // TILE_HEIGHT, 
+                             (center_x - num3) // TILE_WIDTH) < 3:
+                turns[DIR_LEFT] = True
+        if direction == DIR_LEFT:
+            if board.get_tile(center_y // TILE_HEIGHT, 
+                             (center_x + num3) // TILE_WIDTH) < 3:
+                turns[DIR_RIGHT] = True
+        if direction == DIR_UP:
+            if board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                             center_x // TILE_WIDTH) < 3:
+                turns[DIR_DOWN] = True
+        if direction == DIR_DOWN:
+            if board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                             center_x // TILE_WIDTH) < 3:
+                turns[DIR_UP] = True
+
+        # Additional turning checks based on alignment
+        if direction in [DIR_UP, DIR_DOWN]:
+            if 12 <= center_x % TILE_WIDTH <= 18:
+                if board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3:
+                    turns[DIR_DOWN] = True
+                if board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3:
+                    turns[DIR_UP] = True
+            if 12 <= center_y % TILE_HEIGHT <= 18:
+                if board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x - TILE_WIDTH) // TILE_WIDTH) < 3:
+                    turns[DIR_LEFT] = True
+                if board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x + TILE_WIDTH) // TILE_WIDTH) < 3:
+                    turns[DIR_RIGHT] = True
+
+        if direction in [DIR_RIGHT, DIR_LEFT]:
+            if 12 <= center_x % TILE_WIDTH <= 18:
+                if board.get_tile((center_y + TILE_HEIGHT) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3:
+                    turns[DIR_DOWN] = True
+                if board.get_tile((center_y - TILE_HEIGHT) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3:
+                    turns[DIR_UP] = True
+            if 12 <= center_y % TILE_HEIGHT <= 18:
+                if board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x - num3) // TILE_WIDTH) < 3:
+                    turns[DIR_LEFT] = True
+                if board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x + num3) // TILE_WIDTH) < 3:
+                    turns[DIR_RIGHT] = True
+    else:
+        turns[DIR_RIGHT] = True
+        turns[DIR_LEFT] = True
+
+    return turns
+
+
+def _ghost_turns(board, center_x, center_y, direction, gate_open):
+    """Directions a ghost can turn, read tile by tile (builds and backs up TurnTable)"""
+    num3 = 15
+    turns = [False, False, False, False]  # R, L, U, D
+
+    if 0 < center_x // 30 < 29:
+        # Check gate passage
+        if board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                        center_x // TILE_WIDTH) == TILE_GATE:
+            turns[DIR_UP] = True
+
+        # Check basic movements
+        if (board.get_tile(center_y // TILE_HEIGHT, 
+                         (center_x - num3) // TILE_WIDTH) < 3 or
+            (board.get_tile(center_y // TILE_HEIGHT, 
+                          (center_x - num3) // TILE_WIDTH) == TILE_GATE and 
+             gate_open)):
+            turns[DIR_LEFT] = True
+
+        if (board.get_tile(center_y // TILE_HEIGHT, 
+                         (center_x + num3) // TILE_WIDTH) < 3 or
+            (board.get_tile(center_y // TILE_HEIGHT, 
+                          (center_x + num3) // TILE_WIDTH) == TILE_GATE and 
+             gate_open)):
+            turns[DIR_RIGHT] = True
+
+        if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                         center_x // TILE_WIDTH) < 3 or
+            (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                          center_x // TILE_WIDTH) == TILE_GATE and 
+             gate_open)):
+            turns[DIR_DOWN] = True
+
+        if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                         center_x // TILE_WIDTH) < 3 or
+            (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                          center_x // TILE_WIDTH) == TILE_GATE and 
+             gate_open)):
+            turns[DIR_UP] = True
+
+        # Additional alignment checks
+        if direction in [DIR_UP, DIR_DOWN]:
+            if 12 <= center_x % TILE_WIDTH <= 18:
+                if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3 or
+                    (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                                  center_x // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_DOWN] = True
+                if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3 or
+                    (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                                  center_x // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_UP] = True
+
+        if direction in [DIR_RIGHT, DIR_LEFT]:
+            if 12 <= center_x % TILE_WIDTH <= 18:
+                if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3 or
+                    (board.get_tile((center_y + num3) // TILE_HEIGHT, 
+                                  center_x // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_DOWN] = True
+                if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                                 center_x // TILE_WIDTH) < 3 or
+                    (board.get_tile((center_y - num3) // TILE_HEIGHT, 
+                                  center_x // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_UP] = True
+            if 12 <= center_y % TILE_HEIGHT <= 18:
+                if (board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x - num3) // TILE_WIDTH) < 3 or
+                    (board.get_tile(center_y // TILE_HEIGHT, 
+                                  (center_x - num3) // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_LEFT] = True
+                if (board.get_tile(center_y // TILE_HEIGHT, 
+                                 (center_x + num3) // TILE_WIDTH) < 3 or
+                    (board.get_tile(center_y // TILE_HEIGHT, 
+                                  (center_x + num3) // TILE_WIDTH) == TILE_GATE and 
+                     gate_open)):
+                    turns[DIR_RIGHT] = True
+    else:
+        turns[DIR_RIGHT] = True
+        turns[DIR_LEFT] = True
+    
+    return turns
+
+
+def _build_player_turns(board):
+    return TurnTable(board, [_player_turns])
+
+
+def _build_ghost_turns(board):
+    return TurnTable(board, [
+        lambda board, x, y, direction: _ghost_turns(board, x, y, direction, False),
+        lambda board, x, y, direction: _ghost_turns(board, x, y, direction, True),
+    ])
+
+
 class Player:
     """Player (Pac-Man) class"""
     
@@ -38,65 +291,11 @@ class Player:
     def check_position(self, board):
         """Check which directions player can turn"""
         center_x, center_y = self.get_center()
-        turns = [False, False, False, False]  # R, L, U, D
-        num3 = 15
-        
-        if center_x // 30 < 29:
-            # Check each direction
-            if self.direction == DIR_RIGHT:
-                if board.get_tile(center_y // TILE_HEIGHT, 
-                                 (center_x - num3) // TILE_WIDTH) < 3:
-                    turns[DIR_LEFT] = True
-            if self.direction == DIR_LEFT:
-                if board.get_tile(center_y // TILE_HEIGHT, 
-                                 (center_x + num3) // TILE_WIDTH) < 3:
-                    turns[DIR_RIGHT] = True
-            if self.direction == DIR_UP:
-                if board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                 center_x // TILE_WIDTH) < 3:
-                    turns[DIR_DOWN] = True
-            if self.direction == DIR_DOWN:
-                if board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                 center_x // TILE_WIDTH) < 3:
-                    turns[DIR_UP] = True
-            
-            # Additional turning checks based on alignment
-            if self.direction in [DIR_UP, DIR_DOWN]:
-                if 12 <= center_x % TILE_WIDTH <= 18:
-                    if board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3:
-                        turns[DIR_DOWN] = True
-                    if board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3:
-                        turns[DIR_UP] = True
-                if 12 <= center_y % TILE_HEIGHT <= 18:
-                    if board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x - TILE_WIDTH) // TILE_WIDTH) < 3:
-                        turns[DIR_LEFT] = True
-                    if board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x + TILE_WIDTH) // TILE_WIDTH) < 3:
-                        turns[DIR_RIGHT] = True
-            
-            if self.direction in [DIR_RIGHT, DIR_LEFT]:
-                if 12 <= center_x % TILE_WIDTH <= 18:
-                    if board.get_tile((center_y + TILE_HEIGHT) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3:
-                        turns[DIR_DOWN] = True
-                    if board.get_tile((center_y - TILE_HEIGHT) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3:
-                        turns[DIR_UP] = True
-                if 12 <= center_y % TILE_HEIGHT <= 18:
-                    if board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x - num3) // TILE_WIDTH) < 3:
-                        turns[DIR_LEFT] = True
-                    if board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x + num3) // TILE_WIDTH) < 3:
-                        turns[DIR_RIGHT] = True
-        else:
-            turns[DIR_RIGHT] = True
-            turns[DIR_LEFT] = True
-        
-        return turns
+        mask = board.movement_cached('player_turns', _build_player_turns).lookup(
+            center_x, center_y, self.direction)
+        if mask is None:
+            return _player_turns(board, center_x, center_y, self.direction)
+        return list(MASK_TURNS[mask])
     
     def move(self, turns_allowed):
         """Move player based on direction and allowed turns"""
@@ -169,90 +368,13 @@ class Ghost:
     def check_collisions(self, board):
         """Check available turns for ghost"""
         center_x, center_y = self.get_center()
-        num3 = 15
-        self.turns = [False, False, False, False]
-        
-        if 0 < center_x // 30 < 29:
-            # Check gate passage
-            if board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                            center_x // TILE_WIDTH) == TILE_GATE:
-                self.turns[DIR_UP] = True
-            
-            # Check basic movements
-            if (board.get_tile(center_y // TILE_HEIGHT, 
-                             (center_x - num3) // TILE_WIDTH) < 3 or
-                (board.get_tile(center_y // TILE_HEIGHT, 
-                              (center_x - num3) // TILE_WIDTH) == TILE_GATE and 
-                 (self.in_box or self.dead))):
-                self.turns[DIR_LEFT] = True
-                
-            if (board.get_tile(center_y // TILE_HEIGHT, 
-                             (center_x + num3) // TILE_WIDTH) < 3 or
-                (board.get_tile(center_y // TILE_HEIGHT, 
-                              (center_x + num3) // TILE_WIDTH) == TILE_GATE and 
-                 (self.in_box or self.dead))):
-                self.turns[DIR_RIGHT] = True
-                
-            if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                             center_x // TILE_WIDTH) < 3 or
-                (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                              center_x // TILE_WIDTH) == TILE_GATE and 
-                 (self.in_box or self.dead))):
-                self.turns[DIR_DOWN] = True
-                
-            if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                             center_x // TILE_WIDTH) < 3 or
-                (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                              center_x // TILE_WIDTH) == TILE_GATE and 
-                 (self.in_box or self.dead))):
-                self.turns[DIR_UP] = True
-            
-            # Additional alignment checks
-            if self.direction in [DIR_UP, DIR_DOWN]:
-                if 12 <= center_x % TILE_WIDTH <= 18:
-                    if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3 or
-                        (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                      center_x // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_DOWN] = True
-                    if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3 or
-                        (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                      center_x // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_UP] = True
-                        
-            if self.direction in [DIR_RIGHT, DIR_LEFT]:
-                if 12 <= center_x % TILE_WIDTH <= 18:
-                    if (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3 or
-                        (board.get_tile((center_y + num3) // TILE_HEIGHT, 
-                                      center_x // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_DOWN] = True
-                    if (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                     center_x // TILE_WIDTH) < 3 or
-                        (board.get_tile((center_y - num3) // TILE_HEIGHT, 
-                                      center_x // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_UP] = True
-                if 12 <= center_y % TILE_HEIGHT <= 18:
-                    if (board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x - num3) // TILE_WIDTH) < 3 or
-                        (board.get_tile(center_y // TILE_HEIGHT, 
-                                      (center_x - num3) // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_LEFT] = True
-                    if (board.get_tile(center_y // TILE_HEIGHT, 
-                                     (center_x + num3) // TILE_WIDTH) < 3 or
-                        (board.get_tile(center_y // TILE_HEIGHT, 
-                                      (center_x + num3) // TILE_WIDTH) == TILE_GATE and 
-                         (self.in_box or self.dead))):
-                        self.turns[DIR_RIGHT] = True
+        gate_open = self.in_box or self.dead
+        mask = board.movement_cached('ghost_turns', _build_ghost_turns).lookup(
+            center_x, center_y, self.direction, gate_open)
+        if mask is None:
+            self.turns = _ghost_turns(board, center_x, center_y, self.direction, gate_open)
         else:
-            self.turns[DIR_RIGHT] = True
-            self.turns[DIR_LEFT] = True
+            self.turns = list(MASK_TURNS[mask])
         
         # Check if in box
         if 350 < self.x < 550 and 370 < self.y < 480:
@@ -0,0 +1,226 @@
+"""
+Ghost swarm module - Struct-of-arrays ghost state for stress scenarios
+Holds position, direction, speed, target and dead/in-box flags of any number
+of ghosts in NumPy arrays and updates them in vectorized passes that match
+Ghost.check_collisions, Ghost.move_towards_target and the game's speed and
+target rules ghost for ghost. NumPy is optional; only this module needs it.
+"""
+from config import *
+from entities import Ghost, _build_ghost_turns, _ghost_turns, X_BANDS, Y_BANDS
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Per-direction unit steps, indexed by DIR_RIGHT, DIR_LEFT, DIR_UP, DIR_DOWN
+STEP_X = (1, -1, 0, 0)
+STEP_Y = (0, 0, -1, 1)
+
+# Order in which a blocked ghost tries new directions (see Ghost._choose_new_direction)
+FALLBACK_DIRECTIONS = [DIR_DOWN, DIR_UP, DIR_LEFT, DIR_RIGHT]
+
+
+def _build_turn_masks(board):
+    """The ghost TurnTable's masks as a NumPy array"""
+    return np.frombuffer(board.movement_cached('ghost_turns', _build_ghost_turns).masks,
+                         dtype=np.uint8)
+
+
+class GhostSwarm:
+    """Ghost state as parallel arrays, one element per ghost"""
+
+    def __init__(self, xs, ys, directions, ghost_ids=None, speed=GHOST_SPEED):
+        if np is None:
+            raise ImportError('GhostSwarm needs NumPy (pip install numpy)')
+        self.x = np.array(xs, dtype=np.int64)
+        self.y = np.array(ys, dtype=np.int64)
+        self.start_x = self.x.copy()
+        self.start_y = self.y.copy()
+        self.direction = np.array(directions, dtype=np.int64)
+        count = len(self.x)
+        # Ghost ids pick the runaway behaviour: 0 Blinky, 1 Inky, 2 Pinky, 3+ Clyde
+        self.ghost_id = np.arange(count) if ghost_ids is None else np.array(ghost_ids)
+        self._role = np.minimum(self.ghost_id, 3)
+        self.speed = np.full(count, speed, dtype=np.int64)
+        self.target_x = np.full(count, PLAYER_START_X, dtype=np.int64)
+        self.target_y = np.full(count, PLAYER_START_Y, dtype=np.int64)
+        self.dead = np.zeros(count, dtype=bool)
+        self.in_box = np.zeros(count, dtype=bool)
+        self.eaten = np.zeros(count, dtype=bool)  # Eaten during the current powerup
+        self.turns = np.zeros((count, 4), dtype=bool)  # R, L, U, D
+        self._step_x = np.array(STEP_X, dtype=np.int64)
+        self._step_y = np.array(STEP_Y, dtype=np.int64)
+        self._fallback = np.array(FALLBACK_DIRECTIONS, dtype=np.int64)
+        self._x_bands = np.array(X_BANDS, dtype=np.int64)
+        self._y_bands = np.array(Y_BANDS, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.x)
+
+    @classmethod
+    def spawn(cls, cells, count, rng):
+        """count ghosts centered on (row, col) cells drawn by rng, heading in random directions"""
+        xs, ys, directions = [], [], []
+        for _ in range(count):
+            row, col = rng.choice(cells)
+            xs.append(col * TILE_WIDTH + TILE_WIDTH // 2 - 22)
+            ys.append(row * TILE_HEIGHT + TILE_HEIGHT // 2 - 22)
+            directions.append(rng.randrange(4))
+        return cls(xs, ys, directions)
+
+    @classmethod
+    def from_ghosts(cls, ghosts, eaten=None):
+        """Swarm holding the state of Ghost objects (eaten defaults to none)"""
+        swarm = cls([g.x for g in ghosts], [g.y for g in ghosts],
+                    [g.direction for g in ghosts], [g.ghost_id for g in ghosts])
+        swarm.start_x[:] = [g.start_x for g in ghosts]
+        swarm.start_y[:] = [g.start_y for g in ghosts]
+        swarm.speed[:] = [g.speed for g in ghosts]
+        swarm.target_x[:] = [g.target[0] for g in ghosts]
+        swarm.target_y[:] = [g.target[1] for g in ghosts]
+        swarm.dead[:] = [g.dead for g in ghosts]
+        swarm.in_box[:] = [g.in_box for g in ghosts]
+        swarm.turns[:] = [g.turns for g in ghosts]
+        if eaten is not None:
+            swarm.eaten[:] = eaten
+        return swarm
+
+    def to_ghosts(self, images=None):
+        """Equivalent Ghost objects, e.g. for drawing or comparison"""
+        ghosts = []
+        for i in range(len(self)):
+            ghost = Ghost(int(self.start_x[i]), int(self.start_y[i]),
+                          (int(self.target_x[i]), int(self.target_y[i])), int(self.speed[i]),
+                          images, int(self.direction[i]), int(self.ghost_id[i]), 'Ghost %d' % i)
+            ghost.x = int(self.x[i])
+            ghost.y = int(self.y[i])
+            ghost.dead = bool(self.dead[i])
+            ghost.in_box = bool(self.in_box[i])
+            ghost.turns = [bool(turn) for turn in self.turns[i]]
+            ghosts.append(ghost)
+        return ghosts
+
+    def reset(self):
+        """Send every ghost back to its start position (as Ghost.reset)"""
+        self.x[:] = self.start_x
+        self.y[:] = self.start_y
+        self.dead[:] = False
+        self.in_box[:] = False
+
+    def update_speeds(self, powerup):
+        """Scared, normal or dead speeds (as PacManGame.update_ghost_speeds)"""
+        if powerup:
+            self.speed[~self.dead] = GHOST_SPEED_SCARED
+            self.speed[self.eaten] = GHOST_SPEED
+        else:
+            self.speed[~self.dead] = GHOST_SPEED
+        self.speed[self.dead] = GHOST_SPEED_DEAD
+
+    def update_targets(self, player_x, player_y, powerup):
+        """Chase, flee or return-home targets (as PacManGame.update_ghost_targets)"""
+        runaway_x = 900 if player_x < 450 else 0
+        runaway_y = 900 if player_y < 450 else 0
+
+        # Ghosts in the box head for the exit, others chase the player
+        home = (340 < self.x) & (self.x < 560) & (340 < self.y) & (self.y < 500)
+        target_x = np.where(home, 400, player_x)
+        target_y = np.where(home, 100, player_y)
+
+        if powerup:
+            fleeing = ~self.dead & ~self.eaten
+            role = self._role[fleeing]
+            target_x[fleeing] = np.array([runaway_x, runaway_x, player_x, 450])[role]
+            target_y[fleeing] = np.array([runaway_y, player_y, runaway_y, 450])[role]
+
+        target_x[self.dead] = 380
+        target_y[self.dead] = 400
+        self.target_x[:] = target_x
+        self.target_y[:] = target_y
+
+    def check_collisions(self, board):
+        """Available turns of every ghost, then the in-box flags (as Ghost.check_collisions)"""
+        table = board.movement_cached('ghost_turns', _build_ghost_turns)
+        masks = board.movement_cached('ghost_turns_array', _build_turn_masks)
+        center_x = self.x + 22
+        center_y = self.y + 22
+        gate_open = self.in_box | self.dead
+
+        col, x_offset = np.divmod(center_x, TILE_WIDTH)
+        row, y_offset = np.divmod(center_y, TILE_HEIGHT)
+        inside = (0 <= row) & (row < table.rows) & (0 <= col) & (col < table.cols)
+        index = ((row * table.cols + col) * table.stride
+                 + self._x_bands[x_offset] * table.x_stride
+                 + self._y_bands[y_offset] * table.y_stride
+                 + self.direction * table.variants + gate_open)
+        mask = masks[np.where(inside, index, 0)]
+        self.turns[:] = (mask[:, None] >> np.arange(4)) & 1
+
+        # Centers off the board (in the tunnel) are checked tile by tile
+        for i in np.flatnonzero(~inside):
+            self.turns[i] = _ghost_turns(board, int(center_x[i]), int(center_y[i]),
+                                         int(self.direction[i]), bool(gate_open[i]))
+
+        self.in_box[:] = (350 < self.x) & (self.x < 550) & (370 < self.y) & (self.y < 480)
+        return self.turns
+
+    def revive(self, powerup):
+        """Dead ghosts that reached the box come back to life"""
+        revived = self.in_box & self.dead
+        self.dead[revived] = False
+        self.speed[revived] = GHOST_SPEED_SCARED if powerup else GHOST_SPEED
+
+    def move(self):
+        """
+        Step every ghost (as Ghost.move_towards_target): ahead if the way is
+        open, otherwise in the first open direction towards the target, then
+        any open direction
+        """
+        blocked = np.flatnonzero(~self.turns[np.arange(len(self)), self.direction])
+        moving = np.ones(len(self), dtype=bool)
+        if len(blocked):
+            # Open directions in fallback order, first those towards the target
+            open_ways = self.turns[blocked][:, FALLBACK_DIRECTIONS]
+            towards = np.empty_like(open_ways)
+            towards[:, 0] = self.target_y[blocked] > self.y[blocked]
+            towards[:, 1] = self.target_y[blocked] < self.y[blocked]
+            towards[:, 2] = self.target_x[blocked] < self.x[blocked]
+            towards[:, 3] = self.target_x[blocked] > self.x[blocked]
+            options = np.concatenate([towards & open_ways, open_ways], axis=1)
+            first = options.argmax(axis=1)
+            stuck = ~options[np.arange(len(blocked)), first]
+            self.direction[blocked] = np.where(stuck, self.direction[blocked],
+                                               self._fallback[first % 4])
+            moving[blocked[stuck]] = False
+
+        step = self.speed * moving
+        self.x += self._step_x[self.direction] * step
+        self.y += self._step_y[self.direction] * step
+
+        # Wrap around
+        self.x[self.x < -30] = 900
+        self.x[self.x > 900] = -30
+
+    def update(self, board, player_x, player_y, powerup):
+        """One moving frame, in the order PacManGame.update applies it"""
+        self.update_speeds(powerup)
+        self.update_targets(player_x, player_y, powerup)
+        self.check_collisions(board)
+        self.revive(powerup)
+        self.move()
+
+    def nearest(self, x, y, k):
+        """(x, y) of the k living ghosts nearest to a point, nearest first"""
+        alive = np.flatnonzero(~self.dead)
+        distance = np.abs(self.x[alive] - x) + np.abs(self.y[alive] - y)
+        chosen = alive[np.argsort(distance, kind='stable')[:k]]
+        return [(int(self.x[i]), int(self.y[i])) for i in chosen]
+
+    def overlapping(self, player_center):
+        """Indices of ghosts whose hit box overlaps the player's (as check_ghost_collisions)"""
+        player_x, player_y = player_center
+        center_x = self.x + 22
+        center_y = self.y + 22
+        return np.flatnonzero((center_x - 18 < player_x + 20) & (player_x - 20 < center_x + 18)
+                              & (center_y - 18 < player_y + 20) & (player_y - 20 < center_y + 18))
@@ -0,0 +1,127 @@
+"""
+Layouts module - Board layouts stored in files
+Text layouts are read into lists of rows. Binary layouts (.npy or raw uint8,
+one byte per tile in row-major order) are memory-mapped copy-on-write: the
+file's pages are shared by every board and process that maps it, and tiles a
+board changes stay private to that board.
+
+Text format: one row per line, either one digit per tile or tile numbers
+separated by commas or spaces; blank lines and lines starting with # are
+skipped.
+"""
+import ast
+import mmap
+import os
+import struct
+
+
+NPY_MAGIC = b'\x93NUMPY'
+MAX_TILE = 9
+
+
+class MappedLayout:
+    """A rows x cols grid of uint8 tiles at an offset in a file"""
+
+    def __init__(self, path, rows, cols, offset=0):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.offset = offset
+        if os.path.getsize(path) < offset + rows * cols:
+            raise ValueError(f'{path} is too short for a {rows}x{cols} layout')
+
+    def open(self):
+        """
+        Fresh rows for a board, as writable memoryviews over a private
+        copy-on-write mapping; nothing is read until a tile is touched
+        """
+        with open(self.path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        view = memoryview(mapped)
+        start = self.offset
+        return [view[start + row * self.cols:start + (row + 1) * self.cols]
+                for row in range(self.rows)]
+
+
+def _check_rows(rows, path):
+    if not rows or not rows[0]:
+        raise ValueError(f'{path} has no tiles')
+    for number, row in enumerate(rows):
+        if len(row) != len(rows[0]):
+            raise ValueError(f'{path}: row {number} has {len(row)} tiles, '
+                             f'expected {len(rows[0])}')
+        if min(row) < 0 or max(row) > MAX_TILE:
+            raise ValueError(f'{path}: row {number} has a tile outside 0-{MAX_TILE}')
+    return rows
+
+
+def read_text(path):
+    """Rows of tile values from a text layout"""
+    rows = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            tokens = line.replace(',', ' ').split()
+            if len(tokens) == 1:
+                tokens = tokens[0]
+            rows.append([int(token) for token in tokens])
+    return _check_rows(rows, path)
+
+
+def _npy_header(path):
+    """(rows, cols, data offset) of a 2-D uint8 .npy file; NumPy is not needed"""
+    with open(path, 'rb') as f:
+        if f.read(6) != NPY_MAGIC:
+            raise ValueError(f'{path} is not a .npy file')
+        major = f.read(2)[0]
+        length_format = '<H' if major == 1 else '<I'
+        (length,) = struct.unpack(length_format, f.read(struct.calcsize(length_format)))
+        header = ast.literal_eval(f.read(length).decode('latin1'))
+        offset = f.tell()
+    shape = header['shape']
+    if header['descr'] not in ('|u1', '<u1', 'u1') or header['fortran_order'] or len(shape) != 2:
+        raise ValueError(f'{path} must hold a 2-D C-ordered uint8 array')
+    return shape[0], shape[1], offset
+
+
+def load_layout(path, cols=None):
+    """
+    Layout stored in a file: .txt is text, .npy is NumPy's format, anything
+    else is raw uint8 and needs cols (rows follow from the file size)
+    Returns: list of rows for text, MappedLayout for binary formats
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.txt':
+        return read_text(path)
+    if extension == '.npy':
+        rows, cols, offset = _npy_header(path)
+        return MappedLayout(path, rows, cols, offset)
+    if not cols:
+        raise ValueError(f'{path} is a raw layout: give its number of columns')
+    size = os.path.getsize(path)
+    if size % cols:
+        raise ValueError(f'{path} has {size} bytes, not a whole number of {cols}-tile rows')
+    return MappedLayout(path, size // cols, cols)
+
+
+def save_layout(level, path):
+    """Write rows of tiles in the format chosen by the file extension, as load_layout reads it"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.txt':
+        with open(path, 'w') as f:
+            for row in level:
+                f.write(''.join(str(tile) for tile in row) + '\n')
+        return
+
+    with open(path, 'wb') as f:
+        if extension == '.npy':
+            header = repr({'descr': '|u1', 'fortran_order': False,
+                           'shape': (len(level), len(level[0]))}).encode('latin1')
+            # Pad so the data starts on a 64-byte boundary, as NumPy writes it
+            padding = -(len(NPY_MAGIC) + 4 + len(header) + 1) % 64
+            header += b' ' * padding + b'\n'
+            f.write(NPY_MAGIC + b'\x01\x00' + struct.pack('<H', len(header)) + header)
+        for row in level:
+            f.write(bytes(row))
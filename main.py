@@ -2,33 +2,85 @@
 Pac-Man AI Game with Search Algorithms
 Main game loop with proper pathfinding visualization
 """
+import argparse
+import random
+import time
 import pygame
 from config import *
 from board import Board
 from entities import Player, Ghost
+from ghost_swarm import GhostSwarm
 from algorithms import PathfindingAgent
+from profiler import FrameProfiler
+from recording import KIND_MODE, KIND_NEW_GOAL, KIND_RESTART, Recorder, Recording
+from telemetry import Telemetry
 
 
+# Number keys that switch the controlling algorithm
+MODE_KEYS = {
+    pygame.K_1: MODE_MANUAL,
+    pygame.K_2: MODE_BFS,
+    pygame.K_3: MODE_DFS,
+    pygame.K_4: MODE_UCS,
+    pygame.K_5: MODE_ASTAR,
+    pygame.K_6: MODE_MINIMAX,
+    pygame.K_7: MODE_BIDIRECTIONAL_BFS,
+    pygame.K_8: MODE_BIDIRECTIONAL_ASTAR,
+    pygame.K_9: MODE_JPS,
+    pygame.K_0: MODE_DSTAR_LITE,
+}
+
 class PacManGame:
     """Main game class with search algorithm visualization"""
     
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode([WIDTH, HEIGHT])
-        pygame.display.set_caption("Pac-Man AI - Search Algorithms")
-        self.clock = pygame.time.Clock()
-        self.font = pygame.font.Font('freesansbold.ttf', 20)
-        self.small_font = pygame.font.Font('freesansbold.ttf', 16)
-        
-        # Load images
-        self.player_images = self._load_player_images()
-        self.ghost_images = self._load_ghost_images()
+    def __init__(self, headless=False, ai_mode=MODE_MANUAL, profile=False, trace_path=None,
+                 telemetry_path=TELEMETRY_PATH, record_path=None, seed=None,
+                 ghost_count=GHOST_SWARM_COUNT):
+        # Recordings replay the stock start and ghosts; check before anything is set up
+        if record_path is not None and (seed is not None or ghost_count):
+            raise ValueError('recordings replay the stock game; seeded and swarm games '
+                             'cannot be recorded')
+        
+        # Headless games never open a window, load fonts or images, or draw
+        self.headless = headless
+        self.profiler = FrameProfiler(enabled=profile)
+        self.trace_path = trace_path  # Chrome trace written when the game ends
+        self.telemetry = Telemetry(telemetry_path, TELEMETRY_LEVEL, TELEMETRY_SAMPLE_RATES)
+        self.telemetry.start()
+        
+        # Input recording: the RNG seed is drawn and applied before anything uses random.
+        # It is not the start seed, so the recorded game still starts where replay() does
+        self.record_path = record_path
+        self.recorder = None
+        if record_path is not None:
+            rng_seed = random.randrange(2 ** 63)
+            random.seed(rng_seed)
+            self.recorder = Recorder(rng_seed, ai_mode)
+        self.replay_directions = None  # Frame -> direction command while replaying
+        self.replay_direction = None
+        
+        if headless:
+            self.screen = None
+            self.player_images = []
+            self.ghost_images = dict.fromkeys(['red', 'pink', 'blue', 'orange', 'powerup', 'dead'])
+        else:
+            pygame.init()
+            self.screen = pygame.display.set_mode([WIDTH, HEIGHT])
+            pygame.display.set_caption("Pac-Man AI - Search Algorithms")
+            self.clock = pygame.time.Clock()
+            self.font = pygame.font.Font('freesansbold.ttf', 20)
+            self.small_font = pygame.font.Font('freesansbold.ttf', 16)
+            
+            # Load images
+            self.player_images = self._load_player_images()
+            self.ghost_images = self._load_ghost_images()
         
         # Game state
         self.board = Board()
         self.player = None
         self.ghosts = []
-        self.agent = PathfindingAgent(MODE_MANUAL)
+        self.swarm = None  # GhostSwarm that replaces the four ghosts when ghost_count is set
+        self.agent = PathfindingAgent(ai_mode, telemetry=self.telemetry)
         
         # Game variables
         self.score = 0
@@ -42,13 +94,26 @@ class PacManGame:
         self.game_won = False
         self.counter = 0
         self.flicker = False
+        self.ticks = 0  # update() calls since the game started
+        self.frame = 0  # update() calls since construction; restarts do not reset it
         
         # AI mode and visualization
-        self.ai_mode = MODE_MANUAL
+        self.ai_mode = ai_mode
         self.show_path = True
         self.show_visited = True
         self.goal_position = None  # Goal for pathfinding
         self.path_complete = False
+        self.player_start = self._start_position(seed)
+        self.seed = seed
+        self.ghost_count = ghost_count
+        
+        # Dirty-rectangle state from the previous presented frame
+        self.full_redraw = True  # Next frame updates the whole window
+        self.last_sprite_rects = []
+        self.last_overlay_key = None
+        self.last_flicker = self.flicker
+        self.overlay_surface = None  # AI overlay, re-rendered when overlay_key() changes
+        self.overlay_surface_key = None
         
         self._initialize_entities()
     
@@ -98,9 +163,21 @@ class PacManGame:
         
         return images
     
+    def _start_position(self, seed):
+        """
+        Player start: the stock one, or with a seed a dot cell drawn from it,
+        centered in its tile so the player can turn either way from the start
+        """
+        if seed is None:
+            return PLAYER_START_X, PLAYER_START_Y
+        rng = random.Random(seed)
+        row, col = rng.choice(sorted(self.board.get_all_dots()))
+        # Center 15 px into the tile (Player.get_center adds 23, 24 to x, y)
+        return col * TILE_WIDTH + 15 - 23, row * TILE_HEIGHT + 15 - 24
+    
     def _initialize_entities(self):
         """Initialize player and ghosts"""
-        self.player = Player(PLAYER_START_X, PLAYER_START_Y, self.player_images)
+        self.player = Player(*self.player_start, self.player_images)
         
         self.ghosts = [
             Ghost(BLINKY_START_X, BLINKY_START_Y, (PLAYER_START_X, PLAYER_START_Y),
@@ -112,53 +189,100 @@ class PacManGame:
             Ghost(CLYDE_START_X, CLYDE_START_Y, (PLAYER_START_X, PLAYER_START_Y),
                   GHOST_SPEED, self.ghost_images['orange'], DIR_UP, 3, "Clyde")
         ]
+        
+        if self.ghost_count:
+            # Swarm ghosts start anywhere in the maze except close to the player
+            row, col = self.player.get_grid_position()
+            cells = [cell for cell in self.board.get_graph().cells
+                     if abs(cell[0] - row) + abs(cell[1] - col) >= GHOST_SWARM_CLEARANCE]
+            self.ghosts = []
+            self.swarm = GhostSwarm.spawn(cells, self.ghost_count, random.Random(self.seed))
     
     def set_new_goal(self):
         """Set a new goal position for pathfinding"""
         # Find nearest dot as goal
-        dots = self.board.get_all_dots()
-        if dots:
+        dots = self.board.get_dot_index()
+        if len(dots):
             player_grid = self.player.get_grid_position()
-            # Get a dot that's far away for better visualization
-            dots.sort(key=lambda d: abs(d[0] - player_grid[0]) + abs(d[1] - player_grid[1]))
-            # Pick one of the farther dots (top 20%)
+            # Pick one of the farther dots (top 20%) for better visualization
             goal_index = min(len(dots) - 1, max(0, len(dots) - len(dots) // 5))
-            self.goal_position = dots[goal_index]
+            self.goal_position = dots.at_rank(player_grid, goal_index)
         else:
             # No dots left, use a random position
             self.goal_position = self.board.get_random_walkable_position()
         
         self.path_complete = False
+        self.telemetry.emit('goal_set', goal=self.goal_position, mode=self.ai_mode)
+    
+    def set_mode(self, mode):
+        """Switch the controlling algorithm (MODE_MANUAL for the keyboard)"""
+        if self.recorder is not None:
+            self.recorder.record(self.frame, KIND_MODE, mode)
+        self.ai_mode = mode
+        self.agent.set_algorithm(mode)
+        if mode in [MODE_MANUAL, MODE_MINIMAX]:
+            self.goal_position = None
+        else:
+            self.set_new_goal()
+    
+    def apply_command(self, kind, value=0):
+        """Apply a recordable command: a mode switch, a new goal request or a restart"""
+        if kind == KIND_MODE:
+            self.set_mode(value)
+            return
+        if self.recorder is not None:
+            self.recorder.record(self.frame, kind, value)
+        if kind == KIND_NEW_GOAL:
+            if self.ai_mode not in [MODE_MANUAL, MODE_MINIMAX]:
+                self.set_new_goal()
+        elif kind == KIND_RESTART:
+            self.reset_game()
+    
+    def save_recording(self):
+        """Write the input recording, if one is being made"""
+        if self.recorder is not None:
+            self.recorder.save(self.record_path, self.frame, self.score)
     
     def reset_game(self):
         """Reset game to initial state"""
         self.board.reset()
-        self.player.reset(PLAYER_START_X, PLAYER_START_Y)
+        self.player.reset(*self.player_start)
         for ghost in self.ghosts:
             ghost.reset()
+        if self.swarm is not None:
+            self.swarm.reset()
         
         self.score = 0
         self.lives = 3
         self.powerup = False
         self.power_counter = 0
-        self.eaten_ghosts = [False, False, False, False]
+        self.clear_eaten_ghosts()
         self.startup_counter = 0
         self.moving = False
         self.game_over = False
         self.game_won = False
+        self.ticks = 0
         self.agent.current_path = []
         self.goal_position = None
         self.path_complete = False
     
+    def clear_eaten_ghosts(self):
+        """Forget which ghosts were eaten during the last powerup"""
+        self.eaten_ghosts = [False, False, False, False]
+        if self.swarm is not None:
+            self.swarm.eaten[:] = False
+    
     def reset_positions(self):
         """Reset positions after death"""
-        self.player.reset(PLAYER_START_X, PLAYER_START_Y)
+        self.player.reset(*self.player_start)
         for ghost in self.ghosts:
             ghost.reset()
+        if self.swarm is not None:
+            self.swarm.reset()
         
         self.powerup = False
         self.power_counter = 0
-        self.eaten_ghosts = [False, False, False, False]
+        self.clear_eaten_ghosts()
         self.startup_counter = 0
         self.agent.current_path = []
         self.goal_position = None
@@ -182,7 +306,8 @@ class PacManGame:
                 self.score += SCORE_POWER_PELLET
                 self.powerup = True
                 self.power_counter = 0
-                self.eaten_ghosts = [False, False, False, False]
+                self.clear_eaten_ghosts()
+                self.telemetry.emit('power_up', tick=self.ticks, score=self.score)
                 
                 # Slow down ghosts during powerup
                 for ghost in self.ghosts:
@@ -208,21 +333,61 @@ class PacManGame:
                     
                 elif not self.powerup and not ghost.dead:
                     # Player dies
-                    if self.lives > 0:
-                        self.lives -= 1
-                        self.reset_positions()
-                    else:
-                        self.game_over = True
-                        self.moving = False
+                    self.lose_life(ghost.name)
                         
                 elif self.powerup and self.eaten_ghosts[ghost.ghost_id] and not ghost.dead:
                     # Ghost that was eaten but respawned can still kill
-                    if self.lives > 0:
-                        self.lives -= 1
-                        self.reset_positions()
-                    else:
-                        self.game_over = True
-                        self.moving = False
+                    self.lose_life(ghost.name)
+        
+        if self.swarm is not None:
+            self.check_swarm_collisions(player_center)
+    
+    def check_swarm_collisions(self, player_center):
+        """Eat or be caught by the swarm ghosts overlapping the player, as for the four ghosts"""
+        swarm = self.swarm
+        for i in swarm.overlapping(player_center):
+            if swarm.dead[i]:
+                continue
+            if self.powerup and not swarm.eaten[i]:
+                swarm.dead[i] = True
+                swarm.eaten[i] = True
+                swarm.speed[i] = GHOST_SPEED_DEAD
+                # Doubles per ghost eaten, capped at the fourth ghost's score
+                eaten = min(int(swarm.eaten.sum()), 4)
+                self.score += (2 ** eaten) * SCORE_GHOST_BASE
+            else:
+                self.lose_life('Ghost %d' % i)
+                return
+    
+    def lose_life(self, ghost_name):
+        """The player was caught: restart from the start positions, or end the game"""
+        self.telemetry.emit('death', tick=self.ticks, ghost=ghost_name,
+                            lives=self.lives, score=self.score)
+        if self.lives > 0:
+            self.lives -= 1
+            self.reset_positions()
+        else:
+            self.game_over = True
+            self.moving = False
+    
+    def update_ghost_speeds(self):
+        """Set ghost speeds for the powerup state: scared, normal, or dead and returning"""
+        if self.powerup:
+            for i, ghost in enumerate(self.ghosts):
+                if not ghost.dead:
+                    ghost.speed = GHOST_SPEED_SCARED
+                if self.eaten_ghosts[i]:
+                    ghost.speed = GHOST_SPEED
+        else:
+            for i, ghost in enumerate(self.ghosts):
+                if not ghost.dead:
+                    ghost.speed = GHOST_SPEED
+        
+        for ghost in self.ghosts:
+            if ghost.dead:
+                ghost.speed = GHOST_SPEED_DEAD
+        if self.swarm is not None:
+            self.swarm.update_speeds(self.powerup)
     
     def update_ghost_targets(self):
         """Update ghost target positions"""
@@ -269,6 +434,9 @@ class PacManGame:
                         ghost.target = (player_x, player_y)
                 else:
                     ghost.target = return_target
+        
+        if self.swarm is not None:
+            self.swarm.update_targets(player_x, player_y, self.powerup)
     
     def update_ghosts(self):
         """Update ghost positions and states"""
@@ -283,6 +451,12 @@ class PacManGame:
             # Move ghost
             if self.moving:
                 ghost.move_towards_target()
+        
+        if self.swarm is not None:
+            self.swarm.check_collisions(self.board)
+            self.swarm.revive(self.powerup)
+            if self.moving:
+                self.swarm.move()
     
     def draw_ui(self):
         """Draw UI elements"""
@@ -306,14 +480,20 @@ class PacManGame:
         
         # Instructions
         inst_text = self.small_font.render(
-            'Arrow Keys: Move | 1-6: AI | V: Visited | P: Path | G: New Goal | R: Restart', 
-            True, WHITE)
+            'Arrow Keys: Move | 0-9: AI | V: Visited | P: Path | G: New Goal | F: Profiler'
+            ' | R: Restart', True, WHITE)
         self.screen.blit(inst_text, (10, 35))
         
-        # Show visited nodes count
-        if hasattr(self.agent, 'visited_nodes') and len(self.agent.visited_nodes) > 0:
+        # Show search statistics
+        result = self.agent.last_result
+        if result is not None and result.expanded > 0:
+            if self.agent.last_result_cached:
+                timing = 'cached'
+            else:
+                timing = f'{result.elapsed_ns / 1e6:.2f} ms'
             visited_text = self.small_font.render(
-                f'Nodes Explored: {len(self.agent.visited_nodes)}', True, YELLOW)
+                f'Nodes Expanded: {result.expanded} | Max Frontier: {result.max_frontier}'
+                f' | {timing}', True, YELLOW)
             self.screen.blit(visited_text, (10, 60))
         
         # Show path length
@@ -322,6 +502,9 @@ class PacManGame:
                 f'Path Length: {len(self.agent.current_path)}', True, YELLOW)
             self.screen.blit(path_text, (10, 85))
         
+        if self.profiler.enabled:
+            self.draw_profiler_hud()
+        
         # Game over/won messages
         if self.game_over:
             pygame.draw.rect(self.screen, WHITE, [50, 200, 800, 300], 0, 10)
@@ -335,24 +518,39 @@ class PacManGame:
             text = self.font.render('Victory! Press R to Restart', True, (0, 255, 0))
             self.screen.blit(text, (180, 300))
     
-    def draw_ai_visualization(self):
-        """Draw AI pathfinding visualization with start and goal"""
-        if self.ai_mode == MODE_MANUAL:
-            return
+    def draw_profiler_hud(self):
+        """Draw rolling p50/p99 frame time per subsystem"""
+        text = self.small_font.render('Profiler (ms)   p50     p99', True, WHITE)
+        self.screen.blit(text, (640, 10))
+        for i, (name, p50, p99) in enumerate(self.profiler.summary()):
+            color = RED if p99 > 1000 / FPS else WHITE
+            text = self.small_font.render(f'{name:<12} {p50:6.2f} {p99:7.2f}', True, color)
+            self.screen.blit(text, (640, 30 + i * 18))
+    
+    def overlay_key(self):
+        """Everything the cached AI overlay depends on; it changes when the agent replans"""
+        return (self.agent.last_result, self.agent.current_path, self.goal_position,
+                self.ai_mode, self.show_path, self.show_visited)
+    
+    def render_overlay(self):
+        """Render goal, visited nodes and path onto a transparent (color-keyed) surface"""
+        surface = pygame.Surface((WIDTH, HEIGHT)).convert()
+        surface.fill(BLACK)
+        surface.set_colorkey(BLACK, pygame.RLEACCEL)
         
         # Draw goal position (red circle)
         if self.goal_position:
             goal_x = int(self.goal_position[1] * TILE_WIDTH + TILE_WIDTH // 2)
             goal_y = int(self.goal_position[0] * TILE_HEIGHT + TILE_HEIGHT // 2)
-            pygame.draw.circle(self.screen, RED, (goal_x, goal_y), 12, 3)
-            pygame.draw.circle(self.screen, (255, 100, 100), (goal_x, goal_y), 8)
+            pygame.draw.circle(surface, RED, (goal_x, goal_y), 12, 3)
+            pygame.draw.circle(surface, (255, 100, 100), (goal_x, goal_y), 8)
         
         # Draw visited nodes (blue circles)
-        if self.show_visited and hasattr(self.agent, 'visited_nodes'):
+        if self.show_visited:
             for node in self.agent.visited_nodes:
                 x = int(node[1] * TILE_WIDTH + TILE_WIDTH // 2)
                 y = int(node[0] * TILE_HEIGHT + TILE_HEIGHT // 2)
-                pygame.draw.circle(self.screen, (100, 150, 255), (x, y), 4)
+                pygame.draw.circle(surface, (100, 150, 255), (x, y), 4)
         
         # Draw current path (green line)
         if self.show_path and self.agent.current_path:
@@ -366,13 +564,27 @@ class PacManGame:
                 x2 = int(pos2[1] * TILE_WIDTH + TILE_WIDTH // 2)
                 y2 = int(pos2[0] * TILE_HEIGHT + TILE_HEIGHT // 2)
                 
-                pygame.draw.line(self.screen, (0, 255, 0), (x1, y1), (x2, y2), 3)
+                pygame.draw.line(surface, (0, 255, 0), (x1, y1), (x2, y2), 3)
             
             # Draw circles on path nodes
             for pos in self.agent.current_path:
                 x = int(pos[1] * TILE_WIDTH + TILE_WIDTH // 2)
                 y = int(pos[0] * TILE_HEIGHT + TILE_HEIGHT // 2)
-                pygame.draw.circle(self.screen, (0, 200, 0), (x, y), 5)
+                pygame.draw.circle(surface, (0, 200, 0), (x, y), 5)
+        
+        return surface
+    
+    def draw_ai_visualization(self):
+        """Draw AI pathfinding visualization with start and goal"""
+        if self.ai_mode == MODE_MANUAL:
+            return
+        
+        # The overlay is only re-rendered when the agent's search result changes
+        key = self.overlay_key()
+        if self.overlay_surface is None or key != self.overlay_surface_key:
+            self.overlay_surface = self.render_overlay()
+            self.overlay_surface_key = key
+        self.screen.blit(self.overlay_surface, (0, 0))
         
         # Draw start position (green circle)
         player_grid = self.player.get_grid_position()
@@ -382,6 +594,9 @@ class PacManGame:
     
     def handle_input(self, event):
         """Handle keyboard input"""
+        if event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+            self.full_redraw = True
+        
         if event.type == pygame.KEYDOWN:
             # Manual controls
             if self.ai_mode == MODE_MANUAL:
@@ -395,45 +610,24 @@ class PacManGame:
                     self.player.direction_command = DIR_DOWN
             
             # Algorithm selection
-            if event.key == pygame.K_1:
-                self.ai_mode = MODE_MANUAL
-                self.agent.set_algorithm(MODE_MANUAL)
-                self.goal_position = None
-            elif event.key == pygame.K_2:
-                self.ai_mode = MODE_BFS
-                self.agent.set_algorithm(MODE_BFS)
-                self.set_new_goal()
-            elif event.key == pygame.K_3:
-                self.ai_mode = MODE_DFS
-                self.agent.set_algorithm(MODE_DFS)
-                self.set_new_goal()
-            elif event.key == pygame.K_4:
-                self.ai_mode = MODE_UCS
-                self.agent.set_algorithm(MODE_UCS)
-                self.set_new_goal()
-            elif event.key == pygame.K_5:
-                self.ai_mode = MODE_ASTAR
-                self.agent.set_algorithm(MODE_ASTAR)
-                self.set_new_goal()
-            elif event.key == pygame.K_6:
-                self.ai_mode = MODE_MINIMAX
-                self.agent.set_algorithm(MODE_MINIMAX)
-                self.goal_position = None
+            if event.key in MODE_KEYS:
+                self.set_mode(MODE_KEYS[event.key])
             
             # Set new goal
             elif event.key == pygame.K_g:
-                if self.ai_mode not in [MODE_MANUAL, MODE_MINIMAX]:
-                    self.set_new_goal()
+                self.apply_command(KIND_NEW_GOAL)
             
             # Visualization toggles
             elif event.key == pygame.K_v:
                 self.show_visited = not self.show_visited
             elif event.key == pygame.K_p:
                 self.show_path = not self.show_path
+            elif event.key == pygame.K_f:
+                self.profiler.toggle()
             
             # Restart
             elif event.key == pygame.K_r:
-                self.reset_game()
+                self.apply_command(KIND_RESTART)
         
         elif event.type == pygame.KEYUP:
             if self.ai_mode == MODE_MANUAL:
@@ -448,6 +642,9 @@ class PacManGame:
     
     def update(self):
         """Update game state"""
+        self.ticks += 1
+        self.frame += 1
+        
         # Animation counter
         if self.counter < 19:
             self.counter += 1
@@ -465,7 +662,7 @@ class PacManGame:
         elif self.powerup and self.power_counter >= POWERUP_DURATION:
             self.power_counter = 0
             self.powerup = False
-            self.eaten_ghosts = [False, False, False, False]
+            self.clear_eaten_ghosts()
             # Reset ghost speeds
             for ghost in self.ghosts:
                 if not ghost.dead:
@@ -483,84 +680,177 @@ class PacManGame:
             self.game_won = True
             self.moving = False
         
-        # Update ghost speeds
-        if self.powerup:
-            for i, ghost in enumerate(self.ghosts):
-                if not ghost.dead:
-                    ghost.speed = GHOST_SPEED_SCARED
-                if self.eaten_ghosts[i]:
-                    ghost.speed = GHOST_SPEED
-        else:
-            for i, ghost in enumerate(self.ghosts):
-                if not ghost.dead:
-                    ghost.speed = GHOST_SPEED
-        
-        for ghost in self.ghosts:
-            if ghost.dead:
-                ghost.speed = GHOST_SPEED_DEAD
+        self.update_ghost_speeds()
         
         # Update game objects
         if self.moving:
-            # Get AI move or use manual control
-            if self.ai_mode != MODE_MANUAL:
-                # Set goal if not set
-                if self.goal_position is None and self.ai_mode not in [MODE_MINIMAX]:
-                    self.set_new_goal()
-                
-                # Check if reached goal
-                player_grid = self.player.get_grid_position()
-                if self.goal_position and player_grid == self.goal_position:
-                    self.path_complete = True
-                    self.set_new_goal()  # Set new goal when reached
-                
-                ghost_positions = [(g.x, g.y) for g in self.ghosts if not g.dead]
-                ai_direction = self.agent.get_next_move(
-                    (self.player.x, self.player.y), ghost_positions, self.board, self.goal_position)
-                
-                if ai_direction is not None:
-                    self.player.direction_command = ai_direction
-            
-            # Update player
-            turns_allowed = self.player.check_position(self.board)
+            with self.profiler.section('agent'):
+                self.update_agent()
             
-            if self.player.direction_command == DIR_RIGHT and turns_allowed[DIR_RIGHT]:
-                self.player.direction = DIR_RIGHT
-            elif self.player.direction_command == DIR_LEFT and turns_allowed[DIR_LEFT]:
-                self.player.direction = DIR_LEFT
-            elif self.player.direction_command == DIR_UP and turns_allowed[DIR_UP]:
-                self.player.direction = DIR_UP
-            elif self.player.direction_command == DIR_DOWN and turns_allowed[DIR_DOWN]:
-                self.player.direction = DIR_DOWN
+            # Record the command the player acts on, or replay the recorded one
+            if self.recorder is not None:
+                self.recorder.direction(self.frame, self.player.direction_command)
+            elif self.replay_directions is not None:
+                self.replay_direction = self.replay_directions.get(self.frame,
+                                                                   self.replay_direction)
+                if self.replay_direction is not None:
+                    self.player.direction_command = self.replay_direction
             
-            self.player.move(turns_allowed)
+            # Update player
+            with self.profiler.section('player'):
+                self.update_player()
             
             # Update ghosts
-            self.update_ghost_targets()
-            self.update_ghosts()
+            with self.profiler.section('ghosts'):
+                self.update_ghost_targets()
+                self.update_ghosts()
             
             # Check collisions
-            self.check_collisions()
-            self.check_ghost_collisions()
+            with self.profiler.section('collisions'):
+                self.check_collisions()
+                self.check_ghost_collisions()
+    
+    def update_agent(self):
+        """Let the AI choose the player's next direction"""
+        if self.ai_mode == MODE_MANUAL:
+            return
+        
+        # Set goal if not set
+        if self.goal_position is None and self.ai_mode not in [MODE_MINIMAX]:
+            self.set_new_goal()
+        
+        # Check if reached goal
+        player_grid = self.player.get_grid_position()
+        if self.goal_position and player_grid == self.goal_position:
+            self.path_complete = True
+            self.set_new_goal()  # Set new goal when reached
+        
+        ghost_positions = [(g.x, g.y) for g in self.ghosts if not g.dead]
+        if self.swarm is not None:
+            ghost_positions += self.swarm.nearest(self.player.x, self.player.y,
+                                                  GHOST_SWARM_PLANNED)
+        ai_direction = self.agent.get_next_move(
+            (self.player.x, self.player.y), ghost_positions, self.board, self.goal_position)
+        
+        if ai_direction is not None:
+            self.player.direction_command = ai_direction
+    
+    def update_player(self):
+        """Turn the player towards its commanded direction if allowed, then move"""
+        turns_allowed = self.player.check_position(self.board)
+        
+        if self.player.direction_command == DIR_RIGHT and turns_allowed[DIR_RIGHT]:
+            self.player.direction = DIR_RIGHT
+        elif self.player.direction_command == DIR_LEFT and turns_allowed[DIR_LEFT]:
+            self.player.direction = DIR_LEFT
+        elif self.player.direction_command == DIR_UP and turns_allowed[DIR_UP]:
+            self.player.direction = DIR_UP
+        elif self.player.direction_command == DIR_DOWN and turns_allowed[DIR_DOWN]:
+            self.player.direction = DIR_DOWN
+        
+        self.player.move(turns_allowed)
     
     def draw(self):
         """Draw game state"""
-        self.screen.fill(BLACK)
-        self.board.draw(self.screen, self.flicker)
+        with self.profiler.section('board'):
+            # The board's wall layer covers the whole screen, clearing the last frame
+            self.board.draw(self.screen, self.flicker)
         
         # Draw AI visualization
-        self.draw_ai_visualization()
+        with self.profiler.section('ai_overlay'):
+            self.draw_ai_visualization()
         
         # Draw entities
-        self.player.draw(self.screen)
-        
-        for i, ghost in enumerate(self.ghosts):
-            ghost.draw(self.screen, self.powerup, self.eaten_ghosts[i],
-                      self.ghost_images['powerup'], self.ghost_images['dead'])
+        with self.profiler.section('sprites'):
+            self.player.draw(self.screen)
+            
+            for i, ghost in enumerate(self.ghosts):
+                ghost.draw(self.screen, self.powerup, self.eaten_ghosts[i],
+                          self.ghost_images['powerup'], self.ghost_images['dead'])
+            if self.swarm is not None:
+                self.draw_swarm()
         
         # Draw UI
-        self.draw_ui()
+        with self.profiler.section('ui'):
+            self.draw_ui()
         
-        pygame.display.flip()
+        with self.profiler.section('flip'):
+            self.present()
+    
+    def draw_swarm(self):
+        """Draw the swarm ghosts the way Ghost.draw picks their images"""
+        swarm = self.swarm
+        colors = [self.ghost_images[color] for color in ('red', 'blue', 'pink', 'orange')]
+        sprites = []
+        for i in range(len(swarm)):
+            if swarm.dead[i]:
+                image = self.ghost_images['dead']
+            elif self.powerup and not swarm.eaten[i]:
+                image = self.ghost_images['powerup']
+            else:
+                image = colors[i % 4]
+            sprites.append((image, (int(swarm.x[i]), int(swarm.y[i]))))
+        self.screen.blits(sprites, doreturn=False)
+    
+    def sprite_rects(self):
+        """Screen rectangles of everything that moves: sprites and the start marker"""
+        rects = [pygame.Rect(self.player.x, self.player.y, 45, 45)]
+        rects.extend(pygame.Rect(ghost.x, ghost.y, 45, 45) for ghost in self.ghosts)
+        if self.swarm is not None:
+            rects.extend(pygame.Rect(int(x), int(y), 45, 45)
+                         for x, y in zip(self.swarm.x, self.swarm.y))
+        if self.ai_mode != MODE_MANUAL:
+            row, col = self.player.get_grid_position()
+            rects.append(pygame.Rect(col * TILE_WIDTH + TILE_WIDTH // 2 - 12,
+                                     row * TILE_HEIGHT + TILE_HEIGHT // 2 - 12, 24, 24))
+        return rects
+    
+    def present(self):
+        """
+        Show the finished frame: update only the regions that can have changed
+        (moving sprites, eaten dots, flickering pellets and the text bands), or
+        the whole window when the maze, AI overlay or a message panel changed
+        """
+        board_rects = self.board.take_dirty_rects()
+        sprite_rects = self.sprite_rects()
+        overlay_key = (self.overlay_key(), self.profiler.enabled)
+        
+        if (self.full_redraw or board_rects is None or overlay_key != self.last_overlay_key
+                or self.game_over or self.game_won):
+            pygame.display.flip()
+        else:
+            rects = board_rects + sprite_rects + self.last_sprite_rects
+            rects.append(pygame.Rect(0, 0, WIDTH, 110))  # Mode, instructions and stats
+            rects.append(pygame.Rect(0, HEIGHT - 45, WIDTH, 45))  # Score and lives
+            if self.profiler.enabled:
+                rects.append(pygame.Rect(630, 0, WIDTH - 630, 40 + 18 * len(self.profiler.order)))
+            if self.flicker != self.last_flicker:
+                rects.extend(self.board.power_pellet_rects())
+            pygame.display.update(rects)
+        
+        self.full_redraw = False
+        self.last_sprite_rects = sprite_rects
+        self.last_overlay_key = overlay_key
+        self.last_flicker = self.flicker
+    
+    def step(self, n=1):
+        """
+        Run up to n updates without drawing or frame limiting, stopping early
+        when the game is won or lost
+        Returns: dict with score, lives, ticks, won and lost
+        """
+        for _ in range(n):
+            if self.game_over or self.game_won:
+                break
+            with self.profiler.section('update'):
+                self.update()
+        return {
+            'score': self.score,
+            'lives': self.lives,
+            'ticks': self.ticks,
+            'won': self.game_won,
+            'lost': self.game_over,
+        }
     
     def run(self):
         """Main game loop"""
@@ -575,15 +865,97 @@ class PacManGame:
                 else:
                     self.handle_input(event)
             
-            self.update()
-            self.draw()
-        
+            with self.profiler.section('frame'):
+                with self.profiler.section('update'):
+                    self.update()
+                with self.profiler.section('draw'):
+                    self.draw()
+        
+        if self.trace_path:
+            self.profiler.export_chrome_trace(self.trace_path)
+        self.save_recording()
+        self.telemetry.close()
         pygame.quit()
 
 
+def replay(path):
+    """
+    Re-run a recording headlessly, tick for tick, timing every update
+    The recorded direction commands override the AI's choices, so the game
+    follows the recording even where a time-budgeted search would differ
+    Returns: dict with frame-time percentiles (ms), the slowest frames and
+    whether the final score matches the recording
+    """
+    recording = Recording.load(path)
+    random.seed(recording.seed)
+    game = PacManGame(headless=True, ai_mode=recording.mode, ghost_count=0)
+    game.replay_directions = recording.directions
+    
+    times = []
+    for frame in range(recording.frames):
+        for kind, value in recording.commands.get(frame, ()):
+            game.apply_command(kind, value)
+        began = time.perf_counter_ns()
+        game.update()
+        times.append(time.perf_counter_ns() - began)
+    game.telemetry.close()
+    
+    ordered = sorted(times) or [0]
+    def percentile(fraction):
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] / 1e6
+    slowest = sorted(range(len(times)), key=times.__getitem__, reverse=True)[:5]
+    return {
+        'frames': len(times),
+        'p50_ms': percentile(0.50),
+        'p90_ms': percentile(0.90),
+        'p99_ms': percentile(0.99),
+        'max_ms': ordered[-1] / 1e6,
+        'slowest_frames': [(frame + 1, times[frame] / 1e6) for frame in slowest],
+        'score': game.score,
+        'recorded_score': recording.score,
+        'diverged': game.score != recording.score,
+    }
+
+
 def main():
     """Entry point"""
-    game = PacManGame()
+    parser = argparse.ArgumentParser(description="Pac-Man AI - Search Algorithms")
+    parser.add_argument('--headless', action='store_true',
+                        help='simulate one game without a window and print the result')
+    parser.add_argument('--mode', type=int, default=MODE_ASTAR,
+                        help='algorithm mode for headless games (see ALGORITHM_NAMES)')
+    parser.add_argument('--ticks', type=int, default=20000,
+                        help='maximum updates for headless games')
+    parser.add_argument('--profile', action='store_true',
+                        help='start with the frame profiler on (toggle in game with F)')
+    parser.add_argument('--trace', metavar='PATH',
+                        help='write profiled frames as Chrome trace-event JSON on exit')
+    parser.add_argument('--telemetry', metavar='PATH', default=TELEMETRY_PATH,
+                        help='append game and planning events to this JSONL file')
+    parser.add_argument('--record', metavar='PATH',
+                        help='write the seed and every input to this binary recording')
+    parser.add_argument('--replay', metavar='PATH',
+                        help='re-run a recording headlessly and print frame times')
+    parser.add_argument('--ghosts', type=int, default=GHOST_SWARM_COUNT, metavar='N',
+                        help='replace the four ghosts with N swarm ghosts (needs NumPy)')
+    args = parser.parse_args()
+    profile = args.profile or args.trace is not None
+    
+    if args.replay:
+        print(replay(args.replay))
+        return
+    if args.headless:
+        game = PacManGame(headless=True, ai_mode=args.mode, profile=profile,
+                          trace_path=args.trace, telemetry_path=args.telemetry,
+                          record_path=args.record, ghost_count=args.ghosts)
+        print(game.step(args.ticks))
+        if args.trace:
+            game.profiler.export_chrome_trace(args.trace)
+        game.save_recording()
+        game.telemetry.close()
+        return
+    game = PacManGame(profile=profile, trace_path=args.trace, telemetry_path=args.telemetry,
+                      record_path=args.record, ghost_count=args.ghosts)
     game.run()
 
 
@@ -0,0 +1,434 @@
+"""
+Maze analysis module - Precomputed views and indexes over a board
+Graph and distance tables depend only on which tiles are walkable, so they
+are built once per layout; dot indexes are kept in sync as dots are eaten
+"""
+from array import array
+from collections import deque
+import heapq
+import math
+
+
+# Neighbor order matches algorithms.get_neighbors: right, left, down, up
+DIRECTIONS = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+
+
+class MazeGraph:
+    """Walkable cells numbered 0..N-1 in row-major order with CSR adjacency"""
+
+    def __init__(self, board):
+        self.rows = len(board.level)
+        self.cols = len(board.level[0])
+        self.cells = [(i, j) for i in range(self.rows) for j in range(self.cols)
+                      if board.is_walkable(i, j)]
+        self.index = {cell: k for k, cell in enumerate(self.cells)}
+        self.size = len(self.cells)
+
+        # Grid position -> node id (-1 for walls)
+        self.node_ids = array('i', [-1]) * (self.rows * self.cols)
+        for k, (row, col) in enumerate(self.cells):
+            self.node_ids[row * self.cols + col] = k
+
+        # Neighbors of node k are targets[offsets[k]:offsets[k + 1]]
+        self.offsets = array('I', [0])
+        self.targets = array('I')
+        for row, col in self.cells:
+            for dr, dc in DIRECTIONS:
+                neighbor = self.index.get((row + dr, col + dc))
+                if neighbor is not None:
+                    self.targets.append(neighbor)
+            self.offsets.append(len(self.targets))
+
+        # Neighbor positions per node, shared and immutable
+        self.neighbor_cells = [
+            tuple(self.cells[t] for t in self.targets[self.offsets[k]:self.offsets[k + 1]])
+            for k in range(self.size)
+        ]
+
+    def neighbors(self, node):
+        """Neighbor ids of a node"""
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def node_at(self, row, col):
+        """Node id at a grid position, or -1 for walls and off-board positions"""
+        if 0 <= row < self.rows and 0 <= col < self.cols:
+            return self.node_ids[row * self.cols + col]
+        return -1
+
+
+class JunctionGraph:
+    """
+    Corridor-compressed view of a MazeGraph
+    Junctions are cells whose degree is not 2 (one cell per junction-free loop
+    is promoted); every run of degree-2 cells between two junctions becomes a
+    single corridor edge weighted by its length in steps
+    """
+
+    def __init__(self, board):
+        graph = board.get_graph()
+        self.graph = graph
+        self.nodes = []  # Junction id -> graph node id
+        self.junction_of = array('i', [-1]) * graph.size
+        self.corridors = []  # (junction a, junction b, interior node ids from a to b)
+        self.corridor_of = array('i', [-1]) * graph.size
+        self.offset = array('i', [0]) * graph.size  # Steps from the corridor's a end
+        self.adjacency = []  # Junction id -> [(neighbor junction, length, corridor id)]
+
+        for node in range(graph.size):
+            if len(graph.neighbors(node)) != 2:
+                self._add_junction(node)
+        for junction in range(len(self.nodes)):
+            self._walk_corridors(junction)
+        # Loops made only of degree-2 cells have no junction yet
+        for node in range(graph.size):
+            if self.junction_of[node] < 0 and self.corridor_of[node] < 0:
+                self._walk_corridors(self._add_junction(node))
+        self.size = len(self.nodes)
+
+    def _add_junction(self, node):
+        self.junction_of[node] = len(self.nodes)
+        self.nodes.append(node)
+        self.adjacency.append([])
+        return self.junction_of[node]
+
+    def _walk_corridors(self, junction):
+        """Follow every corridor leaving a junction that has not been recorded yet"""
+        graph = self.graph
+        start = self.nodes[junction]
+        for first in graph.neighbors(start):
+            if self.corridor_of[first] >= 0:
+                continue
+            if self.junction_of[first] >= 0 and first < start:
+                continue  # Direct junction-to-junction edge, recorded from the other end
+            corridor = len(self.corridors)
+            interior = []
+            prev, current = start, first
+            while self.junction_of[current] < 0:
+                interior.append(current)
+                self.corridor_of[current] = corridor
+                self.offset[current] = len(interior)
+                a, b = graph.neighbors(current)
+                prev, current = current, (b if a == prev else a)
+            end = self.junction_of[current]
+            self.corridors.append((junction, end, tuple(interior)))
+            if end != junction:
+                length = len(interior) + 1
+                self.adjacency[junction].append((end, length, corridor))
+                self.adjacency[end].append((junction, length, corridor))
+
+    def corridor_path(self, corridor, from_junction):
+        """Node ids walked along a corridor from from_junction, ending at the other junction"""
+        a, b, interior = self.corridors[corridor]
+        if from_junction == a:
+            return interior + (self.nodes[b],)
+        return interior[::-1] + (self.nodes[a],)
+
+    def attachments(self, node):
+        """
+        Ways from a cell onto the junction graph
+        Returns: [(junction id, steps, node ids walked, ending at the junction)]
+        """
+        junction = self.junction_of[node]
+        if junction >= 0:
+            return [(junction, 0, ())]
+        a, b, interior = self.corridors[self.corridor_of[node]]
+        k = self.offset[node]
+        return [(a, k, interior[:k - 1][::-1] + (self.nodes[a],)),
+                (b, len(interior) + 1 - k, interior[k:] + (self.nodes[b],))]
+
+    def along(self, node, target):
+        """Node ids from node to target along their shared corridor, or None if there is none"""
+        corridor = self.corridor_of[node]
+        if corridor < 0 or corridor != self.corridor_of[target]:
+            return None
+        interior = self.corridors[corridor][2]
+        i, j = self.offset[node] - 1, self.offset[target] - 1
+        if i <= j:
+            return interior[i + 1:j + 1]
+        return interior[j:i][::-1]
+
+
+class DistanceOracle:
+    """All-pairs maze distances and next hops between walkable cells"""
+
+    def __init__(self, board):
+        graph = board.get_graph()
+        self.cells = graph.cells
+        self.index = graph.index
+        self.size = graph.size
+
+        # One row of n entries per target cell, stored as unsigned integers
+        typecode = 'H' if self.size < 0xFFFF else 'I'
+        self.unreachable = 0xFFFF if typecode == 'H' else 0xFFFFFFFF
+        self._dist = array(typecode, [self.unreachable]) * (self.size * self.size)
+        self._next = array(typecode, [self.unreachable]) * (self.size * self.size)
+
+        adjacency = [graph.neighbors(k) for k in range(self.size)]
+        for target in range(self.size):
+            self._fill_row(target, adjacency)
+
+    def _fill_row(self, target, adjacency):
+        """BFS outward from target, recording distance and first step towards it"""
+        n = self.size
+        base = target * n
+        dist = self._dist
+        nxt = self._next
+        unreachable = self.unreachable
+
+        dist[base + target] = 0
+        nxt[base + target] = target
+        queue = deque([target])
+        while queue:
+            current = queue.popleft()
+            step = dist[base + current] + 1
+            for neighbor in adjacency[current]:
+                if dist[base + neighbor] == unreachable:
+                    dist[base + neighbor] = step
+                    nxt[base + neighbor] = current
+                    queue.append(neighbor)
+
+    def distance(self, pos1, pos2):
+        """
+        Maze distance between two grid positions
+        Positions off the walkable grid fall back to Manhattan distance;
+        disconnected cells are infinitely far apart
+        """
+        a = self.index.get(pos1)
+        b = self.index.get(pos2)
+        if a is None or b is None:
+            return abs(pos1[0] - pos2[0]) + abs(pos1[1] - pos2[1])
+        d = self._dist[b * self.size + a]
+        if d == self.unreachable:
+            return math.inf
+        return d
+
+    def next_hop(self, pos, goal):
+        """First cell on a shortest path from pos to goal (pos itself if already there)"""
+        a = self.index.get(pos)
+        b = self.index.get(goal)
+        if a is None or b is None:
+            return None
+        hop = self._next[b * self.size + a]
+        if hop == self.unreachable:
+            return None
+        return self.cells[hop]
+
+
+class DotDistanceField:
+    """
+    Maze distance from every walkable cell to its nearest remaining dot
+    Removing a dot only re-solves the cells that were assigned to it
+    """
+
+    UNREACHABLE = 0xFFFFFFFF
+
+    def __init__(self, graph, dots):
+        self.graph = graph
+        self.dist = array('I', [self.UNREACHABLE]) * graph.size
+        self.source = array('i', [-1]) * graph.size  # Nearest dot's node id
+        self.is_source = bytearray(graph.size)
+
+        queue = deque()
+        for pos in dots:
+            node = graph.index.get(pos)
+            if node is not None:
+                self.is_source[node] = 1
+                self.dist[node] = 0
+                self.source[node] = node
+                queue.append(node)
+        self._relax(queue)
+
+    def _relax(self, queue):
+        """Propagate smaller distances outward from the queued nodes"""
+        dist, source, graph = self.dist, self.source, self.graph
+        while queue:
+            current = queue.popleft()
+            step = dist[current] + 1
+            for neighbor in graph.neighbors(current):
+                if step < dist[neighbor]:
+                    dist[neighbor] = step
+                    source[neighbor] = source[current]
+                    queue.append(neighbor)
+
+    def add(self, pos):
+        """A dot was placed at pos"""
+        node = self.graph.index.get(pos)
+        if node is None or self.is_source[node]:
+            return
+        self.is_source[node] = 1
+        self.dist[node] = 0
+        self.source[node] = node
+        self._relax(deque([node]))
+
+    def remove(self, pos):
+        """A dot was eaten at pos; repair the cells that were nearest to it"""
+        node = self.graph.index.get(pos)
+        if node is None or not self.is_source[node]:
+            return
+        self.is_source[node] = 0
+        dist, source, graph = self.dist, self.source, self.graph
+
+        # Cells assigned to this dot form a tree rooted at it
+        affected = [node]
+        source[node] = -1
+        for current in affected:
+            for neighbor in graph.neighbors(current):
+                if source[neighbor] == node:
+                    source[neighbor] = -1
+                    affected.append(neighbor)
+        for current in affected:
+            dist[current] = self.UNREACHABLE
+
+        # Re-seed from the surrounding cells that still reach another dot
+        heap = []
+        for current in affected:
+            best = self.UNREACHABLE
+            for neighbor in graph.neighbors(current):
+                if source[neighbor] >= 0 and dist[neighbor] + 1 < best:
+                    best = dist[neighbor] + 1
+                    source[current] = source[neighbor]
+            if best != self.UNREACHABLE:
+                dist[current] = best
+                heap.append((best, current))
+        heapq.heapify(heap)
+
+        while heap:
+            d, current = heapq.heappop(heap)
+            if d != dist[current]:
+                continue
+            for neighbor in graph.neighbors(current):
+                if d + 1 < dist[neighbor]:
+                    dist[neighbor] = d + 1
+                    source[neighbor] = source[current]
+                    heapq.heappush(heap, (d + 1, neighbor))
+
+    def _node(self, pos):
+        """Node id for pos, stepping onto the graph from an adjacent off-graph cell"""
+        node = self.graph.index.get(pos)
+        if node is not None:
+            return node, 0
+        best = None
+        for dr, dc in DIRECTIONS:
+            neighbor = self.graph.node_at(pos[0] + dr, pos[1] + dc)
+            if neighbor >= 0 and (best is None or self.dist[neighbor] < self.dist[best]):
+                best = neighbor
+        return best, 1
+
+    def distance(self, pos):
+        """Maze distance from pos to the nearest remaining dot (inf if none is reachable)"""
+        node, extra = self._node(pos)
+        if node is None or self.dist[node] == self.UNREACHABLE:
+            return math.inf
+        return self.dist[node] + extra
+
+    def nearest(self, pos):
+        """Position of the nearest remaining dot by maze distance, or None"""
+        node, _ = self._node(pos)
+        if node is None or self.source[node] < 0:
+            return None
+        return self.graph.cells[self.source[node]]
+
+
+class DotIndex:
+    """Grid-bucketed spatial index over dot positions for Manhattan rank queries"""
+
+    def __init__(self, rows, cols, bucket_size=4, dots=()):
+        self.bucket_size = bucket_size
+        self.bucket_cols = (cols + bucket_size - 1) // bucket_size
+        bucket_rows = (rows + bucket_size - 1) // bucket_size
+        self.buckets = [set() for _ in range(bucket_rows * self.bucket_cols)]
+        # Bulk insert, without a method call per dot
+        buckets = self.buckets
+        bucket_cols = self.bucket_cols
+        for pos in dots:
+            buckets[(pos[0] // bucket_size) * bucket_cols + pos[1] // bucket_size].add(pos)
+        self.size = sum(map(len, buckets))
+
+    def __len__(self):
+        return self.size
+
+    def _bucket(self, pos):
+        return self.buckets[(pos[0] // self.bucket_size) * self.bucket_cols
+                            + pos[1] // self.bucket_size]
+
+    def add(self, pos):
+        """Insert a dot position"""
+        bucket = self._bucket(pos)
+        if pos not in bucket:
+            bucket.add(pos)
+            self.size += 1
+
+    def remove(self, pos):
+        """Remove a dot position if present"""
+        bucket = self._bucket(pos)
+        if pos in bucket:
+            bucket.remove(pos)
+            self.size -= 1
+
+    def _bounds(self, point):
+        """(lowest, highest, bucket) Manhattan distance bounds for each non-empty bucket"""
+        pr, pc = point
+        size = self.bucket_size
+        bounds = []
+        for k, bucket in enumerate(self.buckets):
+            if not bucket:
+                continue
+            r0 = (k // self.bucket_cols) * size
+            c0 = (k % self.bucket_cols) * size
+            r1 = r0 + size - 1
+            c1 = c0 + size - 1
+            lo = max(r0 - pr, 0, pr - r1) + max(c0 - pc, 0, pc - c1)
+            hi = max(abs(pr - r0), abs(pr - r1)) + max(abs(pc - c0), abs(pc - c1))
+            bounds.append((lo, hi, bucket))
+        return bounds
+
+    def ranked(self, point, first, last):
+        """
+        Dots ranked first..last (inclusive) by Manhattan distance from point
+        Ties are broken in row-major order. Only buckets whose distance range
+        overlaps the requested ranks are scanned.
+        """
+        first = max(first, 0)
+        last = min(last, self.size - 1)
+        if first > last:
+            return []
+        bounds = self._bounds(point)
+
+        # Smallest t with at least first+1 dots possibly within distance t
+        seen = 0
+        for lo, _, bucket in sorted(bounds, key=lambda b: b[0]):
+            seen += len(bucket)
+            if seen > first:
+                t_lo = lo
+                break
+        # Smallest t with at least last+1 dots certainly within distance t
+        seen = 0
+        for _, hi, bucket in sorted(bounds, key=lambda b: b[1]):
+            seen += len(bucket)
+            if seen > last:
+                t_hi = hi
+                break
+
+        below = 0
+        candidates = []
+        pr, pc = point
+        for lo, hi, bucket in bounds:
+            if hi < t_lo:
+                below += len(bucket)
+            elif lo <= t_hi:
+                candidates.extend((abs(r - pr) + abs(c - pc), (r, c)) for r, c in bucket)
+        candidates.sort()
+        return [pos for _, pos in candidates[first - below:last - below + 1]]
+
+    def nearest(self, point, k=1):
+        """The k nearest dots, closest first"""
+        return self.ranked(point, 0, k - 1)
+
+    def farthest(self, point, k=1):
+        """The k farthest dots, farthest first"""
+        return self.ranked(point, self.size - k, self.size - 1)[::-1]
+
+    def at_rank(self, point, rank):
+        """Dot at a given rank in ascending distance order, or None"""
+        found = self.ranked(point, rank, rank)
+        return found[0] if found else None
@@ -0,0 +1,95 @@
+"""
+Frame profiler module - Times each phase of a frame
+Keeps a rolling window of durations per section for the HUD and records
+trace events that can be exported in Chrome trace-event JSON
+"""
+from collections import deque
+import json
+import os
+import time
+
+
+class _Section:
+    """Context manager timing one named section"""
+
+    __slots__ = ('profiler', 'name', 'start')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        self.profiler.record(self.name, self.start, time.perf_counter_ns())
+        return False
+
+
+class _NullSection:
+    """Stand-in used while the profiler is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class FrameProfiler:
+    """Per-section frame timings with rolling percentiles and trace export"""
+
+    def __init__(self, enabled=False, window=240, max_events=200000):
+        self.enabled = enabled
+        self.window = window
+        self.samples = {}  # Section name -> deque of recent durations (ns)
+        self.order = []  # Section names in first-seen order, for display
+        self.events = deque(maxlen=max_events)  # (name, start ns, duration ns)
+        self.origin = time.perf_counter_ns()
+
+    def toggle(self):
+        self.enabled = not self.enabled
+
+    def section(self, name):
+        """Context manager timing the enclosed block under name"""
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def record(self, name, start, end):
+        samples = self.samples.get(name)
+        if samples is None:
+            samples = self.samples[name] = deque(maxlen=self.window)
+            self.order.append(name)
+        samples.append(end - start)
+        self.events.append((name, start, end - start))
+
+    def percentile(self, name, fraction):
+        """Duration in milliseconds at a percentile of the rolling window"""
+        samples = sorted(self.samples.get(name, ()))
+        if not samples:
+            return 0.0
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))] / 1e6
+
+    def summary(self):
+        """[(section, p50 ms, p99 ms)] in first-seen order"""
+        return [(name, self.percentile(name, 0.50), self.percentile(name, 0.99))
+                for name in self.order]
+
+    def export_chrome_trace(self, path):
+        """Write recorded events as Chrome trace-event JSON (open in chrome://tracing)"""
+        pid = os.getpid()
+        trace = {
+            'traceEvents': [
+                {'name': name, 'ph': 'X', 'pid': pid, 'tid': 0,
+                 'ts': (start - self.origin) / 1000, 'dur': duration / 1000}
+                for name, start, duration in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+        with open(path, 'w') as f:
+            json.dump(trace, f)
@@ -0,0 +1,84 @@
+"""
+Recording module - Compact binary log of everything that steers a game
+A recording holds the RNG seed, the starting mode, and the frames at which
+the player's direction command changed or a mode switch, new goal or
+restart was requested. Replaying it reproduces the game tick for tick.
+
+Layout (little-endian):
+    header   magic b'PMREC', version u8, seed u64, starting mode u8
+    events   frame u32, kind u8, value i8   (one per change)
+    trailer  END event, frames u32, final score u32
+"""
+import struct
+
+
+MAGIC = b'PMREC'
+VERSION = 1
+HEADER = struct.Struct('<5sBQB')
+EVENT = struct.Struct('<IBb')
+TRAILER = struct.Struct('<II')
+
+KIND_DIRECTION = 0
+KIND_MODE = 1
+KIND_NEW_GOAL = 2
+KIND_RESTART = 3
+KIND_END = 255
+
+
+class Recorder:
+    """Accumulates events in memory; nothing is written until save()"""
+
+    def __init__(self, seed, mode):
+        self.seed = seed
+        self.data = bytearray(HEADER.pack(MAGIC, VERSION, seed, mode))
+        self.last_direction = None
+
+    def record(self, frame, kind, value=0):
+        self.data += EVENT.pack(frame, kind, value)
+
+    def direction(self, frame, direction):
+        """Record the player's direction command if it changed"""
+        if direction != self.last_direction:
+            self.last_direction = direction
+            self.record(frame, KIND_DIRECTION, direction)
+
+    def save(self, path, frames, score):
+        with open(path, 'wb') as f:
+            f.write(self.data)
+            f.write(EVENT.pack(frames, KIND_END, 0))
+            f.write(TRAILER.pack(frames, score))
+
+
+class Recording:
+    """A recording loaded for replay"""
+
+    def __init__(self, seed, mode, commands, directions, frames, score):
+        self.seed = seed
+        self.mode = mode
+        self.commands = commands  # Frame -> [(kind, value)] applied before that update
+        self.directions = directions  # Frame -> direction command from that update on
+        self.frames = frames
+        self.score = score
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, seed, mode = HEADER.unpack_from(data, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f'{path} is not a version {VERSION} game recording')
+
+        commands = {}
+        directions = {}
+        offset = HEADER.size
+        while True:
+            frame, kind, value = EVENT.unpack_from(data, offset)
+            offset += EVENT.size
+            if kind == KIND_END:
+                break
+            if kind == KIND_DIRECTION:
+                directions[frame] = value
+            else:
+                commands.setdefault(frame, []).append((kind, value))
+        frames, score = TRAILER.unpack_from(data, offset)
+        return cls(seed, mode, commands, directions, frames, score)
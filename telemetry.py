@@ -0,0 +1,98 @@
+"""
+Telemetry module - Structured game and planning events
+Events are appended to an in-memory ring buffer on the frame thread; a
+background thread writes them to a JSONL file in batches
+"""
+from collections import deque
+import json
+import random
+import threading
+import time
+
+
+LEVELS = {'debug': 10, 'info': 20, 'warning': 30}
+
+# Event types and the level each is recorded at
+EVENT_LEVELS = {
+    'replan': 'debug',
+    'path_found': 'debug',
+    'goal_set': 'info',
+    'power_up': 'info',
+    'death': 'info',
+}
+
+
+class Telemetry:
+    """Ring buffer of events with optional batched JSONL output"""
+
+    def __init__(self, path=None, level='info', sample_rates=None, capacity=4096,
+                 flush_interval=1.0):
+        self.path = path
+        self.level = LEVELS[level]
+        self.sample_rates = dict(sample_rates or {})  # Event type -> fraction kept
+        self.buffer = deque(maxlen=capacity)  # Oldest events are dropped when full
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._rng = random.Random(0)  # Sampling must not disturb the game's random state
+        self._stop = threading.Event()
+        self._thread = None
+        self._file = None
+
+    def enabled_for(self, event):
+        """Whether events of this type pass the level filter"""
+        return LEVELS[EVENT_LEVELS.get(event, 'info')] >= self.level
+
+    def emit(self, event, **fields):
+        """Record an event; cheap enough to call from the frame loop"""
+        level = EVENT_LEVELS.get(event, 'info')
+        if LEVELS[level] < self.level:
+            return
+        rate = self.sample_rates.get(event)
+        if rate is not None and self._rng.random() >= rate:
+            return
+        if len(self.buffer) == self.buffer.maxlen:
+            self.dropped += 1
+        fields['t'] = time.time()
+        fields['event'] = event
+        fields['level'] = level
+        self.buffer.append(fields)
+
+    def start(self):
+        """Start the background writer (no-op without an output path)"""
+        if self.path is None or self._thread is not None:
+            return
+        self._file = open(self.path, 'a')
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name='telemetry', daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Write every buffered event to the output file in one batch"""
+        if self._file is None:
+            return
+        batch = []
+        try:
+            while True:
+                batch.append(self.buffer.popleft())
+        except IndexError:
+            pass
+        if batch:
+            self._file.write(''.join(json.dumps(event) + '\n' for event in batch))
+            self._file.flush()
+            self.written += len(batch)
+
+    def close(self):
+        """Stop the writer and flush what is left"""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        self.flush()
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,60 @@
+"""Shared fixtures; the game modules live at the repository root"""
+import os
+import random
+import sys
+from collections import deque
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+from board import Board
+from config import TILE_VERTICAL
+
+
+def walkable_cells(board):
+    return [(row, col) for row in range(len(board.level)) for col in range(len(board.level[0]))
+            if board.is_walkable(row, col)]
+
+
+@pytest.fixture
+def board():
+    return Board()
+
+
+@pytest.fixture
+def walled_board():
+    """Stock board with a few corridor cells walled off, forcing detours"""
+    board = Board()
+    rng = random.Random(7)
+    for row, col in rng.sample(walkable_cells(board), 12):
+        board.set_tile(row, col, TILE_VERTICAL)
+    return board
+
+
+@pytest.fixture
+def query_pairs():
+    """Seeded (start, goal) pairs of walkable cells on a board"""
+    def pairs(board, count=300, seed=2024):
+        rng = random.Random(seed)
+        cells = walkable_cells(board)
+        return [(rng.choice(cells), rng.choice(cells)) for _ in range(count)]
+    return pairs
+
+
+@pytest.fixture
+def maze_distances():
+    """Steps from a cell to every cell reachable from it, by a plain breadth-first search"""
+    def distances(board, start):
+        dist = {start: 0}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0)):
+                neighbor = (current[0] + dr, current[1] + dc)
+                if neighbor not in dist and board.is_walkable(*neighbor):
+                    dist[neighbor] = dist[current] + 1
+                    queue.append(neighbor)
+        return dist
+    return distances
@@ -0,0 +1,85 @@
+"""Alpha-Beta decisions are unchanged by pruning aids and honour the requested depth"""
+import random
+
+import pytest
+
+from algorithms import (AlphaBeta, Minimax, MoveOrdering, SearchContext, SearchStats,
+                        TranspositionTable, manhattan_distance)
+from conftest import walkable_cells
+
+
+@pytest.fixture
+def positions(board):
+    rng = random.Random(5)
+    cells = walkable_cells(board)
+    return [(rng.choice(cells), [rng.choice(cells) for _ in range(2)]) for _ in range(12)]
+
+
+def best_score(player, ghosts, board, depth, context=None, adversarial=False):
+    score, _ = AlphaBeta.alphabeta(player, ghosts, board, depth, float('-inf'), float('inf'),
+                                   True, context=context, adversarial=adversarial)
+    return score
+
+
+@pytest.mark.parametrize('adversarial', [False, True])
+@pytest.mark.parametrize('depth', [1, 2, 3])
+def test_alphabeta_matches_minimax(board, positions, depth, adversarial):
+    for player, ghosts in positions:
+        expected, _ = Minimax.minimax(player, ghosts, board, depth, True,
+                                      adversarial=adversarial)
+        assert best_score(player, ghosts, board, depth, adversarial=adversarial) == expected
+
+
+def test_transposition_table_keeps_the_score(board, positions):
+    table = TranspositionTable()
+    table.sync(board, manhattan_distance)
+    for player, ghosts in positions:
+        expected = best_score(player, ghosts, board, 4)
+        for _ in range(2):
+            assert best_score(player, ghosts, board, 4, SearchContext(table)) == expected
+    assert table.entries
+
+
+@pytest.mark.parametrize('adversarial', [False, True])
+@pytest.mark.parametrize('depth', [1, 2, 3, 4])
+def test_iterative_deepening_reaches_max_depth(board, positions, depth, adversarial):
+    graph = board.get_graph()
+    for player, ghosts in positions:
+        stats = SearchStats()
+        move, completed = AlphaBeta.iterative_deepening(
+            player, ghosts, board, max_depth=depth, time_budget_ms=None,
+            table=TranspositionTable(), ordering=MoveOrdering(), stats=stats,
+            adversarial=adversarial)
+        assert completed == depth == stats.depth
+        assert move in graph.index
+        assert abs(move[0] - player[0]) + abs(move[1] - player[1]) <= 1
+
+
+def test_move_ordering_keeps_the_score(board, positions):
+    ordering = MoveOrdering()
+    for player, ghosts in positions:
+        expected = best_score(player, ghosts, board, 4)
+        ordering.new_decision()
+        stats = SearchStats()
+        context = SearchContext(ordering=ordering, stats=stats, root_depth=4)
+        assert best_score(player, ghosts, board, 4, context) == expected
+        assert stats.nodes > 0
+        assert stats.first_move_cutoffs <= stats.cutoffs
+
+
+def test_tiny_budget_still_returns_a_move(board, positions):
+    player, ghosts = positions[0]
+    move, completed = AlphaBeta.iterative_deepening(player, ghosts, board, max_depth=8,
+                                                    time_budget_ms=0.001)
+    assert completed >= 1
+    assert move in board.get_graph().index
+
+
+def test_table_is_cleared_when_the_ghost_model_changes(board, positions):
+    table = TranspositionTable()
+    player, ghosts = positions[0]
+    AlphaBeta.iterative_deepening(player, ghosts, board, max_depth=2, time_budget_ms=None,
+                                  table=table)
+    assert table.entries
+    table.sync(board, manhattan_distance, adversarial=True)
+    assert not table.entries
@@ -0,0 +1,40 @@
+"""Headless games run without a display and stop stepping once decided"""
+import random
+
+from config import *
+from main import PacManGame
+
+
+def test_step_runs_updates_without_a_display():
+    random.seed(3)
+    game = PacManGame(headless=True, ai_mode=MODE_BFS)
+    assert game.screen is None
+    assert game.step(0)['ticks'] == 0
+    state = game.step(300)
+    assert state['ticks'] == 300
+    assert state['score'] > 0
+
+
+def test_step_stops_once_the_game_is_decided():
+    game = PacManGame(headless=True, ai_mode=MODE_BFS)
+    game.game_over = True
+    state = game.step(10)
+    assert state['ticks'] == 0 and state['lost']
+
+
+def test_seed_chooses_the_player_start():
+    starts = {}
+    for seed in (None, 1, 1, 2):
+        game = PacManGame(headless=True, ai_mode=MODE_BFS, seed=seed)
+        starts.setdefault(seed, set()).add((game.player.x, game.player.y))
+        game.telemetry.close()
+    assert starts[None] == {(PLAYER_START_X, PLAYER_START_Y)}
+    assert len(starts[1]) == 1 and starts[1] != starts[2]
+
+
+def test_seeded_games_play_from_their_start():
+    game = PacManGame(headless=True, ai_mode=MODE_BFS, seed=4)
+    start = (game.player.x, game.player.y)
+    game.step(300)
+    assert (game.player.x, game.player.y) != start and game.score > 0
+    game.telemetry.close()
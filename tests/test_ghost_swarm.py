@@ -0,0 +1,76 @@
+"""The NumPy ghost swarm moves ghost for ghost like the Ghost class and plays in the game"""
+import random
+
+import pytest
+
+np = pytest.importorskip('numpy')
+
+from config import *
+from ghost_swarm import GhostSwarm
+from main import PacManGame
+
+
+def snapshot(ghosts):
+    return [(g.x, g.y, g.direction, g.speed, tuple(g.target), g.dead, g.in_box, list(g.turns))
+            for g in ghosts]
+
+
+def test_swarm_matches_ghosts():
+    game = PacManGame(headless=True)
+    rng = random.Random(3)
+    swarm = GhostSwarm.spawn(game.board.get_graph().cells, 64, rng)
+    game.ghosts = swarm.to_ghosts()
+    game.eaten_ghosts = [False] * len(swarm)
+    game.moving = True
+    for tick in range(300):
+        game.powerup = 100 <= tick < 200
+        if tick == 120:
+            for i in (3, 17):
+                game.ghosts[i].dead = game.eaten_ghosts[i] = True
+                swarm.dead[i] = swarm.eaten[i] = True
+        game.update_ghost_speeds()
+        game.update_ghost_targets()
+        game.update_ghosts()
+        swarm.update(game.board, game.player.x, game.player.y, game.powerup)
+        assert snapshot(game.ghosts) == snapshot(swarm.to_ghosts()), tick
+    game.telemetry.close()
+
+
+def test_overlapping_matches_hit_boxes():
+    rng = random.Random(4)
+    xs = [rng.randrange(0, 900) for _ in range(500)]
+    ys = [rng.randrange(0, 900) for _ in range(500)]
+    swarm = GhostSwarm(xs, ys, [DIR_RIGHT] * 500)
+    player_x, player_y = 450, 450
+    expected = [i for i, (x, y) in enumerate(zip(xs, ys))
+                if abs((x + 22) - player_x) < 38 and abs((y + 22) - player_y) < 38]
+    assert list(swarm.overlapping((player_x, player_y))) == expected
+
+
+def test_nearest_skips_dead_ghosts():
+    swarm = GhostSwarm([100, 10, 50, 300], [0, 0, 0, 0], [DIR_RIGHT] * 4)
+    swarm.dead[1] = True
+    assert swarm.nearest(0, 0, 2) == [(50, 0), (100, 0)]
+
+
+def test_swarm_game_eats_and_is_caught():
+    game = PacManGame(headless=True, ai_mode=MODE_ASTAR, seed=1, ghost_count=200)
+    assert game.ghosts == [] and len(game.swarm) == 200
+    center = game.player.get_center()
+    game.swarm.x[:2] = center[0] - 22
+    game.swarm.y[:2] = center[1] - 22
+    game.powerup = True
+    game.check_ghost_collisions()
+    assert game.swarm.dead[:2].all() and game.score == 2 * SCORE_GHOST_BASE + 4 * SCORE_GHOST_BASE
+
+    game.powerup = False
+    game.swarm.dead[2] = False
+    game.swarm.x[2] = center[0] - 22
+    game.swarm.y[2] = center[1] - 22
+    game.check_ghost_collisions()
+    assert game.lives == 2
+    assert game.swarm.x[2] == game.swarm.start_x[2]
+    result = game.step(500)
+    assert result['ticks'] > 0
+    game.telemetry.close()
+
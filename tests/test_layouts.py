@@ -0,0 +1,84 @@
+"""Board layouts survive a round trip through every file format"""
+import pytest
+
+from board import Board
+from config import *
+from layouts import MappedLayout, load_layout
+
+
+def tiles(board):
+    return [list(row) for row in board.level]
+
+
+@pytest.mark.parametrize('name', ['stock.txt', 'stock.npy', 'stock.bin'])
+def test_round_trip(board, tmp_path, name):
+    path = str(tmp_path / name)
+    board.save(path)
+    loaded = Board.load(path, cols=len(board.level[0]))
+    assert tiles(loaded) == tiles(board)
+    assert loaded.dot_count == board.dot_count
+    assert loaded.get_all_dots() == board.get_all_dots()
+    assert loaded.get_graph().cells == board.get_graph().cells
+
+
+def test_binary_layouts_are_mapped(board, tmp_path):
+    path = str(tmp_path / 'stock.npy')
+    board.save(path)
+    layout = load_layout(path)
+    assert isinstance(layout, MappedLayout)
+    assert (layout.rows, layout.cols) == (len(board.level), len(board.level[0]))
+
+
+def test_edits_stay_private_to_the_board(board, tmp_path):
+    path = str(tmp_path / 'stock.npy')
+    board.save(path)
+    with open(path, 'rb') as f:
+        original = f.read()
+    row, col = next(iter(board.get_all_dots()))
+
+    edited = Board.load(path)
+    edited.set_tile(row, col, TILE_EMPTY)
+    assert Board.load(path).get_tile(row, col) == TILE_DOT
+    with open(path, 'rb') as f:
+        assert f.read() == original
+
+    edited.reset()
+    assert edited.get_tile(row, col) == TILE_DOT
+    assert edited.dot_count == board.dot_count
+
+
+def test_text_layouts_accept_separated_tiles(tmp_path):
+    path = tmp_path / 'small.txt'
+    path.write_text('# a small box\n3,3,3\n\n3 1 3\n333\n')
+    assert load_layout(str(path)) == [[3, 3, 3], [3, 1, 3], [3, 3, 3]]
+
+
+@pytest.mark.parametrize('text', ['333\n31\n333\n', '333\n3a3\n', '3,12,3\n', '# empty\n'])
+def test_malformed_text_is_rejected(tmp_path, text):
+    path = tmp_path / 'bad.txt'
+    path.write_text(text)
+    with pytest.raises(ValueError):
+        load_layout(str(path))
+
+
+def test_raw_layouts_need_whole_rows(board, tmp_path):
+    path = str(tmp_path / 'stock.bin')
+    board.save(path)
+    with pytest.raises(ValueError):
+        load_layout(path)
+    with pytest.raises(ValueError):
+        load_layout(path, cols=31)
+
+
+def test_numpy_reads_and_writes_layouts(board, tmp_path):
+    np = pytest.importorskip('numpy')
+    path = str(tmp_path / 'stock.npy')
+    board.save(path)
+    assert np.load(path).tolist() == tiles(board)
+
+    path = str(tmp_path / 'numpy.npy')
+    np.save(path, np.array(tiles(board), dtype=np.uint8))
+    assert tiles(Board.load(path)) == tiles(board)
+    np.save(path, np.array(tiles(board), dtype=np.int32))
+    with pytest.raises(ValueError):
+        load_layout(path)
@@ -0,0 +1,143 @@
+"""Maze graphs and dot indexes agree with brute-force answers on the board"""
+import math
+import random
+
+from config import *
+from maze import DotIndex
+
+
+def manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
+
+
+def test_graph_matches_walkable_cells(board):
+    graph = board.get_graph()
+    rows, cols = len(board.level), len(board.level[0])
+    assert graph.cells == [(r, c) for r in range(rows) for c in range(cols)
+                           if board.is_walkable(r, c)]
+    for node, (row, col) in enumerate(graph.cells):
+        neighbors = {graph.cells[n] for n in graph.neighbors(node)}
+        assert neighbors == {(row + dr, col + dc) for dr, dc in ((0, 1), (0, -1), (1, 0), (-1, 0))
+                             if board.is_walkable(row + dr, col + dc)}
+        assert graph.node_at(row, col) == node
+
+
+def test_graph_is_rebuilt_after_walls_change(board):
+    graph = board.get_graph()
+    row, col = graph.cells[0]
+    board.set_tile(row, col, TILE_VERTICAL)
+    assert (row, col) not in board.get_graph().index
+    assert board.get_graph() is not graph
+    board.reset()
+    assert (row, col) in board.get_graph().index
+
+
+def test_distance_oracle_matches_bfs(board, query_pairs, maze_distances):
+    oracle = board.get_distance_oracle()
+    for start, goal in query_pairs(board, count=200):
+        dist = maze_distances(board, start)
+        assert oracle.distance(start, goal) == dist.get(goal, math.inf)
+        hop = oracle.next_hop(start, goal)
+        if goal not in dist:
+            assert hop is None
+        elif goal != start:
+            assert manhattan(hop, start) == 1 and dist[hop] == 1
+            assert oracle.distance(hop, goal) == dist[goal] - 1
+
+
+def test_distance_oracle_follows_wall_changes(walled_board, query_pairs, maze_distances):
+    test_distance_oracle_matches_bfs(walled_board, query_pairs, maze_distances)
+
+
+def test_distance_oracle_falls_back_to_manhattan_off_the_maze(board):
+    oracle = board.get_distance_oracle()
+    assert oracle.distance((0, 0), (2, 5)) == 7
+    assert oracle.next_hop((0, 0), (2, 5)) is None
+
+
+def test_board_tracks_eaten_dots(board):
+    dots = sorted(board.get_all_dots())
+    for row, col in dots[::3]:
+        board.set_tile(row, col, TILE_EMPTY)
+    remaining = sorted(board.get_all_dots())
+    assert remaining == [dot for i, dot in enumerate(dots) if i % 3]
+    assert board.dot_count + board.power_pellet_count == len(remaining)
+    for row, col in remaining:
+        board.set_tile(row, col, TILE_EMPTY)
+    assert board.is_complete()
+    board.reset()
+    assert sorted(board.get_all_dots()) == dots
+
+
+def test_dot_index_ranks_match_brute_force():
+    rng = random.Random(1)
+    index = DotIndex(33, 30)
+    dots = set()
+    for _ in range(300):
+        pos = (rng.randrange(33), rng.randrange(30))
+        if rng.random() < 0.3 and dots:
+            pos = rng.choice(sorted(dots))
+            index.remove(pos)
+            dots.discard(pos)
+        else:
+            index.add(pos)
+            dots.add(pos)
+        point = (rng.randrange(33), rng.randrange(30))
+        expected = sorted(dots, key=lambda dot: (manhattan(dot, point), dot))
+        assert len(index) == len(dots)
+        assert index.nearest(point, 3) == expected[:3]
+        assert index.farthest(point, 2) == expected[::-1][:2]
+        if dots:
+            rank = rng.randrange(len(dots))
+            assert index.at_rank(point, rank) == expected[rank]
+
+
+def test_board_dot_index_follows_eaten_dots(board):
+    for row, col in sorted(board.get_all_dots())[::3]:
+        board.set_tile(row, col, TILE_EMPTY)
+    remaining = list(board.get_all_dots())
+    point = (15, 15)
+    nearest = board.get_dot_index().nearest(point, 5)
+    assert nearest == sorted(remaining, key=lambda dot: (manhattan(dot, point), dot))[:5]
+    assert len(board.get_dot_index()) == len(remaining)
+
+
+def test_dot_field_distance_is_nearest_dot_by_maze(board, maze_distances):
+    rng = random.Random(2)
+    field = board.get_dot_field()
+    dots = sorted(board.get_all_dots())
+    for row, col in rng.sample(dots, len(dots) - 15):
+        board.set_tile(row, col, TILE_EMPTY)
+    assert board.get_dot_field() is field
+    remaining = list(board.get_all_dots())
+    for cell in rng.sample(board.get_graph().cells, 40):
+        dist = maze_distances(board, cell)
+        expected = min((dist[dot] for dot in remaining if dot in dist), default=math.inf)
+        assert field.distance(cell) == expected
+        if expected != math.inf:
+            assert dist[field.nearest(cell)] == expected
+
+
+def test_junction_corridors_cover_every_non_junction_cell(board):
+    junctions = board.get_junction_graph()
+    graph = junctions.graph
+    for node in range(graph.size):
+        if junctions.junction_of[node] >= 0:
+            continue
+        _, _, interior = junctions.corridors[junctions.corridor_of[node]]
+        assert interior[junctions.offset[node] - 1] == node
+
+
+def test_dots_edited_before_first_use_are_indexed(board):
+    dots = sorted(board.get_all_dots())
+    board.reset()
+    eaten = dots[::4]
+    for row, col in eaten:
+        board.set_tile(row, col, TILE_EMPTY)
+    board.set_tile(15, 0, TILE_DOT)
+    expected = sorted(set(dots) - set(eaten) | {(15, 0)})
+    assert sorted(board.get_all_dots()) == expected
+    assert board.dot_count + board.power_pellet_count == len(expected)
+    assert len(board.get_dot_index()) == len(expected)
+    assert board.get_dot_index().nearest((15, 1)) == [(15, 0)]
+    assert not board.is_complete()
@@ -0,0 +1,59 @@
+"""The agent's path cache reuses search results until the walls change"""
+from algorithms import PathCache, PathfindingAgent, SearchResult
+from board import Board
+from config import *
+from conftest import walkable_cells
+
+
+def plan(agent, board, start, goal):
+    """Drop the agent's current path and plan a new one from start to goal"""
+    agent.current_path = []
+    agent.get_next_move((start[1] * TILE_WIDTH, start[0] * TILE_HEIGHT), [], board, goal)
+
+
+def test_path_cache_evicts_least_recently_used():
+    cache = PathCache(max_entries=2)
+    results = {key: SearchResult([(1, col)], (1, 0)) for col, key in enumerate('abc')}
+    cache.put('a', results['a'])
+    cache.put('b', results['b'])
+    assert cache.get('a') is results['a']
+    cache.put('c', results['c'])
+    assert cache.get('b') is None
+    assert cache.get('a') is not None and cache.get('c') is not None
+    assert (cache.hits, cache.misses) == (3, 1)
+
+
+def test_agent_reuses_paths_until_walls_change(board):
+    cells = walkable_cells(board)
+    start, goal = cells[0], cells[-1]
+    agent = PathfindingAgent(MODE_BFS)
+    plan(agent, board, start, goal)
+    path = list(agent.current_path)
+    plan(agent, board, start, goal)
+    assert agent.path_cache.hits == 1
+    assert agent.current_path == path
+    agent.current_path.append(goal)
+    plan(agent, board, start, goal)
+    assert agent.current_path == path
+    wall = next(cell for cell in cells if cell not in path and cell not in (start, goal))
+    board.set_tile(*wall, TILE_VERTICAL)
+    plan(agent, board, start, goal)
+    assert agent.path_cache.hits == 2 and agent.path_cache.misses == 2
+
+
+def test_boards_with_equal_versions_get_their_own_paths():
+    first, second = Board(), Board()
+    cells = walkable_cells(first)
+    start, goal = cells[0], cells[-1]
+    agent = PathfindingAgent(MODE_BFS)
+    plan(agent, first, start, goal)
+    assert not agent.last_result_cached
+    wall = agent.current_path[len(agent.current_path) // 2]
+    second.set_tile(*wall, TILE_VERTICAL)
+    first.set_tile(*cells[1], TILE_VERTICAL)
+    plan(agent, first, start, goal)
+    plan(agent, second, start, goal)
+    assert first.walkability_version == second.walkability_version
+    assert not agent.last_result_cached and wall not in agent.current_path
+    plan(agent, second, start, goal)
+    assert agent.last_result_cached
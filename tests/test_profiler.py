@@ -0,0 +1,38 @@
+"""Frame profiler percentiles cover a rolling window and traces load as Chrome JSON"""
+import json
+
+from profiler import FrameProfiler
+
+
+def test_sections_are_only_timed_while_enabled():
+    profiler = FrameProfiler()
+    with profiler.section('update'):
+        pass
+    assert profiler.summary() == []
+    profiler.toggle()
+    with profiler.section('update'):
+        pass
+    with profiler.section('draw'):
+        pass
+    assert [name for name, _, _ in profiler.summary()] == ['update', 'draw']
+
+
+def test_percentiles_cover_the_rolling_window():
+    profiler = FrameProfiler(enabled=True, window=100)
+    for ms in range(1, 151):
+        profiler.record('update', 0, ms * 1000000)
+    assert profiler.percentile('update', 0.0) == 51.0
+    assert profiler.percentile('update', 0.5) == 101.0
+    assert profiler.percentile('update', 0.99) == 150.0
+    assert profiler.percentile('draw', 0.5) == 0.0
+
+
+def test_chrome_trace_lists_every_event(tmp_path):
+    profiler = FrameProfiler(enabled=True)
+    profiler.record('update', profiler.origin + 2000, profiler.origin + 5000)
+    profiler.record('draw', profiler.origin + 5000, profiler.origin + 6000)
+    path = tmp_path / 'trace.json'
+    profiler.export_chrome_trace(str(path))
+    events = json.loads(path.read_text())['traceEvents']
+    assert [(e['name'], e['ph'], e['ts'], e['dur']) for e in events] == [
+        ('update', 'X', 2.0, 3.0), ('draw', 'X', 5.0, 1.0)]
@@ -0,0 +1,53 @@
+"""Recordings survive a save/load round trip and replay to the recorded score"""
+import pytest
+
+from config import *
+from main import PacManGame, replay
+from recording import KIND_MODE, KIND_NEW_GOAL, Recorder, Recording
+
+
+def test_recording_round_trip(tmp_path):
+    path = str(tmp_path / 'game.rec')
+    recorder = Recorder(2 ** 63 - 1, MODE_ASTAR)
+    recorder.direction(0, DIR_RIGHT)
+    recorder.direction(5, DIR_RIGHT)
+    recorder.direction(9, DIR_UP)
+    recorder.record(9, KIND_NEW_GOAL)
+    recorder.record(12, KIND_MODE, MODE_BFS)
+    recorder.save(path, 40, 1230)
+
+    recording = Recording.load(path)
+    assert (recording.seed, recording.mode) == (2 ** 63 - 1, MODE_ASTAR)
+    assert recording.directions == {0: DIR_RIGHT, 9: DIR_UP}
+    assert recording.commands == {9: [(KIND_NEW_GOAL, 0)], 12: [(KIND_MODE, MODE_BFS)]}
+    assert (recording.frames, recording.score) == (40, 1230)
+
+
+def test_loading_something_else_fails(tmp_path):
+    path = tmp_path / 'game.rec'
+    path.write_bytes(b'not a recording at all')
+    with pytest.raises(ValueError):
+        Recording.load(str(path))
+
+
+
+def test_recorded_game_replays_to_the_same_score(tmp_path):
+    path = str(tmp_path / 'game.rec')
+    game = PacManGame(headless=True, ai_mode=MODE_ASTAR, record_path=path)
+    game.step(400)
+    game.apply_command(KIND_MODE, MODE_BFS)
+    game.step(200)
+    game.save_recording()
+    game.telemetry.close()
+    assert game.score > 0
+
+    result = replay(path)
+    assert result['frames'] == 600
+    assert result['score'] == game.score
+    assert result['diverged'] is False
+
+
+@pytest.mark.parametrize('options', [{'seed': 1}, {'ghost_count': 10}])
+def test_seeded_and_swarm_games_cannot_be_recorded(tmp_path, options):
+    with pytest.raises(ValueError):
+        PacManGame(headless=True, record_path=str(tmp_path / 'game.rec'), **options)
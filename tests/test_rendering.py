@@ -0,0 +1,60 @@
+"""The cached maze surface is patched as dots change and reports the tiles to update"""
+import pygame
+
+from board import Board
+from config import *
+from main import PacManGame
+
+
+def drawn(board):
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    board.draw(screen, flicker=True)
+    return pygame.image.tostring(screen, 'RGB')
+
+
+def test_dirty_rects_cover_changed_dots(board):
+    assert board.take_dirty_rects() is None
+    assert board.take_dirty_rects() == []
+    (row, col), (row2, col2) = sorted(board.get_all_dots())[:2]
+    board.set_tile(row, col, TILE_EMPTY)
+    board.set_tile(row2, col2, TILE_EMPTY)
+    assert board.take_dirty_rects() == [board.tile_rect(row, col), board.tile_rect(row2, col2)]
+    assert board.take_dirty_rects() == []
+
+
+def test_wall_changes_update_the_whole_screen(board):
+    board.take_dirty_rects()
+    row, col = sorted(board.get_all_dots())[0]
+    board.set_tile(row, col, TILE_VERTICAL)
+    assert board.take_dirty_rects() is None
+
+
+def test_patched_surface_matches_a_fresh_render(board):
+    drawn(board)
+    fresh = Board()
+    dots = sorted(board.get_all_dots())
+    for row, col in dots[::5]:
+        board.set_tile(row, col, TILE_EMPTY)
+        fresh.set_tile(row, col, TILE_EMPTY)
+    row, col = dots[1]
+    board.set_tile(row, col, TILE_VERTICAL)
+    fresh.set_tile(row, col, TILE_VERTICAL)
+    assert drawn(board) == drawn(fresh)
+
+
+def test_ai_overlay_is_only_rendered_again_after_a_replan():
+    game = PacManGame(ai_mode=MODE_BFS)
+    game.update_agent()
+    game.draw_ai_visualization()
+    overlay = game.overlay_surface
+    game.draw_ai_visualization()
+    assert game.overlay_surface is overlay
+    game.show_visited = False
+    game.draw_ai_visualization()
+    assert game.overlay_surface is not overlay
+    overlay = game.overlay_surface
+    game.goal_position = sorted(game.board.get_all_dots())[-1]
+    game.agent.current_path = []
+    game.update_agent()
+    game.draw_ai_visualization()
+    assert game.overlay_surface is not overlay
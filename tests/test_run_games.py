@@ -0,0 +1,32 @@
+"""The batch game runner plans one game per spec and summarises them per algorithm"""
+import os
+import sys
+
+from config import *
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                'benchmarks'))
+
+from run_games import aggregate, game_specs
+
+
+def test_only_alphabeta_varies_the_depth():
+    specs = game_specs([MODE_BFS, MODE_MINIMAX], range(2), [2, 4])
+    assert specs == [(MODE_BFS, 0, 2), (MODE_BFS, 1, 2),
+                     (MODE_MINIMAX, 0, 2), (MODE_MINIMAX, 0, 4),
+                     (MODE_MINIMAX, 1, 2), (MODE_MINIMAX, 1, 4)]
+
+
+def test_aggregate_summarises_each_algorithm_and_depth():
+    def game(mode, depth, score, won):
+        return {'mode': mode, 'depth': depth, 'score': score, 'won': won, 'ticks': 100,
+                'seconds': 0.5}
+
+    summary = aggregate([game(MODE_MINIMAX, 4, 300, True), game(MODE_BFS, 2, 100, False),
+                         game(MODE_BFS, 2, 500, True), game(MODE_BFS, 2, 200, False)])
+    assert [(row['algorithm'], row['depth'], row['games']) for row in summary] == [
+        (ALGORITHM_NAMES[MODE_BFS], 2, 3), (ALGORITHM_NAMES[MODE_MINIMAX], 4, 1)]
+    bfs = summary[0]
+    assert bfs['win_rate'] == 1 / 3
+    assert bfs['mean_score'] == 800 / 3 and bfs['median_score'] == 200
+    assert bfs['mean_ticks'] == 100 and bfs['mean_seconds'] == 0.5
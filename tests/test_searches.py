@@ -0,0 +1,94 @@
+"""Path searches return valid paths, as short as breadth-first search's"""
+import pytest
+
+from algorithms import (BFS, DFS, JPS, JUNCTION_SEARCHES, PATH_SEARCHES, AStar, BucketQueue,
+                        DStarLite, SearchResult)
+from config import *
+
+
+OPTIMAL_SEARCHES = [search for mode, search in PATH_SEARCHES.items() if mode != MODE_DFS]
+ALL_SEARCHES = list(PATH_SEARCHES.values()) + list(JUNCTION_SEARCHES.values())
+
+
+def assert_valid_path(board, start, goal, path):
+    """Path excludes start, ends at goal and moves one walkable cell per step"""
+    previous = start
+    for cell in path:
+        assert board.is_walkable(*cell)
+        assert abs(cell[0] - previous[0]) + abs(cell[1] - previous[1]) == 1
+        previous = cell
+    if path:
+        assert path[-1] == goal
+
+
+@pytest.mark.parametrize('search', OPTIMAL_SEARCHES + list(JUNCTION_SEARCHES.values()),
+                         ids=lambda s: s.__qualname__)
+@pytest.mark.parametrize('layout', ['board', 'walled_board'])
+def test_paths_are_shortest(search, layout, request, query_pairs, maze_distances):
+    board = request.getfixturevalue(layout)
+    for start, goal in query_pairs(board):
+        path, _ = search(start, goal, board)
+        expected = maze_distances(board, start).get(goal)
+        if expected is None or start == goal:
+            assert path == []
+        else:
+            assert len(path) == expected
+
+
+@pytest.mark.parametrize('search', ALL_SEARCHES, ids=lambda s: s.__qualname__)
+def test_paths_are_valid(search, walled_board, query_pairs):
+    for start, goal in query_pairs(walled_board, count=100):
+        result = search(start, goal, walled_board)
+        assert isinstance(result, SearchResult)
+        assert_valid_path(walled_board, start, goal, result.path)
+        assert start in result.visited
+        assert result.goal_reached == (bool(result.path) or start == goal)
+
+
+def test_dfs_respects_depth_limit(board, query_pairs):
+    for start, goal in query_pairs(board, count=100):
+        path, _ = DFS.search(start, goal, board, max_depth=40)
+        assert len(path) <= 40
+
+
+def test_search_result_unpacks_as_path_and_visited(board):
+    result = BFS.search((2, 2), (6, 10), board)
+    path, visited = result
+    assert path == result.path and visited is result.visited
+    assert (2, 2) in visited and set(path) <= visited
+    assert result.expanded > 0 and result.max_frontier > 0
+    assert result.pops >= result.expanded and result.pushes >= result.pops
+    assert result.elapsed_ns > 0
+
+
+def test_jps_expands_fewer_nodes_than_astar(board, query_pairs):
+    jps_expanded = astar_expanded = 0
+    for start, goal in query_pairs(board, count=100):
+        jps_expanded += JPS.search(start, goal, board).expanded
+        astar_expanded += AStar.search(start, goal, board).expanded
+    assert jps_expanded < astar_expanded
+
+
+def test_dstar_lite_replans_optimally_after_wall_changes(board, maze_distances):
+    start, goal = (2, 2), (30, 27)
+    planner = DStarLite(board, goal)
+    path, _ = planner.plan(start)
+    assert len(path) == maze_distances(board, start)[goal]
+
+    for row, col in [(6, 6), (21, 7), (27, 2), (6, 7)]:
+        board.set_tile(row, col, TILE_VERTICAL)
+        path, _ = planner.plan(start)
+        assert len(path) == maze_distances(board, start).get(goal, 0)
+        assert_valid_path(board, start, goal, path)
+
+    board.set_tile(6, 6, TILE_EMPTY)
+    path, _ = planner.plan(start)
+    assert len(path) == maze_distances(board, start)[goal]
+
+
+def test_bucket_queue_pops_lowest_priority_oldest_first():
+    queue = BucketQueue()
+    for priority, item in [(3, 'a'), (1, 'b'), (3, 'c'), (1, 'd'), (0, 'e')]:
+        queue.push(priority, item)
+    assert [queue.pop() for _ in range(len(queue))] == [
+        (0, 'e'), (1, 'b'), (1, 'd'), (3, 'a'), (3, 'c')]
@@ -0,0 +1,46 @@
+"""Telemetry filters events by level, samples noisy ones and writes them as JSONL"""
+import json
+
+from telemetry import Telemetry
+
+
+def test_events_below_the_level_are_dropped():
+    telemetry = Telemetry(level='info')
+    telemetry.emit('replan', reason='stale')
+    telemetry.emit('death', lives=2)
+    assert [event['event'] for event in telemetry.buffer] == ['death']
+    assert telemetry.buffer[0]['lives'] == 2 and telemetry.buffer[0]['level'] == 'info'
+    assert not telemetry.enabled_for('path_found') and telemetry.enabled_for('goal_set')
+
+
+def test_sampling_keeps_about_the_configured_fraction():
+    telemetry = Telemetry(level='debug', sample_rates={'path_found': 0.25}, capacity=10000)
+    for _ in range(4000):
+        telemetry.emit('path_found')
+        telemetry.emit('replan')
+    kept = [event['event'] for event in telemetry.buffer]
+    assert kept.count('replan') == 4000
+    assert 800 < kept.count('path_found') < 1200
+
+
+def test_full_buffer_counts_dropped_events():
+    telemetry = Telemetry(capacity=3)
+    for lives in range(5):
+        telemetry.emit('death', lives=lives)
+    assert telemetry.dropped == 2
+    assert [event['lives'] for event in telemetry.buffer] == [2, 3, 4]
+
+
+def test_flush_writes_buffered_events_as_jsonl(tmp_path):
+    path = tmp_path / 'events.jsonl'
+    telemetry = Telemetry(str(path), flush_interval=60)
+    telemetry.start()
+    telemetry.emit('goal_set', goal=[1, 2])
+    telemetry.flush()
+    telemetry.emit('death', lives=1)
+    telemetry.close()
+    events = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [(event['event'], event['level']) for event in events] == [
+        ('goal_set', 'info'), ('death', 'info')]
+    assert events[0]['goal'] == [1, 2]
+    assert telemetry.written == 2 and not telemetry.buffer
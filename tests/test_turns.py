@@ -0,0 +1,65 @@
+"""Turn tables give the same answers as the tile-by-tile turn checks they replace"""
+import random
+
+import pytest
+
+from config import *
+from entities import (MASK_TURNS, _build_ghost_turns, _build_player_turns, _ghost_turns,
+                      _player_turns)
+
+
+def sample_centers(count=4000, seed=11):
+    """Pixel centers across the board, including the tunnel beyond its edges"""
+    rng = random.Random(seed)
+    return [(rng.randrange(-30, 930), rng.randrange(0, 33 * TILE_HEIGHT)) for _ in range(count)]
+
+
+def assert_tables_match(board):
+    player = _build_player_turns(board)
+    ghost = _build_ghost_turns(board)
+    for center_x, center_y in sample_centers():
+        for direction in range(4):
+            mask = player.lookup(center_x, center_y, direction)
+            if mask is not None:
+                assert MASK_TURNS[mask] == _player_turns(board, center_x, center_y, direction)
+            for gate_open in (False, True):
+                mask = ghost.lookup(center_x, center_y, direction, gate_open)
+                if mask is not None:
+                    assert MASK_TURNS[mask] == _ghost_turns(board, center_x, center_y,
+                                                            direction, gate_open)
+
+
+def test_tables_match_turn_checks(board):
+    assert_tables_match(board)
+
+
+def test_tables_match_turn_checks_after_edits(walled_board):
+    walled_board.set_tile(13, 14, TILE_EMPTY)
+    assert_tables_match(walled_board)
+
+
+def test_lookup_off_the_board_is_none(board):
+    table = _build_player_turns(board)
+    assert table.lookup(-20, 100, DIR_LEFT) is None
+    assert table.lookup(100, -5, DIR_UP) is None
+
+
+@pytest.mark.parametrize('tile', [TILE_VERTICAL, TILE_GATE])
+def test_cached_tables_are_rebuilt_when_walls_change(board, tile):
+    table = board.movement_cached('player_turns', _build_player_turns)
+    assert board.movement_cached('player_turns', _build_player_turns) is table
+    row, col = board.get_graph().cells[0]
+    board.set_tile(row, col, tile)
+    rebuilt = board.movement_cached('player_turns', _build_player_turns)
+    assert rebuilt is not table
+    center_x, center_y = col * TILE_WIDTH + TILE_WIDTH // 2, row * TILE_HEIGHT + TILE_HEIGHT // 2
+    for direction in range(4):
+        assert MASK_TURNS[rebuilt.lookup(center_x, center_y, direction)] == \
+            _player_turns(board, center_x, center_y, direction)
+
+
+def test_eating_a_dot_keeps_cached_tables(board):
+    table = board.movement_cached('ghost_turns', _build_ghost_turns)
+    row, col = next(iter(board.get_all_dots()))
+    board.set_tile(row, col, TILE_EMPTY)
+    assert board.movement_cached('ghost_turns', _build_ghost_turns) is table